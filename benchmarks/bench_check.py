@@ -0,0 +1,137 @@
+"""Benchmark for `seqspec check` on large synthetic specs.
+
+Usage:
+    python benchmarks/bench_check.py [--modalities 4] [--blocks 500] [--leaves 8]
+
+Times the single-traversal rule engine against running every rule in its own
+traversal (the cost profile of the previous check implementation), with and
+without schema validation. No files or urls are involved, so no I/O is timed.
+"""
+
+import argparse
+import time
+
+from seqspec.Assay import Assay
+from seqspec.check_engine import run_rules
+from seqspec.Read import Read
+from seqspec.Region import Region
+from seqspec.seqspec_check import RULES
+
+MODALITIES = ["rna", "atac", "protein", "tag", "dna", "crispr"]
+# rules that touch the filesystem or network
+IO_RULES = {"check_onlist_files_exist", "check_onlist_contents", "check_md5sum"}
+
+
+def synthetic_spec(modalities: int, blocks: int, leaves: int) -> Assay:
+    """Build a spec with `blocks` joined regions of `leaves` leaves per modality.
+
+    The spec passes every rule, except that the schema caps region lengths at
+    2048, which large modalities exceed.
+    """
+    library_spec = []
+    sequence_spec = []
+    for m in range(modalities):
+        mod = MODALITIES[m]
+        subregions = []
+        for b in range(blocks):
+            leaf_regions = [
+                Region(
+                    region_id=f"{mod}_b{b}_l{i}",
+                    region_type="custom_primer",
+                    name=f"{mod}_b{b}_l{i}",
+                    sequence_type="fixed",
+                    sequence="ACGT",
+                    min_len=4,
+                    max_len=4,
+                )
+                for i in range(leaves)
+            ]
+            subregions.append(
+                Region(
+                    region_id=f"{mod}_b{b}",
+                    region_type="custom_primer",
+                    name=f"{mod}_b{b}",
+                    sequence_type="joined",
+                    sequence="ACGT" * leaves,
+                    min_len=4 * leaves,
+                    max_len=4 * leaves,
+                    regions=leaf_regions,
+                )
+            )
+            sequence_spec.append(
+                Read(
+                    read_id=f"{mod}_R{b}",
+                    name=f"{mod}_R{b}",
+                    modality=mod,
+                    primer_id=leaf_regions[0].region_id,
+                    min_len=1,
+                    max_len=4,
+                    strand="pos",
+                )
+            )
+        library_spec.append(
+            Region(
+                region_id=mod,
+                region_type=mod,
+                name=mod,
+                sequence_type="joined",
+                sequence="ACGT" * leaves * blocks,
+                min_len=4 * leaves * blocks,
+                max_len=4 * leaves * blocks,
+                regions=subregions,
+            )
+        )
+    return Assay(
+        seqspec_version="0.3.0",
+        assay_id="synthetic",
+        name="synthetic",
+        doi="",
+        date="01 January 2024",
+        description="synthetic spec for benchmarking",
+        modalities=MODALITIES[:modalities],
+        lib_struct="",
+        sequence_protocol="Illumina NovaSeq 6000 (EFO:0008637)",
+        sequence_kit="NovaSeq 6000 S2 Reagent Kit v1.5",
+        library_protocol="bulk RNA-seq assay (OBI:0003090)",
+        library_kit="custom",
+        sequence_spec=sequence_spec,
+        library_spec=library_spec,
+    )
+
+
+def timed(f, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        f()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--modalities", type=int, default=4)
+    parser.add_argument("--blocks", type=int, default=500)
+    parser.add_argument("--leaves", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    spec = synthetic_spec(args.modalities, args.blocks, args.leaves)
+    n_regions = args.modalities * (1 + args.blocks * (1 + args.leaves))
+    print(f"{n_regions} regions, {len(spec.sequence_spec)} reads")
+
+    for label, skip in [
+        ("all rules", IO_RULES),
+        ("no schema", IO_RULES | {"check_schema"}),
+    ]:
+        rules = [r for r in RULES.values() if r.name not in skip]
+        single = timed(lambda: run_rules(spec, rules), args.repeat)
+        multi = timed(lambda: [run_rules(spec, [r]) for r in rules], args.repeat)
+        print(
+            f"{label:>10}: single traversal {single:.3f}s, "
+            f"one traversal per rule {multi:.3f}s ({multi / single:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Benchmark for diffing specs with large file lists.
+
+Usage:
+    python benchmarks/bench_diff.py [--files 20000] [--repeat 3]
+
+Builds a synthetic spec whose reads each list `--files` files, and times
+`diff_specs` against an identical copy, and against a copy in which a few
+files were changed, inserted, deleted and moved, and a region renamed.
+"""
+
+import argparse
+
+from bench_check import synthetic_spec, timed
+
+from seqspec.File import File
+from seqspec.seqspec_diff import diff_specs
+
+
+def with_files(spec, n):
+    for read in spec.sequence_spec:
+        read.files = [
+            File(
+                file_id=f"{read.read_id}_L{i}.fastq.gz",
+                filename=f"{read.read_id}_L{i}.fastq.gz",
+                filetype="fastq",
+                filesize=1000 + i,
+                url=f"https://example.org/{read.read_id}_L{i}.fastq.gz",
+                urltype="https",
+                md5="0" * 32,
+            )
+            for i in range(n)
+        ]
+    return spec
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    spec = with_files(synthetic_spec(2, 4, 50), args.files)
+    same = spec.model_copy(deep=True)
+    edited = spec.model_copy(deep=True)
+    files = edited.sequence_spec[0].files
+    files[10].md5 = "1" * 32
+    files.insert(100, files.pop(5000 % len(files)))
+    del files[200]
+    files.append(File(**{**files[0].model_dump(), "file_id": "extra.fastq.gz"}))
+    edited.library_spec[0].regions[1].regions[3].region_id = "renamed"
+
+    nfiles = sum(len(r.files) for r in spec.sequence_spec)
+    print(f"{nfiles} files, {len(spec.sequence_spec)} reads")
+    for label, other in [("identical", same), ("edited", edited)]:
+        # fresh copies, so that the digests are not cached yet
+        copies = [(spec.model_copy(deep=True), other.model_copy(deep=True))]
+        cold = timed(lambda: diff_specs(*copies[0]), 1)
+        warm = timed(lambda: diff_specs(spec, other), args.repeat)
+        changes = diff_specs(spec, other)
+        print(
+            f"{label:>9}: {len(changes)} changes, {cold:.3f}s, "
+            f"{warm:.3f}s with cached digests"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Benchmark of `seqspec` CLI startup: import time per subcommand.
+
+Usage:
+    python benchmarks/bench_import.py [--commands version index check] [--top 10]
+        [--max-ms 100]
+
+For each command, runs `python -X importtime` on what `seqspec <command>` imports
+before running: the CLI and the command's own module. Reports the total import
+time and the slowest top-level imports, and exits with status 1 if a command
+exceeds `--max-ms`. Timings are the best of `--repeat` runs.
+"""
+
+import argparse
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+SNIPPET = "from seqspec.main import setup_parser; setup_parser({command!r})"
+
+
+def import_times(command: str) -> Tuple[float, List[Tuple[float, str]]]:
+    """Return the total import time in ms and (ms, module) of top-level imports."""
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", SNIPPET.format(command=command)],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stderr
+    top = []
+    for line in out.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        # nested imports are indented below the module that imports them
+        if cumulative.strip().isdigit() and not name.startswith("  "):
+            top.append((int(cumulative) / 1000, name.strip()))
+    return sum(ms for ms, _ in top), sorted(top, reverse=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--commands",
+        nargs="+",
+        default=["version", "info", "index", "onlist", "file", "check", "format"],
+    )
+    parser.add_argument("--top", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--max-ms", type=float, default=None)
+    args = parser.parse_args()
+
+    slow: Dict[str, float] = {}
+    for command in args.commands:
+        total, top = min(
+            (import_times(command) for _ in range(args.repeat)), key=lambda r: r[0]
+        )
+        print(f"{command:10s} {total:8.1f} ms")
+        for ms, name in top[: args.top]:
+            print(f"    {ms:8.1f} ms  {name}")
+        if args.max_ms is not None and total > args.max_ms:
+            slow[command] = total
+    if slow:
+        print(f"over {args.max_ms} ms: {', '.join(slow)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Benchmark for loading specs from YAML and from JSON.
+
+Usage:
+    python benchmarks/bench_load.py [--corpus docs/assays] [--repeat 3]
+
+Converts every spec of the corpus to JSON in a temporary directory, checks
+that it loads back to the same spec, and times `load_spec` on the YAML and on
+the JSON files, as well as parsing alone (`load_spec_dict`).
+"""
+
+import argparse
+import tempfile
+from pathlib import Path
+
+from bench_check import timed
+
+from seqspec.utils import load_spec, load_spec_dict, write_pydantic_to_file_or_stdout
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", type=Path, default=Path("docs/assays"))
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        yaml_fns = []
+        json_fns = []
+        for fn in sorted(args.corpus.glob("*.yaml")):
+            try:
+                spec = load_spec(fn)
+            except Exception:
+                continue
+            json_fn = Path(tmp) / fn.name.replace(".yaml", ".json")
+            write_pydantic_to_file_or_stdout(spec, json_fn)
+            assert load_spec(json_fn).model_dump() == spec.model_dump(), fn
+            yaml_fns.append(fn)
+            json_fns.append(json_fn)
+        size = sum(fn.stat().st_size for fn in yaml_fns) / 2**20
+        print(f"{len(yaml_fns)} specs, {size:.1f} MiB of YAML")
+
+        for label, f in [("load_spec", load_spec), ("parse only", load_spec_dict)]:
+            from_yaml = timed(lambda: [f(fn) for fn in yaml_fns], args.repeat)
+            from_json = timed(lambda: [f(fn) for fn in json_fns], args.repeat)
+            print(
+                f"{label:>10}: yaml {from_yaml:.3f}s, json {from_json:.3f}s "
+                f"({from_yaml / from_json:.1f}x)"
+            )
+
+
+if __name__ == "__main__":
+    main()
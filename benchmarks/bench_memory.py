@@ -0,0 +1,77 @@
+"""Benchmark for the memory held by many loaded specs.
+
+Usage:
+    python benchmarks/bench_memory.py [--corpus docs/assays] [--copies 10]
+
+Loads every spec of the corpus `--copies` times (as a query service holding
+many samples of the same assays would) and reports the memory held by the
+pydantic models, and by their compact, read-only versions (`seqspec.compact`)
+converted with one shared `CompactPool`, as measured by tracemalloc. Also times
+`seqspec_index` on both.
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+from pathlib import Path
+
+from seqspec.compact import CompactPool
+from seqspec.seqspec_index import seqspec_index
+from seqspec.utils import load_spec
+
+
+def traced(build):
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+
+def index_all(specs):
+    start = time.perf_counter()
+    for spec in specs:
+        for m in spec.modalities:
+            try:
+                seqspec_index(spec, m, [], "read")
+            except Exception:
+                pass
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", type=Path, default=Path("docs/assays"))
+    parser.add_argument("--copies", type=int, default=10)
+    args = parser.parse_args()
+
+    fns = []
+    for fn in sorted(args.corpus.glob("*.yaml")):
+        try:
+            load_spec(fn)
+        except Exception:
+            continue
+        fns.append(fn)
+
+    models, model_bytes = traced(
+        lambda: [load_spec(fn) for _ in range(args.copies) for fn in fns]
+    )
+    pool = CompactPool()
+    compacts, compact_bytes = traced(lambda: [pool.compact(m) for m in models])
+    print(f"{len(models)} specs ({len(fns)} distinct)")
+    print(f"pydantic: {model_bytes / 2**20:.1f} MiB")
+    print(
+        f" compact: {compact_bytes / 2**20:.2f} MiB "
+        f"({model_bytes / compact_bytes:.0f}x less, {len(pool)} pooled objects)"
+    )
+    print(
+        f"seqspec_index: pydantic {index_all(models):.3f}s, "
+        f"compact {index_all(compacts):.3f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
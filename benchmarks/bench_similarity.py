@@ -0,0 +1,59 @@
+"""Benchmark for the pairwise similarities of many specs.
+
+Usage:
+    python benchmarks/bench_similarity.py [--corpus docs/assays] [--specs 10000]
+
+Times `spec_profiles` on the specs of the corpus, and `similarity_matrix` on
+`--specs` profiles (those of the corpus, repeated with noise), written to a
+memory-mapped .npy file `--chunk-size` rows at a time.
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+from bench_check import timed
+
+from seqspec.seqspec_check import find_spec_files
+from seqspec.seqspec_similarity import CHUNK_SIZE, similarity_matrix, spec_profiles
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", type=Path, default=Path("docs/assays"))
+    parser.add_argument("--specs", type=int, default=10000)
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--jobs", type=int, default=None)
+    args = parser.parse_args()
+
+    specs = find_spec_files([args.corpus])
+    start = time.perf_counter()
+    labels, profiles = spec_profiles(specs, args.jobs)
+    print(
+        f"spec_profiles: {len(labels)} of {len(specs)} specs, "
+        f"{time.perf_counter() - start:.3f}s"
+    )
+
+    rng = np.random.default_rng(0)
+    many = profiles[rng.integers(len(profiles), size=args.specs)]
+    many = many + rng.random(many.shape) * 0.01
+    with tempfile.TemporaryDirectory() as tmp:
+        out = np.lib.format.open_memmap(
+            Path(tmp) / "similarity.npy",
+            mode="w+",
+            dtype=np.float32,
+            shape=(args.specs, args.specs),
+        )
+        t = timed(lambda: similarity_matrix(many, args.chunk_size, out=out), 1)
+        out.flush()
+    print(
+        f"similarity_matrix: {args.specs}x{args.specs} "
+        f"({args.specs**2 * 4 / 2**20:.0f} MiB), {t:.3f}s, "
+        f"{args.chunk_size * args.specs * 4 / 2**20:.0f} MiB per block"
+    )
+
+
+if __name__ == "__main__":
+    main()
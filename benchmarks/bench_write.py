@@ -0,0 +1,66 @@
+"""Benchmark for writing large specs as YAML and JSON.
+
+Usage:
+    python benchmarks/bench_write.py [--modalities 4] [--blocks 500] [--leaves 8]
+
+Times `model_dump()` plus the pure-Python `yaml.dump` (the previous writer)
+against `seqspec.serialize.write_yaml` (libyaml when available, atomic rename)
+and `write_json`, writing to a temporary directory, and checks that both YAML
+writers produce the same bytes. Then times rewriting the spec after renaming
+one read with `seqspec.roundtrip` (splicing the edit into the source) against
+writing it whole.
+"""
+
+import argparse
+import tempfile
+from pathlib import Path
+
+import yaml
+from bench_check import synthetic_spec, timed
+
+from seqspec.roundtrip import load_spec_roundtrip
+from seqspec.serialize import FastDumper, write_json, write_yaml
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--modalities", type=int, default=4)
+    parser.add_argument("--blocks", type=int, default=500)
+    parser.add_argument("--leaves", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    spec = synthetic_spec(args.modalities, args.blocks, args.leaves)
+    n_regions = args.modalities * (1 + args.blocks * (1 + args.leaves))
+    print(f"{n_regions} regions, libyaml {'available' if FastDumper else 'missing'}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        before = Path(tmp) / "before.yaml"
+        after = Path(tmp) / "after.yaml"
+        as_json = Path(tmp) / "spec.json"
+
+        def write_before():
+            with open(before, "w") as f:
+                yaml.dump(spec.model_dump(), f, sort_keys=False)
+
+        python = timed(write_before, args.repeat)
+        fast = timed(lambda: write_yaml(spec.model_dump(), after), args.repeat)
+        dump = timed(spec.model_dump, args.repeat)
+        json_ = timed(lambda: write_json(spec, as_json), args.repeat)
+        assert before.read_bytes() == after.read_bytes(), "YAML output differs"
+
+        size = after.stat().st_size / 2**20
+        print(f"model_dump: {dump:.3f}s")
+        print(f"yaml.dump:  {python:.3f}s ({size:.1f} MiB)")
+        print(f"write_yaml: {fast:.3f}s ({python / fast:.1f}x)")
+        print(f"write_json: {json_:.3f}s ({as_json.stat().st_size / 2**20:.1f} MiB)")
+
+        edited, source = load_spec_roundtrip(after)
+        edited.sequence_spec[0].name = "renamed"
+        whole = timed(lambda: write_yaml(edited.model_dump(), after), args.repeat)
+        spliced = timed(lambda: source.write(edited, after), args.repeat)
+        print(f"one read renamed: write_yaml {whole:.3f}s, roundtrip {spliced:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
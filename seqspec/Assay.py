@@ -1,15 +1,18 @@
 from typing import List, Optional, Union
 
-import yaml
 from pydantic import BaseModel, Field, PrivateAttr
 
 from seqspec.Read import Read, ReadInput
 from seqspec.Region import Region, RegionInput
+from seqspec.serialize import dump_json, dump_yaml, write_json, write_yaml
+from seqspec.spec_hash import DigestCache
 
 from . import __version__
 
 
-class SeqProtocol(BaseModel):
+class SeqProtocol(DigestCache, BaseModel):
+    __slots__ = ("_digest_cache",)
+
     protocol_id: Optional[str] = Field(default_factory=lambda: "auto-id")
     name: str
     modality: str
@@ -63,7 +66,9 @@ class SeqProtocolInput(BaseModel):
         )
 
 
-class SeqKit(BaseModel):
+class SeqKit(DigestCache, BaseModel):
+    __slots__ = ("_digest_cache",)
+
     kit_id: str
     name: Optional[str]
     modality: str
@@ -113,7 +118,9 @@ class SeqKitInput(BaseModel):
         )
 
 
-class LibProtocol(BaseModel):
+class LibProtocol(DigestCache, BaseModel):
+    __slots__ = ("_digest_cache",)
+
     protocol_id: str
     name: str
     modality: str
@@ -165,7 +172,9 @@ class LibProtocolInput(BaseModel):
         )
 
 
-class LibKit(BaseModel):
+class LibKit(DigestCache, BaseModel):
+    __slots__ = ("_digest_cache",)
+
     kit_id: str
     name: Optional[str]
     modality: str
@@ -215,7 +224,9 @@ class LibKitInput(BaseModel):
         )
 
 
-class Assay(BaseModel):
+class Assay(DigestCache, BaseModel):
+    __slots__ = ("_digest_cache",)
+
     seqspec_version: Optional[str] = __version__
     assay_id: str
     name: str
@@ -260,16 +271,15 @@ Regions:
     def to_dict(self):
         return self.model_dump()
 
-    def to_JSON(self):
-        return self.model_dump_json(indent=4)
+    def to_JSON(self, fname: Optional[str] = None):
+        if fname is None:
+            return dump_json(self)
+        write_json(self, fname)
 
     def to_YAML(self, fname: Optional[str] = None):
-        yaml_str = yaml.dump(self.model_dump(), sort_keys=False)
         if fname is None:
-            return yaml_str
-        else:
-            with open(fname, "w") as f:
-                f.write(yaml_str)
+            return dump_yaml(self.model_dump())
+        write_yaml(self.model_dump(), fname)
 
     def print_sequence(self):
         for region in self.library_spec:
@@ -315,7 +325,11 @@ Regions:
         return self.modalities
 
     def insert_regions(
-        self, regions: List[Region], modality: str, after: Optional[str] = None
+        self,
+        regions: List[Region],
+        modality: str,
+        after: Optional[str] = None,
+        update: bool = True,
     ) -> None:
         if modality not in self.modalities:
             raise ValueError(f"Modality '{modality}' not found.")
@@ -333,7 +347,9 @@ Regions:
         for region in regions:
             target_region.regions.insert(insert_idx, region)
             insert_idx += 1
-        target_region.update_attr()
+        # callers inserting many times may update the library once at the end
+        if update:
+            target_region.update_attr()
 
     def insert_reads(
         self, reads: List[Read], modality: str, after: Optional[str] = None
@@ -3,8 +3,12 @@ from typing import Optional
 
 from pydantic import BaseModel, Field
 
+from seqspec.spec_hash import DigestCache
+
+
+class File(DigestCache, BaseModel):
+    __slots__ = ("_digest_cache",)
 
-class File(BaseModel):
     file_id: str
     filename: str
     filetype: str
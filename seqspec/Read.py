@@ -4,9 +4,12 @@ from pydantic import BaseModel, Field
 
 from seqspec.File import File, FileInput
 from seqspec.Region import RegionCoordinate
+from seqspec.spec_hash import DigestCache
 
 
-class Read(BaseModel):
+class Read(DigestCache, BaseModel):
+    __slots__ = ("_digest_cache",)
+
     read_id: str
     name: str
     modality: str
@@ -3,6 +3,8 @@ from typing import List, Optional, Set, Union
 
 from pydantic import BaseModel, Field
 
+from seqspec.spec_hash import DigestCache
+
 
 class SequenceType(str, Enum):
     FIXED = "fixed"
@@ -48,7 +50,9 @@ class RegionType(str, Enum):
     DIFFERENCE = "difference"
 
 
-class Onlist(BaseModel):
+class Onlist(DigestCache, BaseModel):
+    __slots__ = ("_digest_cache",)
+
     file_id: str
     filename: str
     filetype: str
@@ -125,7 +129,9 @@ class OnlistInput(BaseModel):
         )
 
 
-class Region(BaseModel):
+class Region(DigestCache, BaseModel):
+    __slots__ = ("_digest_cache",)
+
     region_id: str
     region_type: Union[str, RegionType]
     name: str
@@ -1,5 +1,9 @@
+import time as _time
 from importlib.metadata import version as _pkg_version
 
+# when the package started to import, for `seqspec --profile`
+_IMPORT_STARTED = _time.perf_counter()
+
 try:
     __version__ = _pkg_version("seqspec")
 except Exception:
@@ -0,0 +1,171 @@
+"""Cache module for seqspec.
+
+This module provides persistent caches kept in the user cache directory, so that
+expensive results (e.g. md5 digests of multi-GB FASTQs) survive across runs.
+The cache is best effort: if it cannot be opened, every lookup is a miss.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# (device, inode, size, mtime_ns)
+StatKey = Tuple[int, int, int, int]
+
+# seconds that remote file metadata stays fresh (override: SEQSPEC_REMOTE_CACHE_TTL)
+REMOTE_CACHE_TTL = 24 * 60 * 60
+
+
+def cache_dir() -> Path:
+    """Return the seqspec cache directory.
+
+    `SEQSPEC_CACHE_DIR` takes precedence, then `$XDG_CACHE_HOME/seqspec`, then
+    `~/.cache/seqspec`.
+    """
+    override = os.environ.get("SEQSPEC_CACHE_DIR")
+    if override:
+        return Path(override)
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return Path(base) / "seqspec"
+
+
+def remote_cache_ttl() -> float:
+    """Return the remote metadata TTL in seconds; 0 disables cached lookups."""
+    value = os.environ.get("SEQSPEC_REMOTE_CACHE_TTL")
+    if not value:
+        return REMOTE_CACHE_TTL
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        logger.warning("Ignoring invalid SEQSPEC_REMOTE_CACHE_TTL=%r", value)
+        return REMOTE_CACHE_TTL
+
+
+def stat_key(st: os.stat_result) -> StatKey:
+    """Return the cache key identifying a file's current contents."""
+    return (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)
+
+
+class SqliteCache:
+    """A small key-value table in a SQLite database in the cache directory."""
+
+    table = ""
+    filename = "seqspec.sqlite"
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path else cache_dir() / self.filename
+        self._conn: Optional[sqlite3.Connection] = None
+        self._disabled = False
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        if self._conn is not None or self._disabled:
+            return self._conn
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table} "
+                "(key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+            )
+            conn.commit()
+            self._conn = conn
+        except (OSError, sqlite3.Error) as e:
+            logger.debug("Disabling cache %s: %s", self.path, e)
+            self._disabled = True
+        return self._conn
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, str]:
+        conn = self._connect()
+        keys = list(keys)
+        if conn is None or not keys:
+            return {}
+        found = {}
+        try:
+            # stay well below SQLite's bound-parameter limit
+            for i in range(0, len(keys), 500):
+                chunk = keys[i : i + 500]
+                marks = ",".join("?" * len(chunk))
+                rows = conn.execute(
+                    f"SELECT key, value FROM {self.table} WHERE key IN ({marks})",
+                    chunk,
+                )
+                found.update(rows.fetchall())
+        except sqlite3.Error as e:
+            logger.debug("Cache read failed %s: %s", self.path, e)
+        return found
+
+    def put_many(self, items: Dict[str, str]) -> None:
+        conn = self._connect()
+        if conn is None or not items:
+            return
+        try:
+            with conn:
+                conn.executemany(
+                    f"INSERT OR REPLACE INTO {self.table} (key, value) VALUES (?, ?)",
+                    items.items(),
+                )
+        except sqlite3.Error as e:
+            logger.debug("Cache write failed %s: %s", self.path, e)
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+class Md5Cache(SqliteCache):
+    """md5 digests of local files keyed by (device, inode, size, mtime)."""
+
+    table = "md5"
+
+    def get(self, keys: Iterable[StatKey]) -> Dict[StatKey, str]:
+        keys = list(keys)
+        found = self.get_many(_encode(k) for k in keys)
+        return {k: found[_encode(k)] for k in keys if _encode(k) in found}
+
+    def put(self, items: Dict[StatKey, str]) -> None:
+        self.put_many({_encode(k): v for k, v in items.items()})
+
+
+class RemoteMetaCache(SqliteCache):
+    """Metadata of remote files (existence, size, etag, ...) with a TTL.
+
+    Values are JSON objects carrying a `fetched_at` unix timestamp; entries older
+    than the TTL are treated as misses.
+    """
+
+    table = "remote"
+
+    def __init__(self, path: Optional[Path] = None, ttl: Optional[float] = None):
+        super().__init__(path)
+        self.ttl = remote_cache_ttl() if ttl is None else ttl
+
+    def get(self, keys: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        if self.ttl <= 0:
+            return {}
+        oldest = time.time() - self.ttl
+        found = {}
+        for key, value in self.get_many(keys).items():
+            try:
+                meta = json.loads(value)
+            except ValueError:
+                continue
+            if meta.get("fetched_at", 0) >= oldest:
+                found[key] = meta
+        return found
+
+    def put(self, items: Dict[str, Dict[str, Any]]) -> None:
+        self.put_many({k: json.dumps(v) for k, v in items.items()})
+
+
+def _encode(key: StatKey) -> str:
+    return ":".join(str(x) for x in key)
@@ -0,0 +1,83 @@
+"""Check cache module for seqspec.
+
+This module provides the cache used by `seqspec check --incremental`. It is a
+JSON file next to the spec (`<spec>.check-cache.json`) holding results keyed by
+content: subtree-local rule results by region Merkle digest, schema errors by
+spec digest and onlist statistics by file stat. Each run writes back only the
+entries it used, so results for edited subtrees do not accumulate.
+"""
+
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+from seqspec import __version__
+
+logger = logging.getLogger(__name__)
+
+SUFFIX = ".check-cache.json"
+# bump when the layout of the cache file changes
+FORMAT = 1
+
+
+class CheckCache:
+    """Results of a previous check of one spec, keyed by content."""
+
+    def __init__(self, path: Union[str, Path, None] = None):
+        self.path = Path(path) if path else None
+        self._old: Dict[str, Dict[str, Any]] = {}
+        self._new: Dict[str, Dict[str, Any]] = {}
+        self.hits = 0
+        self.misses = 0
+        if self.path and self.path.exists():
+            try:
+                with open(self.path, "r") as f:
+                    data = json.load(f)
+                # rules change between versions, and so may their results
+                if data.get("format") == FORMAT and data.get("version") == __version__:
+                    self._old = data.get("sections", {})
+            except (OSError, ValueError) as e:
+                logger.debug("Ignoring check cache %s: %s", self.path, e)
+
+    @staticmethod
+    def path_for(spec_fn: Union[str, Path]) -> Path:
+        """Return the cache path for a spec file."""
+        return Path(str(spec_fn) + SUFFIX)
+
+    def get(self, section: str, key: str) -> Optional[Any]:
+        """Return the cached value, keeping it for the next run; None on a miss."""
+        value = self._new.get(section, {}).get(key)
+        if value is None:
+            value = self._old.get(section, {}).get(key)
+            if value is not None:
+                self._new.setdefault(section, {})[key] = value
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def put(self, section: str, key: str, value: Any) -> None:
+        self._new.setdefault(section, {})[key] = value
+
+    def save(self) -> None:
+        """Atomically write the entries used by this run. Errors are ignored."""
+        if self.path is None:
+            return
+        data = {"format": FORMAT, "version": __version__, "sections": self._new}
+        try:
+            fd, tmp = tempfile.mkstemp(
+                dir=self.path.parent, prefix=self.path.name, suffix=".tmp"
+            )
+            try:
+                with os.fdopen(fd, "w") as f:
+                    json.dump(data, f, separators=(",", ":"))
+                os.replace(tmp, self.path)
+            except BaseException:
+                os.unlink(tmp)
+                raise
+        except OSError as e:
+            logger.debug("Unable to write check cache %s: %s", self.path, e)
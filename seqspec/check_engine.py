@@ -0,0 +1,295 @@
+"""Check engine module for seqspec.
+
+This module provides the single-traversal rule engine behind `seqspec check`.
+Each modality's region tree and the read list are walked once; every node is
+dispatched to all registered rules, which share facts computed during the walk
+(leaves, leaf ids, onlist regions, primer positions) instead of re-walking the
+spec themselves.
+
+A rule subclasses `CheckRule`, overrides the hooks it needs and is registered
+with `register_rule`. Errors are reported per rule and concatenated in
+registration order, so the output does not depend on the traversal.
+
+With a `CheckCache`, rules marked `subtree_local` are not re-run on subtrees
+whose Merkle digest is unchanged since the previous run; their stored errors
+are spliced in instead.
+"""
+
+from itertools import accumulate
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Type
+
+from seqspec.Assay import Assay
+from seqspec.check_cache import CheckCache
+from seqspec.local_files import LocalFileIndex
+from seqspec.Read import Read
+from seqspec.Region import Region
+from seqspec.spec_hash import region_digests
+
+
+class CheckContext:
+    """Facts about a spec shared by all rules of one check run.
+
+    Region facts are complete once the region trees have been walked, i.e. in
+    `CheckRule.visit_read` and `CheckRule.finish`.
+    """
+
+    def __init__(
+        self,
+        spec: Assay,
+        raw: Optional[Dict] = None,
+        cache: Optional[CheckCache] = None,
+    ):
+        self.spec = spec
+        # the parsed spec file the Assay was built from, if known
+        self.raw = raw
+        # results of the previous run, for incremental checks
+        self.cache = cache
+        self.spec_base = _spec_base(spec)
+        # modality -> leaves, in order
+        self.leaves: Dict[str, List[Region]] = {}
+        # region_ids of all leaves across modalities
+        self.leaf_ids: set = set()
+        # regions with an onlist, in spec order
+        self.onlist_regions: List[Region] = []
+        # local onlist path -> its statistics, read once for all rules
+        self.onlist_stats: Dict[str, Any] = {}
+        # modality -> region_id -> (first leaf index, end leaf index) of its first occurrence
+        self.spans: Dict[str, Dict[str, Tuple[int, int]]] = {}
+        # modality -> region_id -> number of occurrences in the tree
+        self.region_id_counts: Dict[str, Dict[str, int]] = {}
+        # modality -> prefix sums of leaf max_len
+        self._max_prefix: Dict[str, List[int]] = {}
+        self._libspecs: Dict[str, Region] = {}
+        self._local_files: Optional[LocalFileIndex] = None
+
+    @property
+    def local_files(self) -> LocalFileIndex:
+        """Existence and stats of the spec's local read files and onlists.
+
+        Built on first use, with one listing per directory, so it is available
+        once the region trees have been walked.
+        """
+        if self._local_files is None:
+            paths = []
+            for read in self.spec.sequence_spec:
+                paths += [
+                    self.resolve(f.url) for f in read.files if f.urltype == "local"
+                ]
+            for rgn in self.onlist_regions:
+                if rgn.onlist.urltype == "local":
+                    paths.append(self.resolve(rgn.onlist.url))
+                    paths.append(self.resolve(rgn.onlist.url + ".gz"))
+            self._local_files = LocalFileIndex(paths)
+        return self._local_files
+
+    def resolve(self, url: str) -> str:
+        """Resolve a local url against the directory of the spec, if known."""
+        if self.spec_base and not Path(url).is_absolute():
+            return str((self.spec_base / url).resolve())
+        return url
+
+    def elements_max_len(self, read: Read) -> Optional[int]:
+        """Sum of max_len of the library elements sequenced by a read.
+
+        These are the leaves after the read's primer for the pos strand, and the
+        leaves before it otherwise, as in `Region.get_leaves_with_region_id`.
+
+        Returns:
+            The sum, or None if the primer is not in the modality's library.
+        """
+        m = read.modality
+        counts = self.region_id_counts.get(m, {})
+        n = counts.get(read.primer_id, 0)
+        if n == 0:
+            return None
+        if n == 1:
+            start, end = self.spans[m][read.primer_id]
+            prefix = self._max_prefix[m]
+            if read.strand == "pos":
+                return prefix[-1] - prefix[end]
+            return prefix[start]
+        # a primer id that occurs more than once: fall back to the tree walk
+        leaves = self._libspecs[m].get_leaves_with_region_id(read.primer_id)
+        pidx = next(i for i, r in enumerate(leaves) if r.region_id == read.primer_id)
+        elements = leaves[pidx + 1 :] if read.strand == "pos" else leaves[:pidx]
+        return sum(r.max_len for r in elements)
+
+
+class CheckRule:
+    """A check rule. Subclasses override the hooks they need.
+
+    Attributes:
+        name: The rule's error_type.
+        optional: For optional rules, the option they only run with, e.g.
+            "md5" for `check --md5`.
+        subtree_local: The rule's errors for a region subtree depend only on
+            that subtree, so they can be reused while its digest is unchanged.
+    """
+
+    name = ""
+    optional: Optional[str] = None
+    subtree_local = False
+
+    def __init__(self, ctx: CheckContext):
+        self.ctx = ctx
+        self.errors: List[Dict] = []
+
+    def enter_region(self, rgn: Region, modality: str) -> None:
+        """Called for every region, before its subregions (pre-order)."""
+
+    def leave_region(self, rgn: Region, modality: str) -> None:
+        """Called for every region, after its subregions (post-order)."""
+
+    def visit_read(self, read: Read) -> None:
+        """Called for every read, after all region trees were walked."""
+
+    def finish(self) -> None:
+        """Called once at the end, for spec-level and batched checks."""
+
+    def error(self, message: str, error_object: str) -> None:
+        self.errors.append(
+            {
+                "error_type": self.name,
+                "error_message": message,
+                "error_object": error_object,
+            }
+        )
+
+
+RULES: Dict[str, Type[CheckRule]] = {}
+
+
+def register_rule(cls: Type[CheckRule]) -> Type[CheckRule]:
+    """Register a rule class under its name; rules run in registration order."""
+    RULES[cls.name] = cls
+    return cls
+
+
+def run_rules(
+    spec: Assay,
+    rules: Optional[Sequence[Type[CheckRule]]] = None,
+    raw: Optional[Dict] = None,
+    cache: Optional[CheckCache] = None,
+    timings: Optional[Dict[str, float]] = None,
+) -> List[Dict]:
+    """Run rules over a spec in a single traversal and return their errors.
+
+    Args:
+        spec: The Assay object to check
+        rules: Rule classes to run (default: all registered non-optional rules)
+        raw: The parsed spec file `spec` was loaded from, if unmodified
+        cache: Results of a previous run to reuse, updated with this run's
+        timings: If given, filled with the seconds spent in each rule
+
+    Returns:
+        List of error dictionaries, grouped by rule in the order of `rules`
+    """
+    if rules is None:
+        rules = [r for r in RULES.values() if not r.optional]
+    ctx = CheckContext(spec, raw, cache)
+    instances = [r(ctx) for r in rules]
+    if timings is not None:
+        for r in instances:
+            _time_hooks(r, timings)
+
+    # subtree-local rules are dispatched per subtree, the others everywhere
+    shared = [r for r in instances if not (cache and r.subtree_local)]
+    local = [r for r in instances if cache and r.subtree_local]
+    enter = _hooks(shared, "enter_region")
+    leave = _hooks(shared, "leave_region")
+    visit_read = _hooks(instances, "visit_read")
+
+    for m in spec.modalities:
+        libspec = spec.get_libspec(m)
+        ctx._libspecs[m] = libspec
+        leaves: List[Region] = []
+        spans: Dict[str, Tuple[int, int]] = {}
+        counts: Dict[str, int] = {}
+        digests = region_digests(libspec) if local else {}
+
+        def walk(rgn: Region, active: List[CheckRule]) -> None:
+            marks = {}
+            if active and rgn.regions:
+                d = digests[id(rgn)]
+                pending = []
+                for r in active:
+                    hit = cache.get("subtree", f"{r.name}:{d}")
+                    if hit is None:
+                        marks[r] = len(r.errors)
+                        pending.append(r)
+                    else:
+                        r.errors.extend(hit)
+                active = pending
+            for f in enter:
+                f(rgn, m)
+            for r in active:
+                r.enter_region(rgn, m)
+            if rgn.onlist:
+                ctx.onlist_regions.append(rgn)
+            counts[rgn.region_id] = counts.get(rgn.region_id, 0) + 1
+            start = len(leaves)
+            if rgn.regions:
+                for sub in rgn.regions:
+                    walk(sub, active)
+            else:
+                leaves.append(rgn)
+            spans.setdefault(rgn.region_id, (start, len(leaves)))
+            for f in leave:
+                f(rgn, m)
+            for r in active:
+                r.leave_region(rgn, m)
+            for r, n in marks.items():
+                cache.put("subtree", f"{r.name}:{digests[id(rgn)]}", r.errors[n:])
+
+        walk(libspec, local)
+        ctx.leaves[m] = leaves
+        ctx.leaf_ids.update(r.region_id for r in leaves)
+        ctx.spans[m] = spans
+        ctx.region_id_counts[m] = counts
+        ctx._max_prefix[m] = [0, *accumulate(r.max_len for r in leaves)]
+
+    for read in spec.sequence_spec:
+        for f in visit_read:
+            f(read)
+
+    errors: List[Dict] = []
+    for rule in instances:
+        rule.finish()
+        errors.extend(rule.errors)
+    return errors
+
+
+def _time_hooks(rule: CheckRule, timings: Dict[str, float]) -> None:
+    # shadow the rule's overridden hooks with timed wrappers on the instance
+    timings.setdefault(rule.name, 0.0)
+    for hook in ("enter_region", "leave_region", "visit_read", "finish"):
+        if getattr(type(rule), hook) is getattr(CheckRule, hook):
+            continue
+        f = getattr(rule, hook)
+
+        def timed(*args, f=f):
+            start = perf_counter()
+            try:
+                return f(*args)
+            finally:
+                timings[rule.name] += perf_counter() - start
+
+        setattr(rule, hook, timed)
+
+
+def _hooks(instances: List[CheckRule], hook: str) -> List[Callable]:
+    # only dispatch to rules that override the hook
+    base = getattr(CheckRule, hook)
+    return [getattr(r, hook) for r in instances if getattr(type(r), hook) is not base]
+
+
+def _spec_base(spec: Assay) -> Optional[Path]:
+    try:
+        spec_path = getattr(spec, "_spec_path", None)
+        if spec_path:
+            return Path(spec_path).parent
+    except Exception:
+        pass
+    return None
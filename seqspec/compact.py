@@ -0,0 +1,262 @@
+"""Compact module for seqspec.
+
+This module provides a compact, read-only representation of specs for holding
+many of them in memory, e.g. in a long-running query service or for corpus
+analytics. `CompactAssay`, `CompactRegion`, `CompactRead`, `CompactFile`,
+`CompactOnlist` and the kit/protocol classes have the fields of the pydantic
+models, stored in `__slots__`, with lists as tuples and enum values as plain
+strings. Instances cannot be modified.
+
+A `CompactPool` converts pydantic models: equal strings are stored once, and
+equal files, onlists, regions (whole subtrees), reads and kits become one
+shared instance, across all the specs converted with the same pool.
+
+The compact classes have the query methods of the models (`get_libspec`,
+`get_seqspec`, `get_read`, `get_leaves`, `get_region_by_id`, `model_dump`,
+...), so the query and index functions (`seqspec_index`, `seqspec_find`,
+`seqspec_file`, `seqspec_info`, `map_read_id_to_regions`, ...) accept them in
+place of an `Assay`. `to_model()` converts back.
+"""
+
+from enum import Enum
+from typing import Any, Dict, Optional, Tuple
+
+from pydantic import BaseModel
+
+from seqspec.Assay import Assay, LibKit, LibProtocol, SeqKit, SeqProtocol
+from seqspec.File import File
+from seqspec.Read import Read
+from seqspec.Region import Onlist, Region
+
+
+class _Compact:
+    """Base of the compact classes: read-only slots named after model fields."""
+
+    __slots__ = ()
+    _fields: Tuple[str, ...] = ()
+    _model: type = BaseModel
+
+    def __init__(self, **values: Any):
+        for field in self._fields:
+            object.__setattr__(self, field, values[field])
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __eq__(self, other: Any) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return other is self or all(
+            getattr(self, f) == getattr(other, f) for f in self._fields
+        )
+
+    def __hash__(self) -> int:
+        return hash(tuple(getattr(self, f) for f in self._fields))
+
+    def __reduce__(self):
+        return _restore, (type(self), self._state())
+
+    def _state(self) -> Dict[str, Any]:
+        return {f: getattr(self, f) for f in self._fields}
+
+    def model_dump(self) -> Dict[str, Any]:
+        """Return the fields as a dict, like the model's `model_dump()`."""
+        return {f: _dump(getattr(self, f)) for f in self._fields}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return self.model_dump()
+
+    def to_model(self) -> BaseModel:
+        """Return the pydantic model with the same content."""
+        return self._model.model_validate(self.model_dump())
+
+
+def _restore(cls: type, state: Dict[str, Any]) -> "_Compact":
+    return cls(**state)
+
+
+def _dump(value: Any) -> Any:
+    if isinstance(value, _Compact):
+        return value.model_dump()
+    if isinstance(value, tuple):
+        return [_dump(v) for v in value]
+    return value
+
+
+class CompactFile(_Compact):
+    __slots__ = _fields = tuple(File.model_fields)
+    _model = File
+    __repr__ = File.__repr__
+
+
+class CompactOnlist(_Compact):
+    __slots__ = _fields = tuple(Onlist.model_fields)
+    _model = Onlist
+
+
+class CompactSeqProtocol(_Compact):
+    __slots__ = _fields = tuple(SeqProtocol.model_fields)
+    _model = SeqProtocol
+
+
+class CompactSeqKit(_Compact):
+    __slots__ = _fields = tuple(SeqKit.model_fields)
+    _model = SeqKit
+
+
+class CompactLibProtocol(_Compact):
+    __slots__ = _fields = tuple(LibProtocol.model_fields)
+    _model = LibProtocol
+
+
+class CompactLibKit(_Compact):
+    __slots__ = _fields = tuple(LibKit.model_fields)
+    _model = LibKit
+
+
+class CompactRegion(_Compact):
+    __slots__ = _fields = tuple(Region.model_fields)
+    _model = Region
+
+    # the read-only queries of Region only use fields and each other
+    __repr__ = Region.__repr__
+    get_sequence = Region.get_sequence
+    get_len = Region.get_len
+    get_region_by_id = Region.get_region_by_id
+    get_region_by_region_type = Region.get_region_by_region_type
+    get_onlist_regions = Region.get_onlist_regions
+    get_onlist = Region.get_onlist
+    get_leaves = Region.get_leaves
+    get_leaves_with_region_id = Region.get_leaves_with_region_id
+    get_leaf_region_types = Region.get_leaf_region_types
+    to_newick = Region.to_newick
+
+
+class CompactRead(_Compact):
+    __slots__ = _fields = tuple(Read.model_fields)
+    _model = Read
+
+    __repr__ = Read.__repr__
+    get_read_by_file_id = Read.get_read_by_file_id
+
+
+class CompactAssay(_Compact):
+    __slots__ = _fields = tuple(Assay.model_fields)
+    __slots__ += ("_spec_path",)
+    _model = Assay
+
+    __repr__ = Assay.__repr__
+    print_sequence = Assay.print_sequence
+    get_libspec = Assay.get_libspec
+    get_seqspec = Assay.get_seqspec
+    get_read = Assay.get_read
+
+    def list_modalities(self):
+        return list(self.modalities)
+
+    def __init__(self, _spec_path: Optional[str] = None, **values: Any):
+        super().__init__(**values)
+        object.__setattr__(self, "_spec_path", _spec_path)
+
+    def _state(self) -> Dict[str, Any]:
+        return {**super()._state(), "_spec_path": self._spec_path}
+
+    def to_model(self) -> Assay:
+        """Return the `Assay` with the same content."""
+        assay = Assay.model_validate(self.model_dump())
+        assay._spec_path = self._spec_path
+        return assay
+
+
+COMPACT_CLASSES = {
+    c._model: c
+    for c in (
+        CompactFile,
+        CompactOnlist,
+        CompactSeqProtocol,
+        CompactSeqKit,
+        CompactLibProtocol,
+        CompactLibKit,
+        CompactRegion,
+        CompactRead,
+        CompactAssay,
+    )
+}
+
+
+class CompactPool:
+    """Converts models to compact instances, sharing equal strings and objects.
+
+    Objects converted by one pool share every string and sub-object that is
+    equal to one converted before, so a pool should be reused for all the specs
+    held in memory together. The pool keeps the shared objects alive.
+    """
+
+    def __init__(self):
+        self._strings: Dict[str, str] = {}
+        self._objects: Dict[tuple, _Compact] = {}
+
+    def __len__(self) -> int:
+        """Number of distinct objects in the pool."""
+        return len(self._objects)
+
+    def compact(self, model: BaseModel) -> Any:
+        """Return the compact, shared instance equal to a model.
+
+        Args:
+            model: An `Assay`, `Region`, `Read`, `File`, `Onlist` or kit or
+                protocol model.
+        """
+        cls = COMPACT_CLASSES.get(type(model))
+        if cls is None:
+            for model_cls, compact_cls in COMPACT_CLASSES.items():
+                if isinstance(model, model_cls):
+                    cls = compact_cls
+                    break
+            else:
+                raise TypeError(f"Cannot compact {type(model).__name__}")
+        values = {f: self._value(getattr(model, f)) for f in cls._fields}
+        if cls is CompactAssay:
+            # one per spec, to keep its path
+            return CompactAssay(_spec_path=model._spec_path, **values)
+        key = (cls, *(_key(values[f]) for f in cls._fields))
+        obj = self._objects.get(key)
+        if obj is None:
+            obj = self._objects[key] = cls(**values)
+        return obj
+
+    def _value(self, value: Any) -> Any:
+        if isinstance(value, Enum):
+            value = value.value
+        if isinstance(value, str):
+            return self._strings.setdefault(value, value)
+        if isinstance(value, BaseModel):
+            return self.compact(value)
+        if isinstance(value, list):
+            return tuple(self._value(v) for v in value)
+        return value
+
+
+def _key(value: Any) -> Any:
+    # compact values are pooled, so they are equal exactly if they are the same
+    if isinstance(value, _Compact):
+        return id(value)
+    if isinstance(value, tuple):
+        return tuple(_key(v) for v in value)
+    return value
+
+
+def compact(spec: Assay, pool: Optional[CompactPool] = None) -> CompactAssay:
+    """Convert a spec to its compact, read-only representation.
+
+    Args:
+        spec: The spec to convert.
+        pool: Pool shared with other converted specs; a new one if None.
+
+    Returns:
+        The compact spec.
+    """
+    return (pool or CompactPool()).compact(spec)
@@ -0,0 +1,113 @@
+"""Fragments module for seqspec.
+
+This module provides sharing of identical region subtrees and onlists.
+Generated specs often repeat the same adapters, primers and onlists in every
+modality or sample. `shared_dump` dumps a spec with one dict per distinct
+region subtree and onlist (identified by their content digests, see
+`seqspec.spec_hash`), so the YAML writer emits the repeats as anchors and
+aliases:
+
+    - &id001
+      region_id: illumina_p5
+      ...
+    - *id001
+
+`share_aliases` speeds up loading such a spec: mappings that a YAML alias made
+occur more than once are validated once, and their other occurrences are
+copies of the validated `Region` or `Onlist`. Every occurrence is a separate
+instance, so an edit to one leaves the others as they are, as for a spec
+written without aliases; `shared_dump` shares them again when the spec is
+written.
+"""
+
+from collections import Counter
+from typing import Any, Dict
+
+from seqspec.Assay import Assay
+from seqspec.Region import Onlist, Region
+from seqspec.spec_hash import model_digest, region_digests
+
+
+def shared_dump(spec: Assay) -> Dict[str, Any]:
+    """Return `spec.model_dump()` with identical regions and onlists shared.
+
+    Every region subtree or onlist whose content equals one seen before is
+    replaced by the dict of that first occurrence.
+    """
+    dump = spec.model_dump()
+    digests: Dict[int, str] = {}
+    for region in spec.library_spec:
+        digests.update(region_digests(region))
+    seen: Dict[str, dict] = {}
+
+    def visit(region: Region, d: dict) -> dict:
+        key = digests[id(region)]
+        if key in seen:
+            return seen[key]
+        seen[key] = d
+        if region.onlist is not None:
+            d["onlist"] = seen.setdefault(
+                "onlist:" + model_digest(region.onlist), d["onlist"]
+            )
+        d["regions"] = [visit(r, rd) for r, rd in zip(region.regions, d["regions"])]
+        return d
+
+    dump["library_spec"] = [
+        visit(r, d) for r, d in zip(spec.library_spec, dump["library_spec"])
+    ]
+    return dump
+
+
+def share_aliases(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Validate the regions and onlists that occur more than once in raw data once.
+
+    Args:
+        data: A raw spec dict, as parsed from YAML. It is not modified.
+
+    Returns:
+        `data` if no region or onlist mapping occurs twice. Otherwise a copy in
+        which each occurrence of such a mapping is replaced by a `Region` or
+        `Onlist`, validated for the first and copied for the others, ready for
+        `Assay(**data)`.
+    """
+    library = data.get("library_spec") if isinstance(data, dict) else None
+    if not isinstance(library, list):
+        return data
+    counts: Counter = Counter()
+    todo = list(library)
+    while todo:
+        d = todo.pop()
+        if not isinstance(d, dict):
+            continue
+        counts[id(d)] += 1
+        if counts[id(d)] > 1:
+            continue
+        if isinstance(d.get("onlist"), dict):
+            counts[id(d["onlist"])] += 1
+        if isinstance(d.get("regions"), list):
+            todo.extend(d["regions"])
+    shared = {key for key, n in counts.items() if n > 1}
+    if not shared:
+        return data
+
+    built: Dict[int, Any] = {}
+
+    def build(d: Any) -> Any:
+        if not isinstance(d, dict):
+            return d
+        if id(d) in built:
+            return built[id(d)].model_copy(deep=True)
+        new = dict(d)
+        if isinstance(d.get("regions"), list):
+            new["regions"] = [build(r) for r in d["regions"]]
+        onlist = d.get("onlist")
+        if isinstance(onlist, dict) and id(onlist) in shared:
+            if id(onlist) in built:
+                new["onlist"] = built[id(onlist)].model_copy(deep=True)
+            else:
+                new["onlist"] = built[id(onlist)] = Onlist(**onlist)
+        if id(d) in shared:
+            new = built[id(d)] = Region(**new)
+        return new
+
+    return {**data, "library_spec": [build(r) for r in library]}
@@ -0,0 +1,19 @@
+"""GenBank module for seqspec.
+
+This module provides GenBank file loading (used by `seqspec convert`). It
+imports Biopython, so it is only loaded when GenBank files are read.
+"""
+
+import io
+
+from Bio import GenBank
+
+
+def load_genbank(gbk_fn: str):
+    with open(gbk_fn, "r") as stream:
+        return load_genbank_stream(stream)
+
+
+def load_genbank_stream(gbk_stream: io.IOBase):
+    data: GenBank = GenBank.read(gbk_stream)  # type: ignore
+    return data
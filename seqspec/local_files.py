@@ -0,0 +1,120 @@
+"""Local files module for seqspec.
+
+This module provides batched existence and stat lookups of local files. Paths
+are grouped by parent directory and each directory is listed once with
+`os.scandir`, in parallel across directories, instead of probing every file on
+its own: on network filesystems (NFS, Lustre) per-file metadata calls are slow
+and a listing is much cheaper. Existence is answered from the listing alone;
+stats (size, mtime) are only taken for the files that need them, in the same
+kind of thread pool, and are kept so that e.g. filesize checks and the md5
+cache share them.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Mapping, Optional, Union
+
+# files stat'ed per task, so that large directories are spread over the pool
+STAT_CHUNK = 256
+
+# marks a path whose directory could not be listed
+_UNLISTED = object()
+
+
+class LocalFileIndex:
+    """Existence and stats of a set of local files, from directory listings."""
+
+    def __init__(self, paths: Iterable[str] = (), max_workers: Optional[int] = None):
+        self.max_workers = max_workers
+        # path -> its directory entry, None if it is not listed, or _UNLISTED
+        self._entries: Dict[str, Union[os.DirEntry, None, object]] = {}
+        # path -> stat (following symlinks), None if it does not exist
+        self._stats: Dict[str, Optional[os.stat_result]] = {}
+        self.scan(paths)
+
+    def scan(self, paths: Iterable[str]) -> None:
+        """List the directories of the paths not seen yet, in parallel."""
+        todo: Dict[str, Dict[str, str]] = {}
+        for p in map(os.fspath, paths):
+            if p in self._entries:
+                continue
+            head, name = os.path.split(p)
+            if name and name not in (os.curdir, os.pardir):
+                todo.setdefault(head, {})[name] = p
+            else:
+                # e.g. a trailing separator or '..': nothing to look up in a listing
+                self._entries[p] = _UNLISTED
+        if not todo:
+            return
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            listings = pool.map(_list_dir, todo.keys(), todo.values())
+            for names, entries in zip(todo.values(), listings):
+                for name, p in names.items():
+                    self._entries[p] = (
+                        _UNLISTED if entries is None else entries.get(name)
+                    )
+
+    def exists(self, path: str) -> bool:
+        """Return whether a path exists, as `os.path.exists` would."""
+        if path not in self._entries:
+            self.scan([path])
+        entry = self._entries[path]
+        if entry is None:
+            return False
+        if entry is _UNLISTED or entry.is_symlink():
+            # broken symlinks are listed but do not exist
+            return self.stat(path) is not None
+        return True
+
+    def stats(self, paths: Iterable[str]) -> Dict[str, Optional[os.stat_result]]:
+        """Return the stats of many files, taken in parallel and kept.
+
+        Returns:
+            Dictionary mapping each path to its stat (following symlinks), or to
+            None if it does not exist.
+        """
+        paths = list(dict.fromkeys(map(os.fspath, paths)))
+        self.scan(paths)
+        todo = [p for p in paths if p not in self._stats]
+        if todo:
+            chunks = [todo[i : i + STAT_CHUNK] for i in range(0, len(todo), STAT_CHUNK)]
+            if len(chunks) == 1:
+                self._stats.update(zip(todo, self._stat_chunk(todo)))
+            else:
+                with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                    stats = pool.map(self._stat_chunk, chunks)
+                    for chunk, chunk_stats in zip(chunks, stats):
+                        self._stats.update(zip(chunk, chunk_stats))
+        return {p: self._stats[p] for p in paths}
+
+    def stat(self, path: str) -> Optional[os.stat_result]:
+        """Return the stat of a file (following symlinks), None if it does not exist."""
+        return self.stats([path])[path]
+
+    def _stat_chunk(self, paths: List[str]) -> List[Optional[os.stat_result]]:
+        stats = []
+        for p in paths:
+            entry = self._entries[p]
+            try:
+                if entry is None:
+                    st = None
+                elif entry is _UNLISTED:
+                    st = os.stat(p)
+                else:
+                    st = entry.stat()
+            except OSError:
+                st = None
+            stats.append(st)
+        return stats
+
+
+def _list_dir(head: str, names: Mapping[str, str]) -> Optional[Dict[str, os.DirEntry]]:
+    # entries of a directory with one of the given names; None if it cannot be
+    # listed, e.g. a directory that can be traversed but not read
+    try:
+        with os.scandir(head or os.curdir) as it:
+            return {e.name: e for e in it if e.name in names}
+    except (FileNotFoundError, NotADirectoryError):
+        return {}
+    except OSError:
+        return None
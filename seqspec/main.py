@@ -4,37 +4,96 @@ This module provides the main entry point for the seqspec command-line interface
 It handles argument parsing, command routing, and execution of subcommands.
 """
 
+import json
 import logging
 import sys
+import time
 import warnings
 from argparse import ArgumentParser, Namespace, RawTextHelpFormatter
-from typing import Any, Callable, Dict
-
-from . import __version__
-from .seqspec_build import run_build, setup_build_args
-from .seqspec_check import run_check, setup_check_args
-from .seqspec_file import run_file, setup_file_args
-from .seqspec_find import run_find, setup_find_args
-from .seqspec_format import run_format, setup_format_args
-from .seqspec_index import run_index, setup_index_args
-from .seqspec_info import run_info, setup_info_args
-from .seqspec_init import run_init, setup_init_args
-from .seqspec_insert import run_insert, setup_insert_args
-from .seqspec_methods import run_methods, setup_methods_args
-from .seqspec_modify import run_modify, setup_modify_args
-from .seqspec_onlist import run_onlist, setup_onlist_args
-from .seqspec_print import run_print, setup_print_args
-from .seqspec_split import run_split, setup_split_args
-from .seqspec_upgrade import run_upgrade, setup_upgrade_args
-from .seqspec_version import run_version, setup_version_args
-
-
-def setup_parser():
+from importlib import import_module
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from . import _IMPORT_STARTED, __version__
+from .profiling import phase, profile
+from .tracing import enable_tracing, span
+
+# command -> (module, help). A command's module is imported only when the
+# command is run, so that e.g. `seqspec version` does not pay for the imports of
+# `seqspec build`; it must define `setup_<command>_args` and `run_<command>`.
+COMMANDS: Dict[str, Tuple[str, str]] = {
+    "batch": ("seqspec_batch", "Run many subcommands against one spec"),
+    "build": (
+        "seqspec_build",
+        "Generate a complete seqspec with natural language.",
+    ),
+    "check": ("seqspec_check", "Validate seqspec file against specification"),
+    "diff": ("seqspec_diff", "Compare two seqspec files and identify differences"),
+    "find": ("seqspec_find", "Find objects in seqspec file"),
+    "file": ("seqspec_file", "List files present in seqspec file"),
+    "format": ("seqspec_format", "Autoformat seqspec file"),
+    # "convert": ("seqspec_convert", "Convert between different formats"),
+    "index": ("seqspec_index", "Identify position of elements in seqspec file"),
+    "info": ("seqspec_info", "Get information from seqspec file"),
+    "init": ("seqspec_init", "Generate a new empty seqspec file"),
+    "insert": ("seqspec_insert", "Insert regions or reads into an existing spec"),
+    "methods": ("seqspec_methods", "Convert seqspec file into methods section"),
+    "modify": (
+        "seqspec_modify",
+        "Modify attributes of various elements in seqspec file",
+    ),
+    "onlist": ("seqspec_onlist", "Get onlist file for elements in seqspec file"),
+    "print": (
+        "seqspec_print",
+        "Display the sequence and/or library structure from seqspec file",
+    ),
+    "similarity": (
+        "seqspec_similarity",
+        "Compute pairwise similarities between many specs",
+    ),
+    "split": ("seqspec_split", "Split seqspec file by modality"),
+    "upgrade": ("seqspec_upgrade", "Upgrade seqspec file to current version"),
+    "version": (
+        "seqspec_version",
+        "Get seqspec tool version and seqspec file version",
+    ),
+}
+
+# global options that take a value, so the command can be found before parsing
+GLOBAL_VALUE_OPTIONS = {"--profile-output", "--profile-pstats", "--trace"}
+
+
+def load_command(command: str):
+    """Import and return the module implementing a command."""
+    return import_module(f"{__package__}.{COMMANDS[command][0]}")
+
+
+def find_command(argv: List[str]) -> Optional[str]:
+    """Return the command named in command line arguments, if any."""
+    skip = False
+    for arg in argv:
+        if skip:
+            skip = False
+        elif arg in GLOBAL_VALUE_OPTIONS:
+            skip = True
+        elif not arg.startswith("-"):
+            return arg if arg in COMMANDS else None
+    return None
+
+
+def setup_parser(command: Optional[str] = None):
     """Create and configure the main argument parser.
 
+    Only the parser of `command` is set up by its module; the other commands
+    get a placeholder that lists them in the help.
+
+    Args:
+        command: The command to set up fully (default: the one in `sys.argv`).
+
     Returns:
         Configured ArgumentParser instance.
     """
+    if command is None:
+        command = find_command(sys.argv[1:])
     parser = ArgumentParser(
         description=f"""
 seqspec {__version__}: A machine-readable file format for genomic library sequence and structure.
@@ -45,31 +104,41 @@ Documentation: https://pachterlab.github.io/seqspec/
         formatter_class=RawTextHelpFormatter,
     )
 
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Report wall time, CPU time and peak memory per phase as JSON (stderr)",
+    )
+    parser.add_argument(
+        "--profile-output",
+        metavar="FILE",
+        help="Write the profile report to FILE instead of stderr (implies --profile)",
+    )
+    parser.add_argument(
+        "--profile-pstats",
+        metavar="FILE",
+        help="Also write a cProfile dump to FILE (implies --profile)",
+    )
+
+    parser.add_argument(
+        "--trace",
+        metavar="FILE",
+        help="Append OpenTelemetry spans to FILE as JSON Lines (see also SEQSPEC_TRACE)",
+    )
+
     subparsers = parser.add_subparsers(
         dest="command",
         metavar="<CMD>",
     )
 
-    # Setup the arguments for all subcommands
-    command_to_parser = {
-        "build": setup_build_args(subparsers),
-        "check": setup_check_args(subparsers),
-        "find": setup_find_args(subparsers),
-        "file": setup_file_args(subparsers),
-        "format": setup_format_args(subparsers),
-        # "convert": setup_convert_args(subparsers),
-        "index": setup_index_args(subparsers),
-        "info": setup_info_args(subparsers),
-        "init": setup_init_args(subparsers),
-        "insert": setup_insert_args(subparsers),
-        "methods": setup_methods_args(subparsers),
-        "modify": setup_modify_args(subparsers),
-        "onlist": setup_onlist_args(subparsers),
-        "print": setup_print_args(subparsers),
-        "split": setup_split_args(subparsers),
-        "upgrade": setup_upgrade_args(subparsers),
-        "version": setup_version_args(subparsers),
-    }
+    # Setup the arguments for the requested subcommand only
+    command_to_parser = {}
+    for name, (_, help) in COMMANDS.items():
+        if name == command:
+            setup = getattr(load_command(name), f"setup_{name}_args")
+            command_to_parser[name] = setup(subparsers)
+        else:
+            command_to_parser[name] = subparsers.add_parser(name, help=help)
 
     return parser, command_to_parser
 
@@ -96,6 +165,41 @@ def handle_no_args(
         sys.exit(1)
 
 
+def run_profiled(
+    run: Callable[[ArgumentParser, Namespace], Any],
+    parser: ArgumentParser,
+    args: Namespace,
+    started: Tuple[float, float],
+) -> None:
+    """Run a subcommand under the profiler and emit its JSON report.
+
+    Args:
+        run: The subcommand's run function.
+        parser: Main argument parser.
+        args: Parsed arguments.
+        started: `time.perf_counter()` and `time.process_time()` when main was
+            entered, to report the time spent importing seqspec.
+    """
+    prof = None
+    try:
+        with profile(cprofile=bool(args.profile_pstats)) as prof:
+            prof.add_phase("import", started[0] - _IMPORT_STARTED, started[1])
+            with phase(args.command):
+                run(parser, args)
+    finally:
+        # the report is written even if the command fails or exits
+        if prof is not None:
+            report = {"command": args.command, "argv": sys.argv[1:]}
+            report.update(prof.report())
+            if args.profile_output:
+                with open(args.profile_output, "w") as f:
+                    json.dump(report, f, indent=2)
+            else:
+                print(json.dumps(report, indent=2), file=sys.stderr)
+            if args.profile_pstats:
+                prof.dump_pstats(args.profile_pstats)
+
+
 def main() -> None:
     """Main entry point for the seqspec CLI."""
     warnings.simplefilter("default", DeprecationWarning)
@@ -106,33 +210,21 @@ def main() -> None:
     )
 
     parser, command_to_parser = setup_parser()
+    # imports include the module of the command, loaded by setup_parser
+    started = (time.perf_counter(), time.process_time())
     handle_no_args(parser, command_to_parser)
 
     args = parser.parse_args()
 
-    # Setup validator and runner for all subcommands
-    command_to_function: Dict[str, Callable[[ArgumentParser, Namespace], Any]] = {
-        "format": run_format,
-        "print": run_print,
-        "build": run_build,
-        "check": run_check,
-        "find": run_find,
-        "index": run_index,
-        "info": run_info,
-        "init": run_init,
-        "methods": run_methods,
-        "modify": run_modify,
-        "onlist": run_onlist,
-        "split": run_split,
-        "version": run_version,
-        "file": run_file,
-        "upgrade": run_upgrade,
-        # "convert": run_convert,
-        "insert": run_insert,
-    }
-
     try:
-        command_to_function[sys.argv[1]](parser, args)
+        run = getattr(load_command(args.command), f"run_{args.command}")
+        if args.trace:
+            enable_tracing(args.trace)
+        with span(f"seqspec {args.command}", **{"seqspec.version": __version__}):
+            if args.profile or args.profile_output or args.profile_pstats:
+                run_profiled(run, parser, args, started)
+            else:
+                run(parser, args)
     except KeyError:
         parser.print_help(sys.stderr)
         sys.exit(1)
@@ -0,0 +1,155 @@
+"""Onlist statistics module for seqspec.
+
+This module computes summary statistics of onlist contents in a single streaming
+pass: entry count, distinct count, length histogram, invalid-character count and
+the minimum pairwise Hamming distance between entries of equal length.
+"""
+
+from collections import Counter
+from itertools import islice
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+from pydantic import BaseModel
+
+from seqspec.packed_onlist import MAX_PACKED_LEN, encode_sequences
+
+VALID_CHARS = frozenset("ACGTN")
+CHUNK_SIZE = 65536
+# Above this many distinct entries of one length, the minimum Hamming distance
+# (when it is not 0 or 1) is estimated from a sample of this size.
+HAMMING_SAMPLE_SIZE = 2048
+HAMMING_BLOCK_SIZE = 256
+
+_M1 = 0x5555555555555555
+
+
+class OnlistStats(BaseModel):
+    count: int = 0
+    distinct: int = 0
+    lengths: Dict[int, int] = {}
+    invalid: int = 0
+    min_hamming: Optional[int] = None
+    min_hamming_exact: bool = True
+
+
+def onlist_stats(
+    entries: Iterable[str],
+    sample_size: int = HAMMING_SAMPLE_SIZE,
+    seed: int = 0,
+) -> OnlistStats:
+    """Compute statistics of onlist entries in one streaming pass.
+
+    Args:
+        entries: Onlist entries, e.g. from `seqspec.utils.iter_local_list`.
+        sample_size: Maximum number of entries per length compared pairwise.
+        seed: Seed used when sampling entries for the Hamming distance.
+
+    Returns:
+        OnlistStats for the entries. The minimum Hamming distance only considers
+        entries made of A/C/G/T; `min_hamming_exact` is False when it was
+        estimated from a sample.
+    """
+    count = 0
+    invalid = 0
+    lengths: Counter = Counter()
+    chunks: List[np.ndarray] = []
+    unpacked = set()
+
+    it = iter(entries)
+    while chunk := list(islice(it, CHUNK_SIZE)):
+        count += len(chunk)
+        lengths.update(len(s) for s in chunk)
+        invalid += sum(1 for s in chunk if not VALID_CHARS.issuperset(s))
+        codes, valid = encode_sequences(chunk)
+        chunks.append(codes[valid])
+        unpacked.update(s for s, v in zip(chunk, valid) if not v)
+
+    codes = _sorted_unique(np.concatenate(chunks)) if chunks else np.zeros(0, np.uint64)
+    distinct = len(codes) + len(unpacked)
+
+    min_hamming = 0 if distinct < count else None
+    exact = True
+    if min_hamming is None:
+        min_hamming, exact = _min_hamming(codes, sample_size, seed)
+
+    return OnlistStats(
+        count=count,
+        distinct=distinct,
+        lengths=dict(sorted(lengths.items())),
+        invalid=invalid,
+        min_hamming=min_hamming,
+        min_hamming_exact=exact,
+    )
+
+
+def _min_hamming(codes: np.ndarray, sample_size: int, seed: int):
+    """Minimum Hamming distance between distinct packed codes of equal length."""
+    best = None
+    exact = True
+    bits = _code_lengths(codes)
+    for length in np.unique(bits):
+        group = codes[bits == length]
+        if len(group) < 2:
+            continue
+        if _has_distance_one(group, int(length)):
+            return 1, True
+        if len(group) > sample_size:
+            rng = np.random.default_rng(seed)
+            group = rng.choice(group, size=sample_size, replace=False)
+            exact = False
+        d = _pairwise_min(group)
+        best = d if best is None else min(best, d)
+    return best, (exact if best is not None else True)
+
+
+def _code_lengths(codes: np.ndarray) -> np.ndarray:
+    lengths = np.zeros(len(codes), dtype=np.int64)
+    tmp = codes.copy()
+    for _ in range(MAX_PACKED_LEN):
+        more = tmp > 1
+        if not more.any():
+            break
+        lengths += more
+        tmp >>= np.uint64(2)
+    return lengths
+
+
+def _has_distance_one(group: np.ndarray, length: int) -> bool:
+    """Exact test for two distinct codes differing at a single base."""
+    for j in range(length):
+        masked = np.sort(group & ~np.uint64(3 << (2 * j)))
+        if (masked[1:] == masked[:-1]).any():
+            return True
+    return False
+
+
+def _sorted_unique(codes: np.ndarray) -> np.ndarray:
+    # sort-based; faster than np.unique's hashing for large uint64 arrays
+    codes = np.sort(codes)
+    keep = np.ones(len(codes), dtype=bool)
+    keep[1:] = codes[1:] != codes[:-1]
+    return codes[keep]
+
+
+def _pairwise_min(group: np.ndarray) -> int:
+    """Minimum Hamming distance between distinct codes, in blocks of rows."""
+    best = MAX_PACKED_LEN
+    for i in range(0, len(group) - 1, HAMMING_BLOCK_SIZE):
+        block = group[i : i + HAMMING_BLOCK_SIZE]
+        x = block[:, None] ^ group[None, i + 1 :]
+        x = (x | (x >> np.uint64(1))) & np.uint64(_M1)
+        d = _popcount(x)
+        # ignore each code against itself and earlier codes in the block
+        rows, cols = np.indices(d.shape)
+        d = np.where(cols >= rows, d, MAX_PACKED_LEN)
+        if d.size:
+            best = min(best, int(d.min()))
+    return best
+
+
+def _popcount(x: np.ndarray) -> np.ndarray:
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(x)
+    bytes_ = x.view(np.uint8).reshape(*x.shape, 8)
+    return np.unpackbits(bytes_, axis=-1).sum(axis=-1)
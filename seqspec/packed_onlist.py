@@ -0,0 +1,323 @@
+"""Packed onlist module for seqspec.
+
+This module provides a compact, memory-mappable representation of onlist files.
+Barcodes made only of A/C/G/T (up to 31bp) are 2-bit packed into a sorted
+``uint64`` array; anything else (N, IUPAC codes, lowercase, longer entries) is
+kept verbatim in a side table. The packed form is written as a sidecar file next
+to the onlist so that repeated reads, and many worker processes, share pages.
+"""
+
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SIDECAR_SUFFIX = ".packed"
+MAGIC = b"SQSPOL01"
+VERSION = 1
+ALIGN = 64
+
+# One sentinel bit above the packed bases encodes the length, so 31 bases is the
+# most that fits in 64 bits.
+MAX_PACKED_LEN = 31
+
+_ALPHABET = np.frombuffer(b"ACGT", dtype=np.uint8)
+_LUT = np.full(256, 255, dtype=np.uint8)
+for _i, _c in enumerate(b"ACGT"):
+    _LUT[_c] = _i
+
+
+def _as_bytes_array(seqs: Sequence[str]) -> np.ndarray:
+    """Convert sequences to a fixed-width bytes array, replacing non-ascii chars."""
+    try:
+        return np.array(seqs, dtype="S")
+    except UnicodeEncodeError:
+        return np.array([s.encode("ascii", "replace") for s in seqs], dtype="S")
+
+
+def encode_sequences(seqs: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """2-bit encode a batch of sequences.
+
+    Args:
+        seqs: Sequences to encode.
+
+    Returns:
+        Tuple of (codes, valid). ``codes`` is a ``uint64`` array with a leading
+        sentinel bit marking the length; ``valid`` is False where a sequence is
+        longer than ``MAX_PACKED_LEN`` or contains characters other than A/C/G/T.
+    """
+    arr = _as_bytes_array(seqs)
+    n = arr.shape[0]
+    codes = np.ones(n, dtype=np.uint64)
+    if n == 0:
+        return codes, np.ones(0, dtype=bool)
+
+    lengths = np.char.str_len(arr)
+    valid = lengths <= MAX_PACKED_LEN
+    width = arr.dtype.itemsize
+    vals = _LUT[arr.view(np.uint8).reshape(n, width)]
+    two = np.uint64(2)
+    for j in range(min(width, MAX_PACKED_LEN)):
+        inside = j < lengths
+        v = vals[:, j]
+        valid &= ~inside | (v != 255)
+        codes = np.where(inside, (codes << two) | v.astype(np.uint64), codes)
+    codes[~valid] = 0
+    return codes, valid
+
+
+def decode_codes(codes: np.ndarray) -> List[str]:
+    """Decode 2-bit packed codes back to sequences."""
+    n = codes.shape[0]
+    if n == 0:
+        return []
+
+    lengths = np.zeros(n, dtype=np.int64)
+    tmp = codes.astype(np.uint64, copy=True)
+    two = np.uint64(2)
+    while True:
+        more = tmp > 1
+        if not more.any():
+            break
+        lengths += more
+        tmp >>= two
+
+    width = int(lengths.max())
+    # one extra column per row holds the newline used to split the decoded blob
+    out = np.zeros((n, width + 1), dtype=np.uint8)
+    for j in range(width):
+        inside = j < lengths
+        shift = np.where(inside, 2 * (lengths - 1 - j), 0).astype(np.uint64)
+        v = (codes >> shift) & np.uint64(3)
+        out[:, j] = np.where(inside, _ALPHABET[v], 0)
+    out[np.arange(n), lengths] = ord("\n")
+    blob = out.tobytes()
+    if (lengths != width).any():
+        blob = blob.replace(b"\0", b"")
+    return blob[:-1].decode("ascii").split("\n")
+
+
+class PackedOnlist:
+    """A sorted, 2-bit packed onlist with a side table for unpackable entries.
+
+    Attributes:
+        codes: Sorted ``uint64`` codes of the packable entries.
+        order: For every entry in file order, the index into ``codes`` or, when
+            ``>= len(codes)``, into the side table.
+        side: Entries that could not be packed, in file order.
+    """
+
+    def __init__(self, codes: np.ndarray, order: np.ndarray, side: List[str]):
+        self.codes = codes
+        self.order = order
+        self.side = side
+        self._side_set: Optional[Set[str]] = None
+
+    @classmethod
+    def from_sequences(cls, seqs: Sequence[str]) -> "PackedOnlist":
+        """Build a packed onlist from sequences in file order."""
+        seqs = list(seqs)
+        raw, valid = encode_sequences(seqs)
+        packed_idx = np.flatnonzero(valid)
+        side_idx = np.flatnonzero(~valid)
+
+        perm = np.argsort(raw[packed_idx], kind="stable")
+        codes = raw[packed_idx][perm]
+        rank = np.empty(len(perm), dtype=np.int64)
+        rank[perm] = np.arange(len(perm))
+
+        order_dtype = np.uint32 if len(seqs) < 2**32 else np.uint64
+        order = np.empty(len(seqs), dtype=order_dtype)
+        order[packed_idx] = rank
+        order[side_idx] = len(codes) + np.arange(len(side_idx))
+        side = [seqs[i] for i in side_idx]
+        return cls(codes, order, side)
+
+    def __len__(self) -> int:
+        return int(self.order.shape[0])
+
+    def __contains__(self, seq: str) -> bool:
+        return bool(self.contains([seq])[0])
+
+    def to_list(self) -> List[str]:
+        """Return the entries as strings, in the original file order."""
+        if not self.side:
+            return decode_codes(np.asarray(self.codes)[np.asarray(self.order)])
+        values = np.empty(len(self.codes) + len(self.side), dtype=object)
+        values[: len(self.codes)] = decode_codes(np.asarray(self.codes))
+        values[len(self.codes) :] = self.side
+        return values[np.asarray(self.order)].tolist()
+
+    def contains(self, seqs: Sequence[str]) -> np.ndarray:
+        """Vectorized membership test for a batch of sequences.
+
+        Args:
+            seqs: Query sequences.
+
+        Returns:
+            Boolean array, True where the query is in the onlist.
+        """
+        queries, valid = encode_sequences(seqs)
+        hit = np.zeros(len(queries), dtype=bool)
+        if len(self.codes):
+            idx = np.searchsorted(self.codes, queries)
+            idx[idx == len(self.codes)] = 0
+            hit = valid & (np.asarray(self.codes)[idx] == queries)
+        if self.side:
+            if self._side_set is None:
+                self._side_set = set(self.side)
+            for i in np.flatnonzero(~valid):
+                hit[i] = seqs[i] in self._side_set
+        return hit
+
+    def write(self, path: Union[str, Path], source: Optional[os.stat_result] = None):
+        """Atomically write the packed onlist to ``path``.
+
+        Args:
+            path: Destination of the sidecar file.
+            source: Stat of the source onlist, recorded to detect staleness.
+        """
+        side_data = np.frombuffer("".join(self.side).encode("utf-8"), dtype=np.uint8)
+        side_offsets = np.zeros(len(self.side) + 1, dtype=np.uint64)
+        side_offsets[1:] = np.cumsum([len(s.encode("utf-8")) for s in self.side])
+        arrays = {
+            "codes": np.ascontiguousarray(self.codes, dtype=np.uint64),
+            "order": np.ascontiguousarray(self.order),
+            "side_offsets": side_offsets,
+            "side_data": side_data,
+        }
+
+        header: Dict = {
+            "version": VERSION,
+            "source_size": source.st_size if source else None,
+            "source_mtime_ns": source.st_mtime_ns if source else None,
+            "arrays": {},
+        }
+        offset = 0
+        for name, arr in arrays.items():
+            header["arrays"][name] = {
+                "offset": offset,
+                "dtype": arr.dtype.str,
+                "shape": list(arr.shape),
+            }
+            offset += _aligned(arr.nbytes)
+
+        header_bytes = json.dumps(header).encode("utf-8")
+        prefix = len(MAGIC) + 8 + len(header_bytes)
+        data_start = _aligned(prefix)
+
+        path = Path(path)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(MAGIC)
+                f.write(len(header_bytes).to_bytes(8, "little"))
+                f.write(header_bytes)
+                f.write(b"\0" * (data_start - prefix))
+                for arr in arrays.values():
+                    f.write(arr.tobytes())
+                    f.write(b"\0" * (_aligned(arr.nbytes) - arr.nbytes))
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+
+    @classmethod
+    def open(cls, path: Union[str, Path]) -> Tuple["PackedOnlist", Dict]:
+        """Memory-map a packed onlist sidecar.
+
+        Returns:
+            Tuple of (packed onlist, header dict).
+
+        Raises:
+            ValueError: If the file is not a packed onlist of a supported version.
+        """
+        buf = np.memmap(path, dtype=np.uint8, mode="r")
+        if bytes(buf[: len(MAGIC)]) != MAGIC:
+            raise ValueError(f"Not a packed onlist: {path}")
+        hlen = int.from_bytes(bytes(buf[len(MAGIC) : len(MAGIC) + 8]), "little")
+        hstart = len(MAGIC) + 8
+        header = json.loads(bytes(buf[hstart : hstart + hlen]).decode("utf-8"))
+        if header.get("version") != VERSION:
+            raise ValueError(f"Unsupported packed onlist version: {path}")
+
+        data_start = _aligned(hstart + hlen)
+        arrays = {}
+        for name, meta in header["arrays"].items():
+            dtype = np.dtype(meta["dtype"])
+            count = int(np.prod(meta["shape"], dtype=np.int64))
+            start = data_start + meta["offset"]
+            arrays[name] = buf[start : start + count * dtype.itemsize].view(dtype)
+
+        offsets = arrays["side_offsets"]
+        data = bytes(arrays["side_data"])
+        side = [
+            data[int(offsets[i]) : int(offsets[i + 1])].decode("utf-8")
+            for i in range(len(offsets) - 1)
+        ]
+        return cls(arrays["codes"], arrays["order"], side), header
+
+
+def _aligned(n: int) -> int:
+    return (n + ALIGN - 1) // ALIGN * ALIGN
+
+
+def sidecar_path(filename: Union[str, Path]) -> Path:
+    """Return the sidecar path for an onlist file."""
+    return Path(str(filename) + SIDECAR_SUFFIX)
+
+
+def _is_fresh(header: Dict, source: os.stat_result) -> bool:
+    return (
+        header.get("source_size") == source.st_size
+        and header.get("source_mtime_ns") == source.st_mtime_ns
+    )
+
+
+def load_packed_onlist(
+    filename: Union[str, Path],
+    parse: Optional[Iterable[str]] = None,
+    write: bool = True,
+) -> PackedOnlist:
+    """Load the packed form of a local onlist, building the sidecar if needed.
+
+    Args:
+        filename: Path to the text (optionally gzipped) onlist.
+        parse: Optional iterable of the onlist entries, used instead of reading
+            ``filename`` when the sidecar is missing or stale.
+        write: Whether to write the sidecar when it is missing or stale.
+
+    Returns:
+        The packed onlist, memory-mapped when a fresh sidecar exists.
+    """
+    source = os.stat(filename)
+    sidecar = sidecar_path(filename)
+    if sidecar.exists():
+        try:
+            packed, header = PackedOnlist.open(sidecar)
+            if _is_fresh(header, source):
+                return packed
+        except (OSError, ValueError) as e:
+            logger.debug("Ignoring unreadable packed onlist %s: %s", sidecar, e)
+
+    if parse is None:
+        from seqspec.utils import iter_local_list
+
+        parse = iter_local_list(filename)
+    packed = PackedOnlist.from_sequences(list(parse))
+
+    if write:
+        try:
+            packed.write(sidecar, source)
+        except OSError as e:
+            logger.debug("Unable to write packed onlist %s: %s", sidecar, e)
+    return packed
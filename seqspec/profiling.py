@@ -0,0 +1,199 @@
+"""Profiling module for seqspec.
+
+This module provides the instrumentation behind `seqspec --profile`. A
+`Profiler` records wall time, CPU time and peak traced memory for named phases
+(e.g. parse, validate, check, format, write), plus finer timings such as the
+seconds spent in each check rule, and reports them as JSON.
+
+Code marks phases with `phase(name)` and reports timings with
+`record_timings(group, timings)`; both do nothing unless a profiler is active:
+
+    with profile() as prof:
+        spec = load_spec("spec.yaml")
+        with phase("mine"):
+            ...
+    report = prof.report()
+
+Phases nest; a phase is identified by its path (e.g. `run/parse`) and repeated
+phases are summed. Only the thread that started the profiler records phases.
+"""
+
+import cProfile
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from typing import Any, ContextManager, Dict, Iterator, List, Optional
+
+from seqspec import __version__
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+
+class Profiler:
+    """Per-phase wall time, CPU time and peak memory of one seqspec run."""
+
+    def __init__(self, memory: bool = True, cprofile: bool = False):
+        """
+        Args:
+            memory: Trace allocations to report the peak memory of each phase.
+                This slows Python code down noticeably.
+            cprofile: Also run cProfile, see `dump_pstats`.
+        """
+        self.memory = memory
+        self.phases: Dict[str, Dict[str, Any]] = {}
+        self.timings: Dict[str, Dict[str, float]] = {}
+        self.wall_seconds = 0.0
+        self.cpu_seconds = 0.0
+        self.peak_bytes: Optional[int] = None
+        # open phases as [path, peak bytes of the phase so far]
+        self._stack: List[List] = []
+        self._thread: Optional[int] = None
+        self._started_tracing = False
+        self._cprofile = cProfile.Profile() if cprofile else None
+        self._start = (0.0, 0.0)
+
+    def start(self) -> None:
+        self._thread = threading.get_ident()
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        if self.memory:
+            tracemalloc.reset_peak()
+        self._stack = [["", 0]]
+        self._start = (time.perf_counter(), time.process_time())
+        if self._cprofile:
+            self._cprofile.enable()
+
+    def stop(self) -> None:
+        if self._cprofile:
+            self._cprofile.disable()
+        self.wall_seconds = time.perf_counter() - self._start[0]
+        self.cpu_seconds = time.process_time() - self._start[1]
+        if self.memory:
+            self.peak_bytes = max(self._stack[0][1], tracemalloc.get_traced_memory()[1])
+            if self._started_tracing:
+                tracemalloc.stop()
+                self._started_tracing = False
+        self._stack = []
+        self._thread = None
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Record the wall time, CPU time and peak memory of a block."""
+        if threading.get_ident() != self._thread or not self._stack:
+            yield
+            return
+        parent = self._stack[-1]
+        path = f"{parent[0]}/{name}" if parent[0] else name
+        if self.memory:
+            # keep the parent's peak so far, then measure this phase on its own
+            parent[1] = max(parent[1], tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+        frame = [path, 0]
+        self._stack.append(frame)
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall
+            cpu = time.process_time() - cpu
+            self._stack.pop()
+            peak = None
+            if self.memory:
+                peak = max(frame[1], tracemalloc.get_traced_memory()[1])
+                # the parent's peak includes this phase's
+                parent[1] = max(parent[1], peak)
+                tracemalloc.reset_peak()
+            self.add_phase(path, wall, cpu, peak)
+
+    def add_phase(
+        self, path: str, wall: float, cpu: float, peak: Optional[int] = None
+    ) -> None:
+        """Add a measurement to a phase, e.g. one taken before profiling began."""
+        stats = self.phases.setdefault(
+            path, {"calls": 0, "wall_seconds": 0.0, "cpu_seconds": 0.0}
+        )
+        stats["calls"] += 1
+        stats["wall_seconds"] += wall
+        stats["cpu_seconds"] += cpu
+        if peak is not None:
+            stats["peak_bytes"] = max(stats.get("peak_bytes", 0), peak)
+
+    def add_timings(self, group: str, timings: Dict[str, float]) -> None:
+        """Add seconds per item (e.g. per check rule) to a group of timings."""
+        totals = self.timings.setdefault(group, {})
+        for name, seconds in timings.items():
+            totals[name] = totals.get(name, 0.0) + seconds
+
+    def report(self) -> Dict[str, Any]:
+        """Return the profile as a JSON-serializable dictionary."""
+        return {
+            "seqspec_version": __version__,
+            "wall_seconds": self.wall_seconds,
+            "cpu_seconds": self.cpu_seconds,
+            "peak_bytes": self.peak_bytes,
+            "max_rss_bytes": max_rss_bytes(),
+            "phases": self.phases,
+            "timings": self.timings,
+        }
+
+    def dump_pstats(self, path: str) -> None:
+        """Write the cProfile statistics, readable with `pstats` or snakeviz."""
+        if self._cprofile is None:
+            raise ValueError("Profiler was created without cprofile=True")
+        self._cprofile.dump_stats(path)
+
+
+_active: Optional[Profiler] = None
+
+
+@contextmanager
+def profile(memory: bool = True, cprofile: bool = False) -> Iterator[Profiler]:
+    """Profile a block; phases and timings recorded inside it are collected.
+
+    Args:
+        memory: Report peak traced memory per phase (slower)
+        cprofile: Also run cProfile, see `Profiler.dump_pstats`
+
+    Returns:
+        The active Profiler; its report is complete once the block exits.
+    """
+    global _active
+    prof, previous = Profiler(memory, cprofile), _active
+    _active = prof
+    prof.start()
+    try:
+        yield prof
+    finally:
+        prof.stop()
+        _active = previous
+
+
+def active_profiler() -> Optional[Profiler]:
+    """Return the active profiler, if any."""
+    return _active
+
+
+def phase(name: str) -> ContextManager[None]:
+    """Record a phase with the active profiler; a no-op when not profiling."""
+    return _active.phase(name) if _active else nullcontext()
+
+
+def record_timings(group: str, timings: Dict[str, float]) -> None:
+    """Add per-item seconds to the active profiler; a no-op when not profiling."""
+    if _active:
+        _active.add_timings(group, timings)
+
+
+def max_rss_bytes() -> Optional[int]:
+    """Return the peak resident set size of the process, if known."""
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return rss if sys.platform == "darwin" else rss * 1024
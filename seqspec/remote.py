@@ -0,0 +1,285 @@
+"""Remote module for seqspec.
+
+This module provides existence and metadata probes for remote (http, https, ftp)
+files, and downloads of remote onlists. Probes share a pooled session, time out, retry transient failures with
+backoff, and can run concurrently with a per-host limit so large specs do not
+hammer one server. Metadata of files that exist is kept in a persistent cache
+with a TTL (see `seqspec.cache.RemoteMetaCache`), so repeat checks of unchanged
+specs make no network calls.
+"""
+
+import gzip
+import io
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Sequence
+from urllib.parse import urlparse
+
+import requests
+from pydantic import BaseModel
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from seqspec.cache import RemoteMetaCache
+from seqspec.Region import Onlist
+from seqspec.tracing import span
+from seqspec.utils import get_remote_auth_token, yield_onlist_contents
+
+logger = logging.getLogger(__name__)
+
+# (connect, read) timeout in seconds
+TIMEOUT = (10, 30)
+RETRIES = 3
+# unreachable hosts (e.g. DNS failures) are retried once, not RETRIES times
+CONNECT_RETRIES = 1
+BACKOFF_FACTOR = 0.5
+MAX_WORKERS = 32
+MAX_PER_HOST = 8
+MAX_REDIRECTS = 5
+REDIRECT_CODES = {301, 302, 303, 307, 308}
+
+IGVF_API = "https://api.data.igvf.org"
+
+
+class RemoteMeta(BaseModel):
+    url: str
+    exists: bool
+    size: Optional[int] = None
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    fetched_at: float = 0.0
+
+
+def make_session(pool_size: int = MAX_WORKERS) -> requests.Session:
+    """Create a session with pooled connections and retries with backoff."""
+    retry = Retry(
+        total=RETRIES,
+        connect=CONNECT_RETRIES,
+        backoff_factor=BACKOFF_FACTOR,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=["HEAD", "GET"],
+        raise_on_status=False,
+        respect_retry_after_header=True,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry
+    )
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def remote_auth(uri: str):
+    """Return the credentials used for `uri`, if any."""
+    if not uri.startswith(IGVF_API):
+        return None
+    auth = get_remote_auth_token()
+    if auth is None:
+        logger.warning("IGVF_API_KEY and IGVF_SECRET_KEY not set")
+    return auth
+
+
+def cache_key(uri: str) -> str:
+    """Return the metadata cache key for `uri`.
+
+    Authenticated urls are keyed by the API key too, so metadata fetched with one
+    set of credentials is never reused for another (or for none).
+    """
+    if uri.startswith(IGVF_API):
+        auth = get_remote_auth_token()
+        return f"{auth[0] if auth else ''}@{uri}"
+    return uri
+
+
+def meta_from_response(uri: str, r) -> RemoteMeta:
+    """Build RemoteMeta for `uri` from the (final) response of a probe or download."""
+    exists = r.status_code in (200, 206)
+    size = None
+    headers = r.headers
+    if r.status_code == 206:
+        # "bytes 0-0/12345"
+        total = headers.get("Content-Range", "").rpartition("/")[2]
+        size = int(total) if total.isdigit() else None
+    elif headers.get("Content-Length", "").isdigit():
+        size = int(headers["Content-Length"])
+    return RemoteMeta(
+        url=uri,
+        exists=exists,
+        size=size if exists else None,
+        etag=headers.get("ETag") if exists else None,
+        last_modified=headers.get("Last-Modified") if exists else None,
+        fetched_at=time.time(),
+    )
+
+
+def remote_file_meta(
+    uri: str,
+    session: Optional[requests.Session] = None,
+    timeout=TIMEOUT,
+) -> RemoteMeta:
+    """Probe a remote file with a HEAD request and return its metadata.
+
+    Redirects are followed by hand. IGVF download links redirect to presigned
+    S3 urls that do not accept HEAD, so those are probed with a one-byte GET.
+    """
+    if session is None:
+        with make_session(1) as session:
+            return remote_file_meta(uri, session, timeout)
+    auth = remote_auth(uri)
+    try:
+        r = session.head(uri, auth=auth, timeout=timeout)
+        for _ in range(MAX_REDIRECTS):
+            if r.status_code not in REDIRECT_CODES:
+                break
+            location = r.headers["Location"]
+            if uri.startswith(IGVF_API):
+                r = session.get(
+                    location, headers={"Range": "bytes=0-0"}, timeout=timeout
+                )
+                break
+            r = session.head(location, timeout=timeout)
+        return meta_from_response(uri, r)
+    except (requests.RequestException, KeyError) as e:
+        logger.debug("Unable to reach %s: %s", uri, e)
+        return RemoteMeta(url=uri, exists=False, fetched_at=time.time())
+
+
+def remote_file_exists(
+    uri: str,
+    session: Optional[requests.Session] = None,
+    timeout=TIMEOUT,
+) -> bool:
+    """Check that a remote file exists. See `remote_file_meta`."""
+    return remote_file_meta(uri, session, timeout).exists
+
+
+def remote_files_meta(
+    uris: Sequence[str],
+    max_workers: int = MAX_WORKERS,
+    max_per_host: int = MAX_PER_HOST,
+    timeout=TIMEOUT,
+    cache: Optional[RemoteMetaCache] = None,
+) -> List[RemoteMeta]:
+    """Return metadata for many remote files, probing cache misses concurrently.
+
+    Args:
+        uris: Remote urls to probe. Duplicates are probed once.
+        max_workers: Maximum number of probes in flight.
+        max_per_host: Maximum number of probes in flight per host.
+        timeout: Request timeout, as accepted by requests.
+        cache: Persistent metadata cache (default: `RemoteMetaCache()`). Only
+            files that exist are cached; missing files are probed every time.
+
+    Returns:
+        RemoteMeta for each url, in the order of `uris`.
+    """
+    unique = list(dict.fromkeys(uris))
+    if not unique:
+        return []
+
+    cache = cache if cache is not None else RemoteMetaCache()
+    keys = {u: cache_key(u) for u in unique}
+    with span("remote_files_meta", **{"seqspec.remote.files": len(unique)}) as s:
+        cached = cache.get(keys.values())
+        found: Dict[str, RemoteMeta] = {
+            u: RemoteMeta(**cached[k]) for u, k in keys.items() if k in cached
+        }
+        todo = [u for u in unique if u not in found]
+        if s is not None:
+            s.set_attribute("seqspec.remote.cache_hits", len(found))
+            s.set_attribute("seqspec.remote.probes", len(todo))
+
+        if todo:
+            found.update(_probe_all(todo, max_workers, max_per_host, timeout))
+            cache.put({keys[u]: found[u].model_dump() for u in todo if found[u].exists})
+    return [found[u] for u in uris]
+
+
+def _probe_all(
+    uris: List[str], max_workers: int, max_per_host: int, timeout
+) -> Dict[str, RemoteMeta]:
+    # probe urls concurrently with a shared session and per-host limits
+    session = make_session(max_workers)
+    lock = threading.Lock()
+    host_limits: Dict[str, threading.Semaphore] = {}
+
+    def probe(uri: str) -> RemoteMeta:
+        host = urlparse(uri).netloc
+        with lock:
+            limit = host_limits.setdefault(host, threading.Semaphore(max_per_host))
+        with limit:
+            return remote_file_meta(uri, session, timeout)
+
+    try:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(uris))) as pool:
+            return dict(zip(uris, pool.map(probe, uris)))
+    finally:
+        session.close()
+
+
+def remote_files_exist(
+    uris: Sequence[str],
+    max_workers: int = MAX_WORKERS,
+    max_per_host: int = MAX_PER_HOST,
+    timeout=TIMEOUT,
+    cache: Optional[RemoteMetaCache] = None,
+) -> List[bool]:
+    """Check that many remote files exist, concurrently. See `remote_files_meta`."""
+    metas = remote_files_meta(uris, max_workers, max_per_host, timeout, cache)
+    return [m.exists for m in metas]
+
+
+def remember_remote_meta(uri: str, r, cache: Optional[RemoteMetaCache] = None):
+    """Cache the metadata of a remote file from a successful download response."""
+    meta = meta_from_response(uri, r)
+    if meta.exists:
+        cache = cache if cache is not None else RemoteMetaCache()
+        cache.put({cache_key(uri): meta.model_dump()})
+
+
+def read_remote_list(onlist: Onlist, base_path: str = "") -> List[str]:
+    """Given an onlist object read the local or remote data"""
+    filename = str(onlist.filename)
+    if onlist.url:
+        filename = str(onlist.url)
+
+    stream = None
+    try:
+        # open stream
+        auth = get_remote_auth_token()
+        with span("read_remote_list", **{"url.full": filename}) as s:
+            response = requests.get(filename, stream=True, auth=auth)
+            response.raise_for_status()
+            # the download doubles as an existence/size probe for later checks
+            remember_remote_meta(filename, response)
+            # Read into an in-memory bytes buffer to satisfy type expectations
+            content_buffer = io.BytesIO(response.content)
+            if s is not None:
+                s.set_attribute("seqspec.bytes_downloaded", len(response.content))
+
+        # do we need to decompress?
+        if filename.endswith(".gz"):
+            # Read decompressed bytes into a new BytesIO to present IO[bytes]
+            with gzip.GzipFile(fileobj=content_buffer) as gz:
+                decompressed = gz.read()
+            binary_stream = io.BytesIO(decompressed)
+        else:
+            binary_stream = content_buffer
+
+        # convert to text stream
+        stream = io.TextIOWrapper(binary_stream)
+
+        results = []
+        for i in yield_onlist_contents(stream):
+            # add the new line when writing to file
+            results.append(i)
+    finally:
+        if stream is None:
+            print("Warning: unable to open barcode file {}".format(filename))
+        else:
+            stream.close()
+
+    return results
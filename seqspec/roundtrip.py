@@ -0,0 +1,355 @@
+"""Round-trip module for seqspec.
+
+This module provides a writer that edits a spec file in place of rewriting it.
+`load_spec_roundtrip` parses the spec once, keeping the YAML node tree, which
+records the source span of every region, read, file and field. `RoundTrip.render`
+compares the spec with the one that was loaded and re-emits only the parts that
+changed:
+
+- a changed field is re-emitted as `key: value` over the lines of the old one,
+  or appended to its mapping if the file did not have it;
+- a list keeps its unchanged leading and trailing items verbatim, and the
+  items in between are edited one by one if the list kept its length, or
+  re-emitted together otherwise (inserts, deletions).
+
+Everything else, including comments, quoting, key order, tags and omitted
+defaults, is copied from the source, so the time spent and the diff produced
+scale with the edit rather than with the spec. Documents that cannot be
+spliced safely (flow-style collections around an edit) fall back to
+re-emitting the enclosing node, and ultimately the whole spec; documents with
+anchors and aliases are re-emitted whole, with repeated regions and onlists
+shared again (see `seqspec.fragments`).
+"""
+
+import gzip
+import re
+import sys
+from pathlib import Path
+from typing import Any, List, Optional, Tuple, Union
+
+import yaml
+
+from seqspec.Assay import Assay
+from seqspec.fragments import shared_dump
+from seqspec.profiling import phase
+from seqspec.serialize import atomic_open, dump_json, dump_yaml, spec_format
+from seqspec.tracing import set_spec_attributes, span
+from seqspec.utils import (
+    load_spec,
+    load_spec_from_dict,
+    read_spec_bytes,
+    write_pydantic_to_file_or_stdout,
+)
+
+try:
+    from yaml import CSafeLoader as Loader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as Loader
+
+YAML_TAG_PREFIX = "tag:yaml.org,2002:"
+# what may precede a spliced node on its first line: indentation and the
+# indicators of the block sequences it starts
+_LINE_PREFIX = re.compile(r"[ ]*(?:-[ ]+)*")
+_LINE_REST = re.compile(r"[ \t]*(?:#[^\n]*)?\n?")
+
+
+class _Unspliceable(Exception):
+    pass
+
+
+class RoundTrip:
+    """Source text of a loaded spec and its YAML node tree."""
+
+    def __init__(
+        self,
+        text: str,
+        root: Optional[yaml.Node],
+        dump: dict,
+        fmt: str = "yaml",
+        anchors: bool = False,
+    ):
+        """
+        Args:
+            text: The spec source.
+            root: Its composed node tree, or None if it cannot be spliced.
+            dump: `model_dump()` of the spec loaded from `text`.
+            fmt: Format of the source, "yaml" or "json".
+            anchors: Whether the source uses anchors and aliases; if so, the
+                spec is re-emitted whole with repeats shared, see
+                `seqspec.fragments`.
+        """
+        self.text = text
+        self.root = root
+        self.dump = dump
+        self.fmt = fmt
+        self.anchors = anchors
+
+    def render(self, spec: Assay) -> str:
+        """Return the YAML of `spec`, reusing the source for unchanged parts.
+
+        JSON specs are returned unchanged or re-emitted whole.
+        """
+        new = spec.model_dump()
+        if new == self.dump:
+            return self.text
+        if self.fmt == "json":
+            return dump_json(spec)
+        if self.anchors:
+            return dump_yaml(shared_dump(spec))
+        edits: List[Tuple[int, int, str]] = []
+        try:
+            if self.root is None or not _splice(
+                self.text, self.root, self.dump, new, edits
+            ):
+                raise _Unspliceable()
+        except _Unspliceable:
+            return dump_yaml(new)
+
+        parts = []
+        pos = 0
+        for start, end, replacement in sorted(edits, key=lambda e: e[0]):
+            parts.append(self.text[pos:start])
+            parts.append(replacement)
+            pos = end
+        parts.append(self.text[pos:])
+        return "".join(parts)
+
+    def write(self, spec: Assay, path: Union[str, Path, None]) -> None:
+        """Write `spec` to `path` atomically, or to stdout if `path` is None.
+
+        See `render`. If `path` is in the other format (see `spec_format`),
+        the spec is converted.
+        """
+        if path is not None and spec_format(path) != self.fmt:
+            write_pydantic_to_file_or_stdout(spec, path)
+            return
+        text = self.render(spec)
+        if path is None:
+            sys.stdout.write(text)
+            return
+        with atomic_open(path) as f:
+            f.write(text)
+
+
+def load_spec_roundtrip(
+    spec_fn: Union[str, Path], strict=True
+) -> Tuple[Assay, RoundTrip]:
+    """Load a spec like `load_spec`, keeping what is needed to rewrite it.
+
+    Args:
+        spec_fn: Path to a YAML or JSON spec, optionally gzipped.
+        strict: See `load_spec`.
+
+    Returns:
+        The spec and its `RoundTrip`.
+    """
+    if spec_format(spec_fn) == "json":
+        spec = load_spec(spec_fn, strict)
+        text = read_spec_bytes(spec_fn).decode()
+        return spec, RoundTrip(text, None, spec.model_dump(), "json")
+
+    with span("load_spec") as s:
+        with open(spec_fn, "rb") as f:
+            gzipped = f.read(2) == b"\x1f\x8b"
+        with phase("parse"):
+            opener = gzip.open if gzipped else open
+            with opener(spec_fn, "rt") as f:
+                text = f.read()
+            root, data, aliased = _compose(text)
+        spec = load_spec_from_dict(data, spec_fn, strict)
+        set_spec_attributes(s, spec, spec_fn)
+    if aliased:
+        return spec, RoundTrip(text, None, spec.model_dump(), anchors=True)
+    return spec, RoundTrip(text, root, spec.model_dump())
+
+
+def _compose(text: str) -> Tuple[Optional[yaml.Node], Any, bool]:
+    # compose the node tree, then construct the data from it with the seqspec
+    # tags (!Region, ...) dropped, as `strip_yaml_tags` does
+    loader = Loader(text)
+    try:
+        root = loader.get_single_node()
+        if root is None:
+            return None, None, False
+        seen = set()
+        shared = False
+        todo = [root]
+        while todo:
+            node = todo.pop()
+            if id(node) in seen:
+                shared = True  # an alias
+                continue
+            seen.add(id(node))
+            if not node.tag.startswith(YAML_TAG_PREFIX):
+                if isinstance(node, yaml.MappingNode):
+                    node.tag = YAML_TAG_PREFIX + "map"
+                elif isinstance(node, yaml.SequenceNode):
+                    node.tag = YAML_TAG_PREFIX + "seq"
+                else:
+                    node.tag = loader.resolve(
+                        yaml.ScalarNode, node.value, (True, False)
+                    )
+            if isinstance(node, yaml.MappingNode):
+                for key, value in node.value:
+                    todo.append(key)
+                    todo.append(value)
+            elif isinstance(node, yaml.SequenceNode):
+                todo.extend(node.value)
+        data = loader.construct_document(root)
+    finally:
+        loader.dispose()
+    return root, data, shared
+
+
+def _splice(
+    text: str, node: yaml.Node, old: Any, new: Any, edits: List[Tuple[int, int, str]]
+) -> bool:
+    # add the edits turning the source of `node` (which loads as `old`) into
+    # `new`; False if the node has to be re-emitted as a whole
+    if old == new:
+        return True
+    if (
+        _is_block(node, yaml.MappingNode)
+        and isinstance(old, dict)
+        and isinstance(new, dict)
+    ):
+        return _splice_mapping(text, node, old, new, edits)
+    if (
+        _is_block(node, yaml.SequenceNode)
+        and isinstance(old, list)
+        and isinstance(new, list)
+    ):
+        return _splice_sequence(text, node, old, new, edits)
+    return False
+
+
+def _splice_mapping(text, node, old, new, edits) -> bool:
+    if old.keys() != new.keys():
+        return False
+    entries = {
+        key.value: (key, value)
+        for key, value in node.value
+        if isinstance(key, yaml.ScalarNode)
+    }
+    # fields the source omitted, e.g. defaults, are appended to the mapping
+    # after the edits within it
+    missing = {}
+    for k, value in new.items():
+        if old[k] == value:
+            continue
+        if k not in entries:
+            missing[k] = value
+            continue
+        key_node, value_node = entries[k]
+        if not _splice(text, value_node, old[k], value, edits):
+            start = key_node.start_mark.index
+            end = _end(text, value_node)
+            edits.append((*_lines(text, start, end), _emit(text, start, {k: value})))
+    if missing:
+        first = node.value[0][0].start_mark.index
+        column = first - _line_start(text, first)
+        end = _line_end(text, _end(text, node))
+        edits.append((end, end, _indent(dump_yaml(missing), column, column)))
+    return True
+
+
+def _splice_sequence(text, node, old, new, edits) -> bool:
+    items = node.value
+    if len(items) != len(old) or not new:
+        return False
+    n = min(len(old), len(new))
+    head = 0
+    while head < n and old[head] == new[head]:
+        head += 1
+    tail = 0
+    while tail < n - head and old[-1 - tail] == new[-1 - tail]:
+        tail += 1
+    old_mid = items[head : len(items) - tail]
+    new_mid = new[head : len(new) - tail]
+
+    if len(old_mid) == len(new_mid):
+        for item, o, v in zip(old_mid, old[head : len(old) - tail], new_mid):
+            if not _splice(text, item, o, v, edits):
+                start = _dash(text, item)
+                edits.append(
+                    (*_lines(text, start, _end(text, item)), _emit(text, start, [v]))
+                )
+        return True
+
+    if old_mid:
+        start = _dash(text, old_mid[0])
+        # items removed with nothing in their place leave no lines behind
+        replacement = _emit(text, start, new_mid) if new_mid else ""
+        edits.append((*_lines(text, start, _end(text, old_mid[-1])), replacement))
+    else:
+        # pure insertion, next to an unchanged item
+        if head:
+            neighbour = _dash(text, items[head - 1])
+            at = _line_end(text, _end(text, items[head - 1]))
+        else:
+            neighbour = _dash(text, items[0])
+            at = _line_start(text, neighbour)
+        column = neighbour - _line_start(text, neighbour)
+        edits.append((at, at, _indent(dump_yaml(new_mid), column, column)))
+    return True
+
+
+def _is_block(node: yaml.Node, kind) -> bool:
+    return isinstance(node, kind) and not node.flow_style and bool(node.value)
+
+
+def _end(text: str, node: yaml.Node) -> int:
+    # end of the last character of a node; the end marks of block collections
+    # point at the next token, past any comments, so use their last descendant
+    while _is_block(node, yaml.MappingNode) or _is_block(node, yaml.SequenceNode):
+        node = (
+            node.value[-1][1] if isinstance(node, yaml.MappingNode) else node.value[-1]
+        )
+    return node.end_mark.index
+
+
+def _dash(text: str, item: yaml.Node) -> int:
+    # position of the `-` indicator of a block sequence item
+    i = item.start_mark.index - 1
+    while i >= 0 and text[i] == " ":
+        i -= 1
+    if i < 0 or text[i] != "-":
+        raise _Unspliceable()
+    return i
+
+
+def _line_start(text: str, index: int) -> int:
+    return text.rfind("\n", 0, index) + 1
+
+
+def _line_end(text: str, index: int) -> int:
+    # past the newline ending the line of `index`, which must only be followed
+    # by a comment; block scalars already end past their newline
+    if index > 0 and text[index - 1] == "\n":
+        return index
+    match = _LINE_REST.match(text, index)
+    if match is None or (match.end() < len(text) and text[match.end() - 1] != "\n"):
+        raise _Unspliceable()
+    return match.end()
+
+
+def _lines(text: str, start: int, end: int) -> Tuple[int, int]:
+    # the whole lines spanning [start, end)
+    line_start = _line_start(text, start)
+    if not _LINE_PREFIX.fullmatch(text, line_start, start):
+        raise _Unspliceable()
+    return line_start, _line_end(text, end)
+
+
+def _emit(text: str, start: int, data: Any) -> str:
+    # YAML of `data` to replace the lines from the one holding `start`, laid
+    # out at the column of `start`
+    line_start = _line_start(text, start)
+    return _indent(dump_yaml(data), start - line_start, 0, text[line_start:start])
+
+
+def _indent(block: str, column: int, first: int, prefix: str = "") -> str:
+    lines = block.splitlines(keepends=True)
+    pad = " " * column
+    head = prefix + " " * first + lines[0]
+    return head + "".join(pad + line if line.strip() else line for line in lines[1:])
@@ -0,0 +1,267 @@
+"""Schema validator module for seqspec.
+
+This module provides the seqspec JSON schema and its validator, both built once
+per process. Besides the generic jsonschema Draft4Validator, the schema is
+compiled into a specialized validity predicate: nested closures that check each
+keyword directly, with $refs resolved at compile time. Valid specs (the common
+case) are accepted by the predicate alone; only invalid specs pay for a
+jsonschema pass, which produces the error messages.
+"""
+
+import json
+import numbers
+import re
+from functools import lru_cache
+from os import path
+from typing import Any, Callable, Dict, Iterator, List
+
+from jsonschema import Draft4Validator
+from jsonschema.exceptions import ValidationError
+
+SCHEMA_FN = path.join(path.dirname(__file__), "schema/seqspec.schema.json")
+
+Predicate = Callable[[Any], bool]
+
+# keywords that Draft4Validator does not act on
+_IGNORED = {
+    "$schema",
+    "$id",
+    "$defs",
+    "id",
+    "definitions",
+    "title",
+    "description",
+    "default",
+    "examples",
+    "const",
+    "if",
+    "then",
+    "else",
+    "exclusiveMinimum",
+    "exclusiveMaximum",
+}
+
+
+class UnsupportedSchema(Exception):
+    """Raised when a schema uses a keyword the compiler does not handle."""
+
+
+@lru_cache(maxsize=None)
+def load_schema() -> Dict:
+    """Return the seqspec JSON schema. Do not modify the returned dict."""
+    with open(SCHEMA_FN, "r") as stream:
+        return json.load(stream)
+
+
+@lru_cache(maxsize=None)
+def schema_validator() -> Draft4Validator:
+    """Return the Draft4Validator for the seqspec schema."""
+    return Draft4Validator(load_schema())
+
+
+@lru_cache(maxsize=None)
+def schema_predicate() -> Predicate:
+    """Return the compiled validity predicate for the seqspec schema."""
+    try:
+        return compile_schema(load_schema())
+    except UnsupportedSchema:
+        return schema_validator().is_valid
+
+
+def schema_errors(instance: Any) -> Iterator[ValidationError]:
+    """Yield the schema errors of a spec dict, in Draft4Validator order.
+
+    Args:
+        instance: A spec as plain data, e.g. the dict parsed from the yaml file.
+    """
+    if schema_predicate()(instance):
+        return iter(())
+    return schema_validator().iter_errors(instance)
+
+
+def compile_schema(schema: Dict) -> Predicate:
+    """Compile a Draft 4 schema into a predicate that agrees with `is_valid`.
+
+    Only local `#/...` references are supported.
+
+    Raises:
+        UnsupportedSchema: If the schema uses a keyword that is not compiled.
+    """
+    compiled: Dict[str, Predicate] = {}
+
+    def resolve(ref: str) -> Predicate:
+        if not ref.startswith("#"):
+            raise UnsupportedSchema(f"$ref {ref}")
+        if ref not in compiled:
+            # the target may refer back to itself; bind lazily
+            slot: List[Predicate] = []
+            compiled[ref] = lambda x: slot[0](x)
+            target = schema
+            for part in ref[1:].split("/")[1:]:
+                part = part.replace("~1", "/").replace("~0", "~")
+                target = target[int(part)] if isinstance(target, list) else target[part]
+            slot.append(build(target))
+        return compiled[ref]
+
+    def build(s: Dict) -> Predicate:
+        if not isinstance(s, dict):
+            raise UnsupportedSchema(f"schema {s!r}")
+        if "$ref" in s:
+            # Draft 4 ignores the siblings of $ref
+            return resolve(s["$ref"])
+        checks = []
+        for key, value in s.items():
+            if key in _IGNORED:
+                continue
+            if key not in _KEYWORDS:
+                raise UnsupportedSchema(key)
+            checks.append(_KEYWORDS[key](value, s, build))
+        if not checks:
+            return lambda x: True
+        if len(checks) == 1:
+            return checks[0]
+        return lambda x: all(check(x) for check in checks)
+
+    return build(schema)
+
+
+def _is_number(x) -> bool:
+    return isinstance(x, numbers.Number) and not isinstance(x, bool)
+
+
+_TYPES = {
+    "array": lambda x: isinstance(x, list),
+    "boolean": lambda x: isinstance(x, bool),
+    "integer": lambda x: isinstance(x, int) and not isinstance(x, bool),
+    "null": lambda x: x is None,
+    "number": _is_number,
+    "object": lambda x: isinstance(x, dict),
+    "string": lambda x: isinstance(x, str),
+}
+
+
+def _type(value, s, build):
+    types = [value] if isinstance(value, str) else list(value)
+    if any(t not in _TYPES for t in types):
+        raise UnsupportedSchema(f"type {value}")
+    if len(types) == 1:
+        return _TYPES[types[0]]
+    checks = [_TYPES[t] for t in types]
+    return lambda x: any(check(x) for check in checks)
+
+
+def _enum(value, s, build):
+    if not all(isinstance(v, str) for v in value):
+        raise UnsupportedSchema("non-string enum")
+    allowed = frozenset(value)
+    return lambda x: isinstance(x, str) and x in allowed
+
+
+def _pattern(value, s, build):
+    regex = re.compile(value)
+    return lambda x: not isinstance(x, str) or regex.search(x) is not None
+
+
+def _min_length(value, s, build):
+    return lambda x: not isinstance(x, str) or len(x) >= value
+
+
+def _max_length(value, s, build):
+    return lambda x: not isinstance(x, str) or len(x) <= value
+
+
+def _minimum(value, s, build):
+    if s.get("exclusiveMinimum", False):
+        return lambda x: not _is_number(x) or x > value
+    return lambda x: not _is_number(x) or x >= value
+
+
+def _maximum(value, s, build):
+    if s.get("exclusiveMaximum", False):
+        return lambda x: not _is_number(x) or x < value
+    return lambda x: not _is_number(x) or x <= value
+
+
+def _min_items(value, s, build):
+    return lambda x: not isinstance(x, list) or len(x) >= value
+
+
+def _max_items(value, s, build):
+    return lambda x: not isinstance(x, list) or len(x) <= value
+
+
+def _required(value, s, build):
+    return lambda x: not isinstance(x, dict) or all(k in x for k in value)
+
+
+def _properties(value, s, build):
+    props = [(k, build(v)) for k, v in value.items()]
+    return lambda x: (
+        not isinstance(x, dict) or all(check(x[k]) for k, check in props if k in x)
+    )
+
+
+def _additional_properties(value, s, build):
+    known = frozenset(s.get("properties", {}))
+    patterns = "|".join(s.get("patternProperties", {}))
+    if patterns:
+        raise UnsupportedSchema("patternProperties")
+    if value is False:
+        return lambda x: not isinstance(x, dict) or known.issuperset(x)
+    if value is True:
+        return lambda x: True
+    check = build(value)
+    return lambda x: (
+        not isinstance(x, dict) or all(check(v) for k, v in x.items() if k not in known)
+    )
+
+
+def _items(value, s, build):
+    if isinstance(value, dict):
+        check = build(value)
+        return lambda x: not isinstance(x, list) or all(check(i) for i in x)
+    checks = [build(v) for v in value]
+    return lambda x: (
+        not isinstance(x, list) or all(check(i) for check, i in zip(checks, x))
+    )
+
+
+def _any_of(value, s, build):
+    checks = [build(v) for v in value]
+    return lambda x: any(check(x) for check in checks)
+
+
+def _all_of(value, s, build):
+    checks = [build(v) for v in value]
+    return lambda x: all(check(x) for check in checks)
+
+
+def _one_of(value, s, build):
+    checks = [build(v) for v in value]
+    return lambda x: sum(1 for check in checks if check(x)) == 1
+
+
+def _not(value, s, build):
+    check = build(value)
+    return lambda x: not check(x)
+
+
+_KEYWORDS = {
+    "type": _type,
+    "enum": _enum,
+    "pattern": _pattern,
+    "minLength": _min_length,
+    "maxLength": _max_length,
+    "minimum": _minimum,
+    "maximum": _maximum,
+    "minItems": _min_items,
+    "maxItems": _max_items,
+    "required": _required,
+    "properties": _properties,
+    "additionalProperties": _additional_properties,
+    "items": _items,
+    "anyOf": _any_of,
+    "allOf": _all_of,
+    "oneOf": _one_of,
+    "not": _not,
+}
@@ -0,0 +1,272 @@
+"""Batch module for seqspec CLI.
+
+This module provides functionality to run many subcommands against one spec in
+one process. The spec is parsed once and shared by the subcommands through a
+`SeqSpecSession`, so e.g. several `index` formats, `file` lists and `onlist`
+lookups of one sample do not each pay for loading the spec.
+"""
+
+import json
+import os
+import shlex
+import sys
+import threading
+from argparse import ArgumentParser, Namespace, RawTextHelpFormatter
+from concurrent.futures import ThreadPoolExecutor
+from io import StringIO
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from seqspec.profiling import phase
+from seqspec.session import shared_session
+from seqspec.tracing import span
+
+# subcommands that only read the spec and write their own outputs, so that
+# consecutive ones can run concurrently; the others run one at a time, in order
+CONCURRENT_COMMANDS = {"file", "find", "index", "info", "methods", "onlist", "version"}
+
+
+def setup_batch_args(parser) -> ArgumentParser:
+    """Create and configure the batch command subparser."""
+    subparser = parser.add_parser(
+        "batch",
+        description="""
+Run many subcommands against one spec, parsed once.
+
+COMMANDS lists one subcommand per line without the spec, which is appended to
+each. Blank lines and lines starting with # are ignored. With COMMANDS `-` (the
+default) the commands are read from stdin, either as lines or as a JSON list of
+argument lists or strings. Output of commands without -o is printed in order.
+
+Examples:
+seqspec batch spec.yaml commands.txt                # Run the commands in commands.txt
+seqspec batch -j 4 spec.yaml commands.txt           # Run up to 4 read-only commands at once
+echo '[["index", "-m", "rna", "-t", "kb"], ["file", "-m", "rna"]]' | seqspec batch spec.yaml
+
+commands.txt:
+index -m rna -t kb -o kb.txt
+index -m rna -t starsolo -o starsolo.txt
+file -m rna -f paired -k url
+---
+""",
+        help="Run many subcommands against one spec",
+        formatter_class=RawTextHelpFormatter,
+    )
+    subparser.add_argument("yaml", help="Sequencing specification yaml file", type=Path)
+    subparser.add_argument(
+        "commands",
+        metavar="COMMANDS",
+        help="File listing the subcommands to run (default: stdin)",
+        nargs="?",
+        default="-",
+    )
+    subparser.add_argument(
+        "-j",
+        "--jobs",
+        metavar="N",
+        help="Number of read-only commands run concurrently (default: CPU count, at most 8)",
+        type=int,
+        default=None,
+    )
+    return subparser
+
+
+def validate_batch_args(parser: ArgumentParser, args: Namespace) -> None:
+    """Validate the batch command arguments."""
+    if not Path(args.yaml).exists():
+        parser.error(f"Input file does not exist: {args.yaml}")
+    if args.commands != "-" and not Path(args.commands).is_file():
+        parser.error(f"Commands file does not exist: {args.commands}")
+    if args.jobs is not None and args.jobs < 1:
+        parser.error(f"--jobs must be at least 1: {args.jobs}")
+
+
+def run_batch(parser: ArgumentParser, args: Namespace) -> None:
+    """Run the batch command."""
+    validate_batch_args(parser, args)
+
+    if args.commands == "-":
+        text = sys.stdin.read()
+    else:
+        text = Path(args.commands).read_text()
+    commands = parse_commands(text)
+    jobs = args.jobs or min(8, os.cpu_count() or 1)
+
+    failed = 0
+    for argv, output, error in seqspec_batch(args.yaml, commands, jobs):
+        if output:
+            sys.stdout.write(output)
+        if error is not None:
+            failed += 1
+            print(f"Error in `{shlex.join(argv)}`: {error}", file=sys.stderr)
+    sys.stdout.flush()
+    if failed:
+        print(f"{failed} of {len(commands)} commands failed", file=sys.stderr)
+        sys.exit(1)
+
+
+def parse_commands(text: str) -> List[List[str]]:
+    """Parse subcommands from lines or a JSON list.
+
+    Args:
+        text: One command per line (blank lines and `#` comments ignored), or a
+            JSON list whose items are argument lists or command strings. A
+            leading `seqspec` is dropped.
+
+    Returns:
+        Argument list of every command, without the spec
+    """
+    stripped = text.strip()
+    if stripped.startswith("["):
+        items = json.loads(stripped)
+        commands = [shlex.split(c) if isinstance(c, str) else list(c) for c in items]
+    else:
+        commands = [
+            shlex.split(line)
+            for line in stripped.splitlines()
+            if line.strip() and not line.lstrip().startswith("#")
+        ]
+    for argv in commands:
+        if argv and argv[0] == "seqspec":
+            del argv[0]
+        if not argv or not all(isinstance(a, str) for a in argv):
+            raise ValueError(f"Invalid command: {argv}")
+    return commands
+
+
+def seqspec_batch(
+    spec_fn: Path, commands: List[List[str]], jobs: int = 1
+) -> List[Tuple[List[str], str, Optional[str]]]:
+    """Core functionality to run subcommands against one loaded spec.
+
+    Consecutive read-only commands (see `CONCURRENT_COMMANDS`) run in a thread
+    pool; any other command runs alone, after the ones before it. If such a
+    command rewrites the spec file, the spec is reloaded for the ones after it.
+
+    Args:
+        spec_fn: Path to the spec, appended to every command
+        commands: Argument list of every command, e.g. `["index", "-m", "rna"]`
+        jobs: Maximum number of commands run at once
+
+    Returns:
+        (argv, stdout, error) of every command, in order; error is None if the
+        command succeeded
+    """
+    parsed = [_parse_command(argv, spec_fn) for argv in commands]
+    results: List[Tuple[List[str], str, Optional[str]]] = []
+    stdout = _ThreadStdout(sys.stdout)
+
+    def run(i: int) -> Tuple[List[str], str, Optional[str]]:
+        return _run_command(commands[i], *parsed[i], stdout)
+
+    attributes = {"seqspec.batch.commands": len(commands)}
+    sys.stdout = stdout
+    try:
+        with span("seqspec_batch", **attributes), shared_session(spec_fn) as session:
+            version = _spec_version(spec_fn)
+            for wave in _waves(commands):
+                if len(wave) > 1 and jobs > 1:
+                    with (
+                        phase("concurrent"),
+                        ThreadPoolExecutor(max_workers=min(jobs, len(wave))) as pool,
+                    ):
+                        results.extend(pool.map(run, wave))
+                else:
+                    with phase(commands[wave[0]][0]):
+                        results.extend(map(run, wave))
+
+                if _spec_version(spec_fn) != version:
+                    session.reload()
+                    version = _spec_version(spec_fn)
+    finally:
+        sys.stdout = stdout.stream
+    return results
+
+
+def _waves(commands: List[List[str]]) -> List[List[int]]:
+    # indices of consecutive read-only commands, or of one other command
+    waves: List[List[int]] = []
+    for i, argv in enumerate(commands):
+        concurrent = argv[0] in CONCURRENT_COMMANDS
+        if concurrent and waves and commands[waves[-1][0]][0] in CONCURRENT_COMMANDS:
+            waves[-1].append(i)
+        else:
+            waves.append([i])
+    return waves
+
+
+def _parse_command(
+    argv: List[str], spec_fn: Path
+) -> Tuple[Optional[ArgumentParser], Optional[Namespace], Optional[str]]:
+    # (parser, args, error) of a command, parsed with the spec appended
+    from seqspec.main import COMMANDS, setup_parser
+
+    command = argv[0]
+    if command not in COMMANDS or command == "batch":
+        return None, None, f"Unknown command: {command}"
+    parser, _ = setup_parser(command)
+    try:
+        return parser, parser.parse_args([*argv, str(spec_fn)]), None
+    except SystemExit as e:
+        return None, None, f"invalid arguments (exit status {e.code})"
+
+
+def _run_command(
+    argv: List[str],
+    parser: Optional[ArgumentParser],
+    args: Optional[Namespace],
+    error: Optional[str],
+    stdout: "_ThreadStdout",
+) -> Tuple[List[str], str, Optional[str]]:
+    from seqspec.main import load_command
+
+    if error is not None:
+        return argv, "", error
+    command = argv[0]
+    buffer = StringIO()
+    stdout.capture(buffer)
+    try:
+        run = getattr(load_command(command), f"run_{command}")
+        with span(f"seqspec {command}"):
+            run(parser, args)
+    except SystemExit as e:
+        # e.g. argument validation errors
+        if e.code not in (None, 0):
+            error = f"exited with status {e.code}"
+    except Exception as e:
+        error = str(e)
+    finally:
+        stdout.capture(None)
+    return argv, buffer.getvalue(), error
+
+
+def _spec_version(spec_fn: Path) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(spec_fn)
+    except OSError:
+        return None
+    return (st.st_size, st.st_mtime_ns)
+
+
+class _ThreadStdout:
+    """Stand-in for sys.stdout that sends each thread's output to its own buffer."""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self._local = threading.local()
+
+    def capture(self, buffer: Optional[StringIO]) -> None:
+        self._local.buffer = buffer
+
+    def _target(self):
+        buffer = getattr(self._local, "buffer", None)
+        return self.stream if buffer is None else buffer
+
+    def write(self, s: str) -> int:
+        return self._target().write(s)
+
+    def flush(self) -> None:
+        self._target().flush()
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
@@ -17,11 +17,8 @@ from opentelemetry.sdk.trace.export import (
 )
 
 from seqspec.Assay import Assay
-from seqspec.utils import (
-    JsonlSpanExporter,
-    SummarySpanExporter,
-    write_pydantic_to_file_or_stdout,
-)
+from seqspec.span_exporters import JsonlSpanExporter, SummarySpanExporter
+from seqspec.utils import write_pydantic_to_file_or_stdout
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
@@ -147,6 +144,7 @@ async def seqspec_build_async(
         seqspec_modify_read,
         seqspec_modify_region,
     )
+    from seqspec.spec_patch import apply_patch
 
     seqspec_check = function_tool(seqspec_check, strict_mode=False)
     seqspec_insert_reads = function_tool(seqspec_insert_reads, strict_mode=False)
@@ -155,6 +153,7 @@ async def seqspec_build_async(
     seqspec_modify_region = function_tool(seqspec_modify_region, strict_mode=False)
     seqspec_modify_read = function_tool(seqspec_modify_read, strict_mode=False)
     seqspec_format = function_tool(seqspec_format, strict_mode=False)
+    apply_patch = function_tool(apply_patch, strict_mode=False)
 
     AGENT_INSTRUCTIONS = """
 Use the given tools to build a correct and complete seqspec file.
@@ -164,6 +163,7 @@ Add the sequencing library structure with seqspec_insert_region.
 After, add the sequencing reads with seqspec_insert_read.
 Check the file with seqspec_check.
 Modify attributes of any elements with seqspec_modify if necessary.
+To make several inserts or modifications at once, use apply_patch.
 At the very end, run seqspec_format then return the final spec.
 """
 
@@ -192,6 +192,7 @@ spec
             seqspec_insert_regions,
             seqspec_modify_read,
             seqspec_modify_region,
+            apply_patch,
             seqspec_format,
         ],
         output_type=Assay,
@@ -3,16 +3,28 @@
 This module provides functionality to validate seqspec files against the specification schema.
 """
 
+import json
+import os
+import sys
+import time
 from argparse import ArgumentParser, Namespace, RawTextHelpFormatter
-from os import path
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, List, Optional
-
-import yaml
-from jsonschema import Draft4Validator
+from typing import Dict, Iterator, List, Optional, Tuple
 
 from seqspec.Assay import Assay
-from seqspec.utils import file_exists, load_spec
+from seqspec.cache import stat_key
+from seqspec.check_cache import SUFFIX as CHECK_CACHE_SUFFIX
+from seqspec.check_cache import CheckCache
+from seqspec.check_engine import RULES, CheckRule, register_rule, run_rules
+from seqspec.checksum import md5sums
+from seqspec.onlist_stats import OnlistStats, onlist_stats
+from seqspec.profiling import active_profiler, phase, record_timings
+from seqspec.remote import remote_files_exist
+from seqspec.schema_validator import schema_errors
+from seqspec.spec_hash import digest as content_digest
+from seqspec.tracing import set_spec_attributes, span
+from seqspec.utils import iter_local_list, load_spec_dict, load_spec_from_dict
 
 
 def setup_check_args(parser):
@@ -24,6 +36,11 @@ Validate seqspec file against the specification schema.
 
 Examples:
 seqspec check spec.yaml
+seqspec check --md5 spec.yaml          # Also verify md5sums of read files and onlists
+seqspec check --strict spec.yaml       # Also flag onlist entries one substitution apart
+seqspec check --incremental spec.yaml  # Reuse results for unchanged parts of the spec
+seqspec check -j 8 specs/ other.yaml   # Check many specs in parallel, JSON Lines report
+seqspec check --manifest specs.txt     # Check the specs listed in a file, one per line
 ---
 """,
         help="Validate seqspec file against specification",
@@ -47,15 +64,64 @@ seqspec check spec.yaml
         choices=["igvf", "igvf_onlist_skip"],
     )
 
-    subparser.add_argument("yaml", help="Sequencing specification yaml file", type=Path)
+    subparser.add_argument(
+        "--md5",
+        help="Verify md5sums of read files and onlists",
+        action="store_true",
+        default=False,
+    )
+
+    subparser.add_argument(
+        "--strict",
+        help="Also flag local onlists with distinct entries one substitution apart",
+        action="store_true",
+        default=False,
+    )
+
+    subparser.add_argument(
+        "--incremental",
+        help=f"Reuse results of the previous check for unchanged parts of the spec (cached in <yaml>{CHECK_CACHE_SUFFIX})",
+        action="store_true",
+        default=False,
+    )
+
+    subparser.add_argument(
+        "--manifest",
+        metavar="FILE",
+        help="File listing spec paths to check, one per line (relative to the file)",
+        type=Path,
+        default=None,
+    )
+    subparser.add_argument(
+        "-j",
+        "--jobs",
+        metavar="N",
+        help="Number of worker processes when checking several specs (default: CPU count)",
+        type=int,
+        default=None,
+    )
+
+    subparser.add_argument(
+        "yaml",
+        help="Sequencing specification yaml file(s) or directories of them",
+        type=Path,
+        nargs="*",
+    )
 
     return subparser
 
 
 def validate_check_args(parser: ArgumentParser, args: Namespace) -> None:
     """Validate the check command arguments."""
-    if not Path(args.yaml).exists():
-        parser.error(f"Input file does not exist: {args.yaml}")
+    if not args.yaml and not args.manifest:
+        parser.error("No spec given: pass yaml files, directories or --manifest")
+    for p in args.yaml:
+        if not Path(p).exists():
+            parser.error(f"Input file does not exist: {p}")
+    if args.manifest and not Path(args.manifest).is_file():
+        parser.error(f"Manifest does not exist: {args.manifest}")
+    if args.jobs is not None and args.jobs < 1:
+        parser.error(f"--jobs must be at least 1: {args.jobs}")
 
     if args.output and Path(args.output).exists() and not Path(args.output).is_file():
         parser.error(f"Output path exists but is not a file: {args.output}")
@@ -65,40 +131,217 @@ def format_error(errobj, idx=0):
     return f"[error {idx}] {errobj['error_message']}"
 
 
-def seqspec_check(spec: Assay, filter_type: Optional[str] = None) -> List[Dict]:
+def seqspec_check(
+    spec: Assay,
+    filter_type: Optional[str] = None,
+    md5: bool = False,
+    raw: Optional[Dict] = None,
+    cache: Optional[CheckCache] = None,
+    timings: Optional[Dict[str, float]] = None,
+    strict: bool = False,
+) -> List[Dict]:
     """Core functionality to check a seqspec and return filtered errors.
 
     Args:
         spec: The Assay object to check
         filter_type: Optional filter type to apply to errors (e.g. "igvf", "igvf_onlist_skip")
+        md5: Whether to verify md5sums of read files and onlists
+        raw: The parsed spec file `spec` was loaded from (see `load_spec_dict`).
+            If given, it is validated against the schema instead of `spec.to_dict()`.
+        cache: Results of a previous check to reuse for unchanged parts of the
+            spec; updated in place (call `cache.save()` to persist it)
+        timings: If given, filled with the seconds spent in each rule
+        strict: Whether to also run the strict rules, e.g. that onlists have
+            no entries one substitution apart
 
     Returns:
         List of error dictionaries
     """
-    errors = check(spec)
-
-    if filter_type:
-        errors = filter_errors(errors, filter_type)
+    with span("seqspec_check", **{"seqspec.check.md5": md5}) as s:
+        errors = check(spec, md5, raw, cache, timings, strict)
+
+        if filter_type:
+            errors = filter_errors(errors, filter_type)
+        if s is not None:
+            s.set_attribute("seqspec.check.errors", len(errors))
+            if cache is not None:
+                s.set_attribute("seqspec.check.cache_hits", cache.hits)
+                s.set_attribute("seqspec.check.cache_misses", cache.misses)
     return errors
 
 
+def load_check_spec(spec_fn) -> Tuple[Assay, Dict]:
+    """Load a spec to check, leniently, with the parsed file it came from."""
+    with span("load_spec") as s:
+        raw = load_spec_dict(spec_fn)
+        spec = load_spec_from_dict(raw, spec_fn, strict=False)
+        set_spec_attributes(s, spec, spec_fn)
+    return spec, raw
+
+
 def run_check(parser: ArgumentParser, args: Namespace):
     """Run the check command."""
     validate_check_args(parser, args)
 
-    spec = load_spec(args.yaml, strict=False)
-    errors = seqspec_check(spec, args.skip)
-
-    if args.output:
-        with open(args.output, "w") as f:
+    batch = (
+        len(args.yaml) != 1 or args.manifest is not None or Path(args.yaml[0]).is_dir()
+    )
+    if batch:
+        specs = find_spec_files(args.yaml, args.manifest)
+        summary = run_check_batch(specs, args)
+        if summary["failed"]:
+            sys.exit(1)
+        return summary
+
+    spec_fn = args.yaml[0]
+    spec, raw = load_check_spec(spec_fn)
+    cache = CheckCache(CheckCache.path_for(spec_fn)) if args.incremental else None
+    errors = seqspec_check(
+        spec, args.skip, args.md5, raw=raw, cache=cache, strict=args.strict
+    )
+    if cache:
+        cache.save()
+
+    with phase("write"):
+        if args.output:
+            with open(args.output, "w") as f:
+                for idx, e in enumerate(errors, 1):
+                    print(format_error(e, idx), file=f)
+        else:
             for idx, e in enumerate(errors, 1):
-                print(format_error(e, idx), file=f)
-    else:
-        for idx, e in enumerate(errors, 1):
-            print(format_error(e, idx))
+                print(format_error(e, idx))
     return errors
 
 
+SPEC_PATTERNS = (
+    "*.yaml",
+    "*.yml",
+    "*.yaml.gz",
+    "*.yml.gz",
+    "*.spec.json",
+    "*.spec.json.gz",
+)
+
+
+def find_spec_files(paths: List[Path], manifest: Optional[Path] = None) -> List[Path]:
+    """Expand spec paths, directories (searched recursively) and a manifest.
+
+    Args:
+        paths: Spec files or directories containing them
+        manifest: Optional file listing spec paths, one per line; blank lines
+            and lines starting with `#` are ignored
+
+    Returns:
+        List of spec paths without duplicates, in the order given
+    """
+    paths = list(paths)
+    if manifest:
+        base = Path(manifest).parent
+        for line in Path(manifest).read_text().splitlines():
+            line = line.strip()
+            if line and not line.startswith("#"):
+                paths.append(base / line)
+
+    found: List[Path] = []
+    for p in paths:
+        p = Path(p)
+        if p.is_dir():
+            found += sorted({f for pat in SPEC_PATTERNS for f in p.rglob(pat)})
+        else:
+            found.append(p)
+    return list(dict.fromkeys(found))
+
+
+def check_spec_file(
+    spec_fn: str,
+    filter_type: Optional[str] = None,
+    md5: bool = False,
+    incremental: bool = False,
+    strict: bool = False,
+) -> Dict:
+    """Load and check one spec file; the unit of work of a batch check.
+
+    Returns:
+        A report with the spec path, its errors, the seconds spent per rule and
+        in total, and the exception message if the spec could not be checked.
+    """
+    start = time.perf_counter()
+    timings: Dict[str, float] = {}
+    report: Dict = {"spec": str(spec_fn)}
+    try:
+        spec, raw = load_check_spec(spec_fn)
+        cache = CheckCache(CheckCache.path_for(spec_fn)) if incremental else None
+        errors = seqspec_check(spec, filter_type, md5, raw, cache, timings, strict)
+        if cache:
+            cache.save()
+        report.update(ok=not errors, error_count=len(errors), errors=errors)
+    except Exception as e:
+        report.update(ok=False, error_count=0, errors=[], exception=str(e))
+    report["rule_seconds"] = timings
+    report["seconds"] = time.perf_counter() - start
+    return report
+
+
+def iter_check_reports(
+    specs: List[Path],
+    filter_type: Optional[str] = None,
+    md5: bool = False,
+    incremental: bool = False,
+    jobs: Optional[int] = None,
+    strict: bool = False,
+) -> Iterator[Dict]:
+    """Check many specs in a process pool, yielding reports as they complete.
+
+    Remote probes are shared across workers through the persistent remote
+    metadata cache.
+    """
+    work = [(str(s), filter_type, md5, incremental, strict) for s in specs]
+    jobs = min(jobs or os.cpu_count() or 1, len(work))
+    if jobs <= 1:
+        for w in work:
+            yield check_spec_file(*w)
+        return
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(check_spec_file, *w) for w in work]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def run_check_batch(specs: List[Path], args: Namespace) -> Dict:
+    """Check many specs, streaming JSON Lines reports and ending with a summary."""
+    out = open(args.output, "w") if args.output else sys.stdout
+    counts: Dict[str, int] = {}
+    failed: List[str] = []
+    rule_seconds: Dict[str, float] = {}
+    start = time.perf_counter()
+    try:
+        for report in iter_check_reports(
+            specs, args.skip, args.md5, args.incremental, args.jobs, args.strict
+        ):
+            print(json.dumps(report), file=out, flush=True)
+            counts[report["spec"]] = report["error_count"]
+            if not report["ok"]:
+                failed.append(report["spec"])
+            for rule, t in report["rule_seconds"].items():
+                rule_seconds[rule] = rule_seconds.get(rule, 0.0) + t
+
+        order = {str(s): i for i, s in enumerate(specs)}
+        summary = {
+            "specs": len(specs),
+            "failed": len(failed),
+            "errors": sum(counts.values()),
+            "error_counts": dict(sorted(counts.items(), key=lambda kv: order[kv[0]])),
+            "failed_specs": sorted(failed, key=order.__getitem__),
+            "rule_seconds": rule_seconds,
+            "seconds": time.perf_counter() - start,
+        }
+        print(json.dumps({"summary": summary}), file=out, flush=True)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return summary
+
+
 IGVF_FILTERS = [
     {"error_type": "check_schema", "error_object": "'lib_struct'"},
     {"error_type": "check_schema", "error_object": "'library_protocol'"},
@@ -108,7 +351,9 @@ IGVF_FILTERS = [
     {"error_type": "check_schema", "error_object": "'md5'"},
 ]
 IGVF_ONLIST_SKIP_FILTERS = IGVF_FILTERS + [
-    {"error_type": "check_onlist_files_exist", "error_object": "onlist"}
+    {"error_type": "check_onlist_files_exist", "error_object": "onlist"},
+    {"error_type": "check_onlist_contents", "error_object": "onlist"},
+    {"error_type": "check_onlist_hamming", "error_object": "onlist"},
 ]
 
 
@@ -137,523 +382,504 @@ def filter_errors(errors, filter_type):
         return errors
 
 
-def check(spec: Assay):
-    # Variety of checks against schema
-    def check_schema(spec: Assay, errors=[], idx=0):
-        schema_fn = path.join(path.dirname(__file__), "schema/seqspec.schema.json")
-        with open(schema_fn, "r") as stream:
-            schema = yaml.load(stream, Loader=yaml.Loader)
-        validator = Draft4Validator(schema)
-        for idx, error in enumerate(validator.iter_errors(spec.to_dict()), 1):
+def check(
+    spec: Assay,
+    md5: bool = False,
+    raw: Optional[Dict] = None,
+    cache: Optional[CheckCache] = None,
+    timings: Optional[Dict[str, float]] = None,
+    strict: bool = False,
+):
+    options = {"md5": md5, "strict": strict}
+    rules = [r for r in RULES.values() if not r.optional or options[r.optional]]
+    if timings is None and active_profiler():
+        timings = {}
+    with phase("check"):
+        errors = run_rules(spec, rules, raw, cache, timings)
+    if timings is not None:
+        record_timings("check_rules", timings)
+    return errors
+
+
+# Variety of checks against schema
+@register_rule
+class CheckSchema(CheckRule):
+    name = "check_schema"
+
+    def finish(self):
+        # the raw dict is what the file says; dumping the model is the fallback
+        raw = self.ctx.raw
+        instance = raw if raw is not None else self.ctx.spec.to_dict()
+        cache = self.ctx.cache
+        key = content_digest(instance) if cache else ""
+        if cache and (hit := cache.get("schema", key)) is not None:
+            self.errors.extend(hit)
+            return
+        for error in schema_errors(instance):
             err_elements = [repr(index) for index in error.path]
-            err_path = f"spec[{']['.join(err_elements)}]"
-            errobj = {
-                "error_type": "check_schema",
-                "error_message": f"{error.message} in {err_path}",
-                "error_object": err_elements[-1],
-            }
-            errors.append(errobj)
-        idx += 1
-        return (errors, idx)
-
-    # Modalities are unique
-    def check_unique_modalities(spec, errors, idx):
-        if len(spec.modalities) != len(set(spec.modalities)):
-            errobj = {
-                "error_type": "check_unique_modalities",
-                "error_message": f"modalities [{', '.join(spec.modalities)}] are not unique",
-                "error_object": "modalities",
-            }
-            errors.append(errobj)
-            idx += 1
-        return (errors, idx)
-
-    # Region_ids of the first level  correspond to the modalities (one per modality)
-    def check_region_ids_modalities(spec, errors, idx):
-        modes = spec.modalities
-        rgns = spec.library_spec
-        for r in rgns:
-            rid = r.region_id
-            if rid not in modes:
-                errobj = {
-                    "error_type": "check_region_ids_modalities",
-                    "error_message": f"region_id '{rid}' of the first level of the spec does not correspond to a modality [{', '.join(modes)}]",
-                    "error_object": "region",
-                }
-                errors.append(errobj)
-                idx += 1
-        return (errors, idx)
-
-    # Onlist files exist relative to the path of the spec or http
-    def check_onlist_files_exist(spec, errors, idx):
-        modes = spec.modalities
-        olrgns = []
-        for m in modes:
-            olrgns += [i.onlist for i in spec.get_libspec(m).get_onlist_regions()]
-
-        # Base directory of the spec file if known
-        spec_base = None
-        try:
-            spec_path = getattr(spec, "_spec_path", None)
-            if spec_path:
-                spec_base = Path(spec_path).parent
-        except Exception:
-            spec_base = None
+            err_path = f"spec[{']['.join(err_elements)}]" if err_elements else "spec"
+            self.error(f"{error.message} in {err_path}", _error_object(error))
+        if cache:
+            cache.put("schema", key, self.errors)
+
+
+def _error_object(error) -> str:
+    # the field in error, as in the dump of the model, where fields are never
+    # missing: for a missing property that is the property, not its parent
+    if error.validator == "required" and isinstance(error.instance, dict):
+        for name in error.validator_value:
+            if name not in error.instance and error.message.startswith(repr(name)):
+                return repr(name)
+    if error.path:
+        return repr(error.path[-1])
+    return "spec"
+
+
+# Modalities are unique
+@register_rule
+class CheckUniqueModalities(CheckRule):
+    name = "check_unique_modalities"
+
+    def finish(self):
+        modes = self.ctx.spec.modalities
+        if len(modes) != len(set(modes)):
+            self.error(f"modalities [{', '.join(modes)}] are not unique", "modalities")
+
+
+# Region_ids of the first level  correspond to the modalities (one per modality)
+@register_rule
+class CheckRegionIdsModalities(CheckRule):
+    name = "check_region_ids_modalities"
+
+    def finish(self):
+        modes = self.ctx.spec.modalities
+        for r in self.ctx.spec.library_spec:
+            if r.region_id not in modes:
+                self.error(
+                    f"region_id '{r.region_id}' of the first level of the spec does not correspond to a modality [{', '.join(modes)}]",
+                    "region",
+                )
+
+
+# Onlist files exist relative to the path of the spec or http
+@register_rule
+class CheckOnlistFilesExist(CheckRule):
+    name = "check_onlist_files_exist"
+
+    def finish(self):
+        ctx = self.ctx
+        olrgns = [r.onlist for r in ctx.onlist_regions]
+
+        # probe all remote onlists concurrently; errors are still reported in spec order
+        remote = [ol.url for ol in olrgns if ol.urltype in ("http", "https", "ftp")]
+        remote_exists = dict(zip(remote, remote_files_exist(remote)))
 
+        # local onlists are looked up in one listing per directory
+        files = ctx.local_files
         for ol in olrgns:
             if ol.urltype == "local":
                 if ol.filename[:-3] == ".gz":
-                    check = ol.url
-                    if spec_base and not Path(check).is_absolute():
-                        check = str((spec_base / check).resolve())
-                    if not path.exists(check):
-                        errobj = {
-                            "error_type": "check_onlist_files_exist",
-                            "error_message": f"{ol.filename[:-3]} does not exist",
-                            "error_object": "onlist",
-                        }
-                        errors.append(errobj)
-                        idx += 1
+                    if not files.exists(ctx.resolve(ol.url)):
+                        self.error(f"{ol.filename[:-3]} does not exist", "onlist")
                 else:
-                    check = ol.url
-                    check_gz = ol.url + ".gz"
-                    if spec_base:
-                        if not Path(check).is_absolute():
-                            check = str((spec_base / check).resolve())
-                        if not Path(check_gz).is_absolute():
-                            check_gz = str((spec_base / check_gz).resolve())
-                    if not path.exists(check) and not path.exists(check_gz):
-                        errobj = {
-                            "error_type": "check_onlist_files_exist",
-                            "error_message": f"{ol.filename} does not exist",
-                            "error_object": "onlist",
-                        }
-                        errors.append(errobj)
-                        idx += 1
+                    check = ctx.resolve(ol.url)
+                    check_gz = ctx.resolve(ol.url + ".gz")
+                    if not files.exists(check) and not files.exists(check_gz):
+                        self.error(f"{ol.filename} does not exist", "onlist")
             elif ol.urltype == "http" or ol.urltype == "https" or ol.urltype == "ftp":
-                # ping the link with a simple http request to check if the file exists at that URI
-                if spec.seqspec_version == "0.3.0":
-                    if not file_exists(ol.url):
-                        errobj = {
-                            "error_type": "check_onlist_files_exist",
-                            "error_message": f"{ol.filename} does not exist",
-                            "error_object": "onlist",
-                        }
-
-                        errors.append(errobj)
-                        idx += 1
-                else:
-                    if not file_exists(ol.url):
-                        errobj = {
-                            "error_type": "check_onlist_files_exist",
-                            "error_message": f"{ol.filename} does not exist",
-                            "error_object": "onlist",
-                        }
-                        errors.append(errobj)
-                        idx += 1
-        return (errors, idx)
-
-    # Read ids are unique
-    def check_unique_read_ids(spec, errors, idx):
-        read_ids = set()
-        for read in spec.sequence_spec:
-            if read.read_id in read_ids:
-                errobj = {
-                    "error_type": "check_unique_read_ids",
-                    "error_message": f"read_id '{read.read_id}' is not unique across all reads",
-                    "error_object": "read",
-                }
-                errors.append(errobj)
-                idx += 1
-            else:
-                read_ids.add(read.read_id)
-        return (errors, idx)
-
-    # Read files exist
-    def check_read_files_exist(spec, errors, idx):
-        # Base directory of the spec file if known
-        spec_base = None
-        try:
-            spec_path = getattr(spec, "_spec_path", None)
-            if spec_path:
-                spec_base = Path(spec_path).parent
-        except Exception:
-            spec_base = None
-
-        for read in spec.sequence_spec:
-            for f in read.files:
-                if f.urltype == "local":
-                    check = f.url
-                    if spec_base and not Path(check).is_absolute():
-                        check = str((spec_base / check).resolve())
-                    if not path.exists(check):
-                        errobj = {
-                            "error_type": "check_read_files_exist",
-                            "error_message": f"{f.filename} does not exist",
-                            "error_object": "file",
-                        }
-                        errors.append(errobj)
-                        idx += 1
-                elif f.urltype == "http" or f.urltype == "https" or f.urltype == "ftp":
-                    # ping the link with a simple http request to check if the file exists at that URI
-                    if not file_exists(f.url):
-                        errobj = {
-                            "error_type": "check_read_files_exist",
-                            "error_message": f"{f.filename} does not exist",
-                            "error_object": "file",
-                        }
-                        errors.append(errobj)
-                        idx += 1
-        return (errors, idx)
-
-    # Primer ids, strand tuple pairs are unique across all reads
-    def check_unique_read_primer_strand_pairs(spec, errors, idx):
-        primer_strand_pairs = set()
-        for read in spec.sequence_spec:
-            if (read.primer_id, read.strand) in primer_strand_pairs:
-                errobj = {
-                    "error_type": "check_unique_read_primer_strand_pairs",
-                    "error_message": f"primer_id '{read.primer_id}' and strand '{read.strand}' tuple is not unique across all reads",
-                    "error_object": "read",
-                }
-                errors.append(errobj)
-                idx += 1
-            else:
-                primer_strand_pairs.add((read.primer_id, read.strand))
-        return (errors, idx)
-
-    # TODO add option to check md5sum
-    def check_md5sum(spec: Assay, errors, idx):
-        return (errors, idx)
-
-    # Region_id is unique across all regions
-    def check_unique_region_ids(spec, errors, idx):
-        modes = spec.modalities
-        rgn_ids = set()
-        for m in modes:
-            for rgn in spec.get_libspec(m).get_leaves():
-                if rgn.region_id in rgn_ids:
-                    errobj = {
-                        "error_type": "check_unique_region_ids",
-                        "error_message": f"region_id '{rgn.region_id}' is not unique across all regions",
-                        "error_object": "region",
-                    }
-                    errors.append(errobj)
-                    idx += 1
-                else:
-                    rgn_ids.add(rgn.region_id)
-        return (errors, idx)
-
-    # Modality is in the reads
-    def check_read_modalities(spec, errors, idx):
-        modes = spec.modalities
-        for read in spec.sequence_spec:
-            if read.modality not in modes:
-                errobj = {
-                    "error_type": "check_read_modalities",
-                    "error_message": f"read '{read.read_id}' modality '{read.modality}' does not exist in the modalities",
-                    "error_object": "read",
-                }
-                errors.append(errobj)
-                idx += 1
-        return (errors, idx)
-
-    # check that the unique primer ids exist as a region id in the library_spec
-    # TODO is there a better way to get the rgn_ids?
-    def check_primer_ids_in_region_ids(spec, errors, idx):
-        # first get all unique region_ids
-        modes = spec.modalities
-        rgn_ids = set()
-        for m in modes:
-            for rgn in spec.get_libspec(m).get_leaves():
-                if rgn.region_id in rgn_ids:
-                    pass
-                else:
-                    rgn_ids.add(rgn.region_id)
-
-        # then check that the primer ids exist in the region_ids
-        for read in spec.sequence_spec:
-            if read.primer_id not in rgn_ids:
-                errobj = {
-                    "error_type": "check_primer_ids_in_region_ids",
-                    "error_message": f"'{read.read_id}' primer_id '{read.primer_id}' does not exist in the library_spec",
-                    "error_object": "read",
-                }
-                errors.append(errobj)
-                idx += 1
-        return (errors, idx)
-
-    # NOTE: this is a strong assumption that may be relaxed in the future
-    # check that the primer id for each read is in the leaves of the spec for that modality
-    # def check_primer_ids_in_libspec_leaves(spec, errors, idx):
-    #     for read in spec.sequence_spec:
-    #         mode = spec.get_libspec(read.modality)
-    #         leaves = mode.get_leaves()
-    #         if read.primer_id not in [i.region_id for i in leaves]:
-    #             errobj = {
-    #                 "error_type": "check_primer_ids_in_libspec_leaves",
-    #                 "error_message": f"'{read.read_id}' primer_id '{read.primer_id}' does not exist as an atomic region in the library_spec for modality '{read.modality}'",
-    #                 "error_object": "read",
-    #             }
-    #             errors.append(errobj)
-    #             idx += 1
-    #     return (errors, idx)
-
-    # check that the read lengths of the reads are between those allowed by the library elements after the primer
-    def check_read_length_against_library(spec: Assay, errors, idx):
-        for read in spec.sequence_spec:
-            mode = read.modality
-            libspec = spec.get_libspec(mode)
-            leaves = libspec.get_leaves_with_region_id(read.primer_id)
-            # Find the primer region index in the leaves
-            try:
-                pidx = next(
-                    i for i, obj in enumerate(leaves) if obj.region_id == read.primer_id
+                # the link was pinged with an http request up front, see remote_exists
+                if not remote_exists[ol.url]:
+                    self.error(f"{ol.filename} does not exist", "onlist")
+
+
+# Local onlist contents agree with the region that owns them
+@register_rule
+class CheckOnlistContents(CheckRule):
+    name = "check_onlist_contents"
+
+    def finish(self):
+        for rgn, ol, stats in self.local_onlists():
+            problems = []
+            if stats.distinct < stats.count:
+                problems.append(f"{stats.count - stats.distinct} duplicate entries")
+            if stats.invalid:
+                problems.append(
+                    f"{stats.invalid} entries with characters other than A, C, G, T, N"
                 )
-            except StopIteration:
-                errobj = {
-                    "error_type": "check_read_length_against_library",
-                    "error_message": f"'{read.read_id}' primer_id '{read.primer_id}' not found in library leaves for modality '{mode}'",
-                    "error_object": "read",
-                }
-                errors.append(errobj)
-                idx += 1
+            outside = sum(
+                n
+                for length, n in stats.lengths.items()
+                if not rgn.min_len <= length <= rgn.max_len
+            )
+            if outside:
+                problems.append(
+                    f"{outside} entries with length outside ({rgn.min_len}, {rgn.max_len})"
+                )
+            for problem in problems:
+                self.error(
+                    f"'{rgn.region_id}' onlist {ol.filename} has {problem}", "onlist"
+                )
+
+    def local_onlists(self):
+        """Yield the regions with a local onlist file, the onlist and its stats."""
+        files = self.ctx.local_files
+        for rgn in self.ctx.onlist_regions:
+            ol = rgn.onlist
+            if ol.urltype != "local":
                 continue
+            check = self.ctx.resolve(ol.url)
+            if not files.exists(check) or not os.path.isfile(check):
+                check = check + ".gz"
+                # missing onlists are reported by check_onlist_files_exist; an
+                # empty url resolves to the spec's directory, which is skipped
+                if not files.exists(check) or not os.path.isfile(check):
+                    continue
+            # an onlist shared by several regions or rules is only read once
+            if check not in self.ctx.onlist_stats:
+                self.ctx.onlist_stats[check] = self.stats(check)
+            yield rgn, ol, self.ctx.onlist_stats[check]
+
+    def stats(self, filename):
+        cache = self.ctx.cache
+        if cache is None:
+            return onlist_stats(iter_local_list(filename))
+        # keyed by path, valid while the file is unchanged
+        key = list(stat_key(self.ctx.local_files.stat(filename)))
+        hit = cache.get("onlist_stats", filename)
+        if hit is not None and hit["stat"] == key:
+            return OnlistStats(**hit["stats"])
+        stats = onlist_stats(iter_local_list(filename))
+        cache.put("onlist_stats", filename, {"stat": key, "stats": stats.model_dump()})
+        return stats
+
+
+# Local onlists have no distinct entries one substitution apart (only when
+# requested: barcode lists corrected for single errors have such pairs)
+@register_rule
+class CheckOnlistHamming(CheckOnlistContents):
+    name = "check_onlist_hamming"
+    optional = "strict"
+
+    def finish(self):
+        for rgn, ol, stats in self.local_onlists():
+            if stats.min_hamming == 1:
+                self.error(
+                    f"'{rgn.region_id}' onlist {ol.filename} has distinct entries "
+                    "one substitution apart (minimum Hamming distance 1)",
+                    "onlist",
+                )
 
-            if read.strand == "pos":
-                # everything after the primer region
-                elements = leaves[pidx + 1 :]
-            else:
-                # everything before the primer region
-                elements = leaves[:pidx]
-
-            # sum_min = sum(obj.min_len for obj in elements)
-            sum_max = sum(obj.max_len for obj in elements)
-
-            # Check that the read's min_len and max_len are within the allowed range
-            if read.max_len > sum_max:
-                errobj = {
-                    "error_type": "check_read_length_against_library",
-                    "error_message": (
-                        f"'{read.read_id}' max read length (max_len={read.max_len}) "
-                        f"is greater than sequence-able range (max_sum={sum_max}) "
-                        f"for library elements {'after' if read.strand == 'pos' else 'before'} primer '{read.primer_id}'"
-                    ),
-                    "error_object": "read",
-                }
-                errors.append(errobj)
-                idx += 1
-
-        return (errors, idx)
-
-    def check_sequence_types(spec, errors, idx):
-        modes = spec.modalities
-
-        # if a region has a sequence type "fixed" then it should not contain subregions
-        # if a region has a sequence type "joiend" then it should contain subregions
-        # if a region has a sequence type "random" then it should not contain subregions and should be all X's
-        # if a region has a sequence type "onlist" then it should have an onlist object
-        def seqtype_check(rgn, errors, idx):
-            # this is a recursive function that iterates through all regions and checks the sequence type
-            if rgn.sequence_type == "fixed" and rgn.regions:
-                errobj = {
-                    "error_type": "check_sequence_types",
-                    "error_message": f"'{rgn.region_id}' sequence_type is 'fixed' and contains subregions",
-                    "error_object": "region",
-                }
-                errors.append(errobj)
-                idx += 1
-            if rgn.sequence_type == "joined" and not rgn.regions:
-                errobj = {
-                    "error_type": "check_sequence_types",
-                    "error_message": f"'{rgn.region_id}' sequence_type is 'joined' and does not contain subregions",
-                    "error_object": "region",
-                }
-                errors.append(errobj)
-                idx += 1
-            if rgn.sequence_type == "random" and rgn.regions:
-                errobj = {
-                    "error_type": "check_sequence_types",
-                    "error_message": f"'{rgn.region_id}' sequence_type is 'random' and contains subregions",
-                    "error_object": "region",
-                }
-                errors.append(errobj)
-                idx += 1
-            if rgn.sequence_type == "random" and (
-                set(rgn.sequence) != {"X"}
-                or not (rgn.min_len <= len(rgn.sequence) <= rgn.max_len)
-            ):
-                errobj = {
-                    "error_type": "check_sequence_types",
-                    "error_message": f"'{rgn.region_id}' sequence_type is 'random' and sequence is not all X's",
-                    "error_object": "region",
-                }
-                errors.append(errobj)
-                idx += 1
-            if rgn.sequence_type == "onlist" and not rgn.onlist:
-                errobj = {
-                    "error_type": "check_sequence_types",
-                    "error_message": f"'{rgn.region_id}' sequence_type is 'onlist' and does not have an onlist object",
-                    "error_object": "region",
-                }
-                errors.append(errobj)
-                idx += 1
-            if rgn.regions:
-                for r in rgn.regions:
-                    errors, idx = seqtype_check(r, errors, idx)
-            return (errors, idx)
-
-        for m in modes:
-            for rgn in [spec.get_libspec(m)]:
-                errors, idx = seqtype_check(rgn, errors, idx)
-
-        return (errors, idx)
-
-    # check the lengths of every region against the max_len, using a recursive function
-    def check_region_lengths(spec, errors, idx):
-        modes = spec.modalities
-
-        def len_check(rgn, errors, idx):
-            if rgn.regions:
-                for r in rgn.regions:
-                    errors, idx = len_check(r, errors, idx)
-            if rgn.max_len < rgn.min_len:
-                errobj = {
-                    "error_type": "check_region_lengths",
-                    "error_message": f"'{rgn.region_id}' max_len is less than min_len",
-                    "error_object": "region",
-                }
-                errors.append(errobj)
-                idx += 1
-            return (errors, idx)
-
-        for m in modes:
-            for rgn in [spec.get_libspec(m)]:
-                errors, idx = len_check(rgn, errors, idx)
-        return (errors, idx)
-
-    # check that the length of the sequence is equal to the max_len using a recursive function
-    # an assumption in the code and spec is that the displayed sequence is equal to the max_len
-    def check_sequence_lengths(spec, errors, idx):
-        modes = spec.modalities
-
-        def seq_len_check(rgn, errors, idx):
-            if rgn.regions:
-                for r in rgn.regions:
-                    errors, idx = seq_len_check(r, errors, idx)
-            if rgn.sequence and (
-                len(rgn.sequence) < rgn.min_len or len(rgn.sequence) > rgn.max_len
-            ):
-                # noqa
-                errobj = {
-                    "error_type": "check_sequence_lengths",
-                    "error_message": f"'{rgn.region_id}' sequence '{rgn.sequence}' has length {len(rgn.sequence)}, expected range ({rgn.min_len}, {rgn.max_len})",
-                    "error_object": "region",
-                }
-                errors.append(errobj)
-                idx += 1
-            return (errors, idx)
-
-        for m in modes:
-            for rgn in [spec.get_libspec(m)]:
-                errors, idx = seq_len_check(rgn, errors, idx)
-        return (errors, idx)
-
-    # check that the number of files in each "File" object for all Read object are all the same length
-    def check_read_file_count(spec, errors, idx):
-        nfiles = []
-        for read in spec.sequence_spec:
-            nfiles.append(len(read.files))
-
-        if len(set(nfiles)) != 1:
-            errobj = {
-                "error_type": "check_read_file_count",
-                "error_message": "Reads must have the same number of files",
-                "error_object": "read",
-            }
-            errors.append(errobj)
-            idx += 1
-        return (errors, idx)
-
-    # for every region, check that the min/max length of the region is equal to the sum of the min/sum of the max lengths.
-    def check_region_against_subregion_length(spec: Assay, errors, idx):
-        modes = spec.modalities
-
-        def check_sub_length(rgn, errors, idx):
-            if rgn.regions:
-                min_sum = sum(sub.min_len for sub in rgn.regions)
-                max_sum = sum(sub.max_len for sub in rgn.regions)
-                if rgn.min_len != min_sum or rgn.max_len != max_sum:
-                    errobj = {
-                        "error_type": "check_region_against_subregion_length",
-                        "error_message": (
-                            f"Region '{rgn.region_id}' min_len/max_len ({rgn.min_len}, {rgn.max_len}) "
-                            f"does not match sum of subregions ({min_sum}, {max_sum})"
-                        ),
-                        "error_object": "region",
-                    }
-                    errors.append(errobj)
-                    idx += 1
-                for sub in rgn.regions:
-                    errors, idx = check_sub_length(sub, errors, idx)
-            return (errors, idx)
-
-        for m in modes:
-            for rgn in [spec.get_libspec(m)]:
-                errors, idx = check_sub_length(rgn, errors, idx)
-        return (errors, idx)
-
-    # for every region, check that the sequence is equal to the left-right concatenation of the sub regions
-    def check_region_against_subregion_sequence(spec: Assay, errors, idx):
-        modes = spec.modalities
-
-        def check_sub_sequences(rgn, errors, idx):
-            if rgn.regions:
-                concat_seq = "".join(sub.sequence for sub in rgn.regions)
-                if rgn.sequence != concat_seq:
-                    errobj = {
-                        "error_type": "check_region_against_subregion_sequence",
-                        "error_message": (
-                            f"Region '{rgn.region_id}' sequence '{rgn.sequence}' does not match "
-                            f"concatenation of subregions '{concat_seq}'"
-                        ),
-                        "error_object": "region",
-                    }
-                    errors.append(errobj)
-                    idx += 1
-                for sub in rgn.regions:
-                    errors, idx = check_sub_sequences(sub, errors, idx)
-            return (errors, idx)
-
-        for m in modes:
-            for rgn in [spec.get_libspec(m)]:
-                errors, idx = check_sub_sequences(rgn, errors, idx)
-        return (errors, idx)
-
-    errors = []
-    idx = 0
-    checks = {
-        "check_schema": check_schema,
-        "check_unique_modalities": check_unique_modalities,
-        "check_region_ids_modalities": check_region_ids_modalities,
-        "check_onlist_files_exist": check_onlist_files_exist,
-        "check_unique_read_ids": check_unique_read_ids,
-        "check_read_files_exist": check_read_files_exist,
-        "check_unique_read_primer_strand_pairs": check_unique_read_primer_strand_pairs,
-        "check_unique_region_ids": check_unique_region_ids,
-        "check_read_modalities": check_read_modalities,
-        "check_primer_ids_in_region_ids": check_primer_ids_in_region_ids,
-        # "check_primer_ids_in_libspec_leaves": check_primer_ids_in_libspec_leaves,
-        "check_sequence_types": check_sequence_types,
-        "check_region_lengths": check_region_lengths,
-        "check_sequence_lengths": check_sequence_lengths,
-        "check_read_file_count": check_read_file_count,
-        "check_region_against_subregion_length": check_region_against_subregion_length,
-        "check_region_against_subregion_sequence": check_region_against_subregion_sequence,
-        "check_read_length_against_library": check_read_length_against_library,
-    }
-    for k, v in checks.items():
-        # print(k)
-        errors, idx = v(spec, errors, idx)
 
-    return errors
+# Read ids are unique
+@register_rule
+class CheckUniqueReadIds(CheckRule):
+    name = "check_unique_read_ids"
+
+    def __init__(self, ctx):
+        super().__init__(ctx)
+        self.read_ids = set()
+
+    def visit_read(self, read):
+        if read.read_id in self.read_ids:
+            self.error(
+                f"read_id '{read.read_id}' is not unique across all reads", "read"
+            )
+        else:
+            self.read_ids.add(read.read_id)
+
+
+# Read files exist
+@register_rule
+class CheckReadFilesExist(CheckRule):
+    name = "check_read_files_exist"
+
+    def __init__(self, ctx):
+        super().__init__(ctx)
+        self.files = []
+
+    def visit_read(self, read):
+        self.files += read.files
+
+    def finish(self):
+        # probe all remote files concurrently; errors are still reported in spec order
+        remote = [f.url for f in self.files if f.urltype in ("http", "https", "ftp")]
+        remote_exists = dict(zip(remote, remote_files_exist(remote)))
+
+        files = self.ctx.local_files
+        for f in self.files:
+            if f.urltype == "local":
+                if not files.exists(self.ctx.resolve(f.url)):
+                    self.error(f"{f.filename} does not exist", "file")
+            elif f.urltype == "http" or f.urltype == "https" or f.urltype == "ftp":
+                if not remote_exists[f.url]:
+                    self.error(f"{f.filename} does not exist", "file")
+
+
+# Primer ids, strand tuple pairs are unique across all reads
+@register_rule
+class CheckUniqueReadPrimerStrandPairs(CheckRule):
+    name = "check_unique_read_primer_strand_pairs"
+
+    def __init__(self, ctx):
+        super().__init__(ctx)
+        self.primer_strand_pairs = set()
+
+    def visit_read(self, read):
+        if (read.primer_id, read.strand) in self.primer_strand_pairs:
+            self.error(
+                f"primer_id '{read.primer_id}' and strand '{read.strand}' tuple is not unique across all reads",
+                "read",
+            )
+        else:
+            self.primer_strand_pairs.add((read.primer_id, read.strand))
+
+
+# Region_id is unique across all regions
+@register_rule
+class CheckUniqueRegionIds(CheckRule):
+    name = "check_unique_region_ids"
+
+    def __init__(self, ctx):
+        super().__init__(ctx)
+        self.rgn_ids = set()
+
+    def enter_region(self, rgn, modality):
+        if rgn.regions:
+            return
+        if rgn.region_id in self.rgn_ids:
+            self.error(
+                f"region_id '{rgn.region_id}' is not unique across all regions",
+                "region",
+            )
+        else:
+            self.rgn_ids.add(rgn.region_id)
+
+
+# Modality is in the reads
+@register_rule
+class CheckReadModalities(CheckRule):
+    name = "check_read_modalities"
+
+    def visit_read(self, read):
+        modes = self.ctx.spec.modalities
+        if read.modality not in modes:
+            self.error(
+                f"read '{read.read_id}' modality '{read.modality}' does not exist in the modalities",
+                "read",
+            )
+
+
+# check that the unique primer ids exist as a region id in the library_spec
+@register_rule
+class CheckPrimerIdsInRegionIds(CheckRule):
+    name = "check_primer_ids_in_region_ids"
+
+    def visit_read(self, read):
+        if read.primer_id not in self.ctx.leaf_ids:
+            self.error(
+                f"'{read.read_id}' primer_id '{read.primer_id}' does not exist in the library_spec",
+                "read",
+            )
+
+
+# if a region has a sequence type "fixed" then it should not contain subregions
+# if a region has a sequence type "joiend" then it should contain subregions
+# if a region has a sequence type "random" then it should not contain subregions and should be all X's
+# if a region has a sequence type "onlist" then it should have an onlist object
+@register_rule
+class CheckSequenceTypes(CheckRule):
+    name = "check_sequence_types"
+    subtree_local = True
+
+    def enter_region(self, rgn, modality):
+        if rgn.sequence_type == "fixed" and rgn.regions:
+            self.error(
+                f"'{rgn.region_id}' sequence_type is 'fixed' and contains subregions",
+                "region",
+            )
+        if rgn.sequence_type == "joined" and not rgn.regions:
+            self.error(
+                f"'{rgn.region_id}' sequence_type is 'joined' and does not contain subregions",
+                "region",
+            )
+        if rgn.sequence_type == "random" and rgn.regions:
+            self.error(
+                f"'{rgn.region_id}' sequence_type is 'random' and contains subregions",
+                "region",
+            )
+        if rgn.sequence_type == "random" and (
+            set(rgn.sequence) != {"X"}
+            or not (rgn.min_len <= len(rgn.sequence) <= rgn.max_len)
+        ):
+            self.error(
+                f"'{rgn.region_id}' sequence_type is 'random' and sequence is not all X's",
+                "region",
+            )
+        if rgn.sequence_type == "onlist" and not rgn.onlist:
+            self.error(
+                f"'{rgn.region_id}' sequence_type is 'onlist' and does not have an onlist object",
+                "region",
+            )
+
+
+# check the lengths of every region against the max_len
+@register_rule
+class CheckRegionLengths(CheckRule):
+    name = "check_region_lengths"
+    subtree_local = True
+
+    def leave_region(self, rgn, modality):
+        if rgn.max_len < rgn.min_len:
+            self.error(f"'{rgn.region_id}' max_len is less than min_len", "region")
+
+
+# check that the length of the sequence is equal to the max_len
+# an assumption in the code and spec is that the displayed sequence is equal to the max_len
+@register_rule
+class CheckSequenceLengths(CheckRule):
+    name = "check_sequence_lengths"
+    subtree_local = True
+
+    def leave_region(self, rgn, modality):
+        if rgn.sequence and (
+            len(rgn.sequence) < rgn.min_len or len(rgn.sequence) > rgn.max_len
+        ):
+            self.error(
+                f"'{rgn.region_id}' sequence '{rgn.sequence}' has length {len(rgn.sequence)}, expected range ({rgn.min_len}, {rgn.max_len})",
+                "region",
+            )
+
+
+# check that the number of files in each "File" object for all Read object are all the same length
+@register_rule
+class CheckReadFileCount(CheckRule):
+    name = "check_read_file_count"
+
+    def __init__(self, ctx):
+        super().__init__(ctx)
+        self.nfiles = set()
+
+    def visit_read(self, read):
+        self.nfiles.add(len(read.files))
+
+    def finish(self):
+        if len(self.nfiles) != 1:
+            self.error("Reads must have the same number of files", "read")
+
+
+# for every region, check that the min/max length of the region is equal to the sum of the min/sum of the max lengths.
+@register_rule
+class CheckRegionAgainstSubregionLength(CheckRule):
+    name = "check_region_against_subregion_length"
+    subtree_local = True
+
+    def enter_region(self, rgn, modality):
+        if rgn.regions:
+            min_sum = sum(sub.min_len for sub in rgn.regions)
+            max_sum = sum(sub.max_len for sub in rgn.regions)
+            if rgn.min_len != min_sum or rgn.max_len != max_sum:
+                self.error(
+                    f"Region '{rgn.region_id}' min_len/max_len ({rgn.min_len}, {rgn.max_len}) "
+                    f"does not match sum of subregions ({min_sum}, {max_sum})",
+                    "region",
+                )
+
+
+# for every region, check that the sequence is equal to the left-right concatenation of the sub regions
+@register_rule
+class CheckRegionAgainstSubregionSequence(CheckRule):
+    name = "check_region_against_subregion_sequence"
+    subtree_local = True
+
+    def enter_region(self, rgn, modality):
+        if rgn.regions:
+            concat_seq = "".join(sub.sequence for sub in rgn.regions)
+            if rgn.sequence != concat_seq:
+                self.error(
+                    f"Region '{rgn.region_id}' sequence '{rgn.sequence}' does not match "
+                    f"concatenation of subregions '{concat_seq}'",
+                    "region",
+                )
+
+
+# check that the read lengths of the reads are between those allowed by the library elements after the primer
+@register_rule
+class CheckReadLengthAgainstLibrary(CheckRule):
+    name = "check_read_length_against_library"
+
+    def visit_read(self, read):
+        sum_max = self.ctx.elements_max_len(read)
+        if sum_max is None:
+            self.error(
+                f"'{read.read_id}' primer_id '{read.primer_id}' not found in library leaves for modality '{read.modality}'",
+                "read",
+            )
+            return
+
+        # Check that the read's max_len is within the allowed range
+        if read.max_len > sum_max:
+            self.error(
+                f"'{read.read_id}' max read length (max_len={read.max_len}) "
+                f"is greater than sequence-able range (max_sum={sum_max}) "
+                f"for library elements {'after' if read.strand == 'pos' else 'before'} primer '{read.primer_id}'",
+                "read",
+            )
+
+
+# Sizes of local read files and onlists match their filesize, when given
+@register_rule
+class CheckFileSizes(CheckRule):
+    name = "check_file_sizes"
+
+    def finish(self):
+        ctx = self.ctx
+        objs = []
+        for read in ctx.spec.sequence_spec:
+            objs += [(f, "file") for f in read.files]
+        objs += [(r.onlist, "onlist") for r in ctx.onlist_regions]
+        objs = [(o, k) for o, k in objs if o.filesize and o.urltype == "local"]
+
+        # missing files are reported by the existence checks
+        stats = ctx.local_files.stats(ctx.resolve(o.url) for o, _ in objs)
+        for obj, kind in objs:
+            st = stats[ctx.resolve(obj.url)]
+            if st is not None and st.st_size != obj.filesize:
+                self.error(
+                    f"{obj.filename} filesize {st.st_size} does not match {obj.filesize}",
+                    kind,
+                )
+
+
+# md5sums of read files and onlists match their md5 (only when requested)
+@register_rule
+class CheckMd5sum(CheckRule):
+    name = "check_md5sum"
+    optional = "md5"
+
+    def finish(self):
+        ctx = self.ctx
+        objs = []
+        for read in ctx.spec.sequence_spec:
+            objs += [(f, "file") for f in read.files]
+        objs += [(r.onlist, "onlist") for r in ctx.onlist_regions]
+
+        pending = []
+        for obj, kind in objs:
+            if not obj.md5:
+                continue
+            if obj.urltype == "local":
+                pending.append((obj, kind, (ctx.resolve(obj.url), False)))
+            elif obj.urltype in ("http", "https", "ftp"):
+                pending.append((obj, kind, (obj.url, True)))
+
+        # stats are shared with the filesize check
+        local = [loc for _, _, (loc, remote) in pending if not remote]
+        stats = ctx.local_files.stats(local)
+        # missing or unreachable files are reported by the existence checks
+        digests = md5sums([target for _, _, target in pending], stats=stats)
+        for (obj, kind, _), digest in zip(pending, digests):
+            if digest is not None and digest != obj.md5.lower():
+                self.error(
+                    f"{obj.filename} md5sum '{digest}' does not match '{obj.md5}'",
+                    kind,
+                )
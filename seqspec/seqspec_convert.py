@@ -3,8 +3,6 @@
 This module provides functionality to convert between different formats (seqspec, genbank, token).
 """
 
-import json
-import os
 from argparse import ArgumentParser, Namespace, RawTextHelpFormatter
 from pathlib import Path
 from typing import Dict, List, Tuple
@@ -12,18 +10,39 @@ from typing import Dict, List, Tuple
 import numpy as np
 
 from seqspec.Assay import Assay
+from seqspec.genbank import load_genbank
 from seqspec.Region import Region
-from seqspec.utils import load_genbank, load_spec
+from seqspec.schema_validator import load_schema
+from seqspec.utils import load_spec
 
 # Load schema and constants
-schema_fn = os.path.join(os.path.dirname(__file__), "schema/seqspec.schema.json")
-with open(schema_fn, "r") as f:
-    schema = json.load(f)
+schema = load_schema()
 REGION_TYPES = schema["$defs"]["region"]["properties"]["region_type"]["enum"]
 MODALITIES = schema["properties"]["modalities"]["items"]["enum"]
 SEQUENCE_TYPES = schema["$defs"]["region"]["properties"]["sequence_type"]["enum"]
 
 
+def _one_hot_index(values: List[str]) -> Dict[str, int]:
+    # column of each value, also by lower case for specs written before the
+    # schema settled on lower case names
+    index = {v.lower(): i for i, v in enumerate(values)}
+    index.update({v: i for i, v in enumerate(values)})
+    return index
+
+
+MODALITY_INDEX = _one_hot_index(MODALITIES)
+REGION_TYPE_INDEX = _one_hot_index(REGION_TYPES)
+SEQUENCE_TYPE_INDEX = _one_hot_index(SEQUENCE_TYPES)
+
+
+def _lookup(index: Dict[str, int], value) -> int:
+    value = getattr(value, "value", value)
+    i = index.get(value)
+    if i is None and isinstance(value, str):
+        i = index.get(value.lower())
+    return -1 if i is None else i
+
+
 def setup_convert_args(parser) -> ArgumentParser:
     """Create and configure the convert command subparser."""
     subparser = parser.add_parser(
@@ -179,7 +198,9 @@ def seqspec_to_token(spec):
     specs_regions = {}
     modalities = spec.list_modalities()
     for modality in modalities:
-        regions = [i.to_dict() for i in spec.get_libspec(modality).get_leaves()]
+        regions = [
+            i.model_dump(mode="json") for i in spec.get_libspec(modality).get_leaves()
+        ]
         specs_regions[modality] = regions
 
     # Convert to tokenized matrix
@@ -198,6 +219,9 @@ def tokenize_specs(
     Returns:
         - Matrix where each row is [modality_onehot, region_type_onehot, sequence_type_onehot, min_len, max_len, position]
         - List of (spec_id, modality, region_type) identifying each row
+
+    Modalities, region types and sequence types that are not in the schema (by
+    name or lower-cased name) get no one-hot column.
     """
     # Calculate feature dimensions
     n_modality_features = len(MODALITIES)
@@ -227,18 +251,23 @@ def tokenize_specs(
                 current_idx = 0
 
                 # Add modality one-hot
-                modality_idx = MODALITIES.index(modality)
-                feature_vector[modality_idx] = 1
+                modality_idx = _lookup(MODALITY_INDEX, modality)
+                if modality_idx >= 0:
+                    feature_vector[modality_idx] = 1
                 current_idx += n_modality_features
 
                 # Add region_type one-hot
-                region_type_idx = REGION_TYPES.index(region["region_type"])
-                feature_vector[current_idx + region_type_idx] = 1
+                region_type_idx = _lookup(REGION_TYPE_INDEX, region["region_type"])
+                if region_type_idx >= 0:
+                    feature_vector[current_idx + region_type_idx] = 1
                 current_idx += n_region_type_features
 
                 # Add sequence_type one-hot
-                sequence_type_idx = SEQUENCE_TYPES.index(region["sequence_type"])
-                feature_vector[current_idx + sequence_type_idx] = 1
+                sequence_type_idx = _lookup(
+                    SEQUENCE_TYPE_INDEX, region["sequence_type"]
+                )
+                if sequence_type_idx >= 0:
+                    feature_vector[current_idx + sequence_type_idx] = 1
                 current_idx += n_sequence_type_features
 
                 # Add lengths
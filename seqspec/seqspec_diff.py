@@ -1,14 +1,42 @@
 """Diff module for seqspec.
 
 This module provides functionality to compare two seqspec files and identify differences.
+
+`diff_specs` compares two specs structurally: metadata, modalities, the region
+trees with their onlists, and the reads with their files. Subtrees with equal
+content digests (see `seqspec.spec_hash`) are skipped without being visited.
+The children of two matched nodes are aligned in order: identical children and
+children with the same id are matched first, matched children that are out of
+order are reported as moved, and the remaining children between two aligned
+ones are matched as renamed if they are of the same type (region type, read
+modality, file type). What is left is deleted or inserted, except that a
+deleted and an inserted object with the same content are reported as moved.
 """
 
-from argparse import ArgumentParser, Namespace
+import json
+from argparse import ArgumentParser, Namespace, RawTextHelpFormatter
+from bisect import bisect_left
+from collections import defaultdict, deque
+from enum import Enum
 from pathlib import Path
-from typing import List
+from typing import (
+    AbstractSet,
+    Any,
+    Callable,
+    Dict,
+    List,
+    Literal,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+from pydantic import BaseModel
 
 from seqspec.Assay import Assay
 from seqspec.Region import Region
+from seqspec.spec_hash import model_digests
 from seqspec.utils import load_spec
 
 
@@ -22,9 +50,11 @@ Compare two seqspec files and identify differences.
 Examples:
 seqspec diff spec1.yaml spec2.yaml                    # Compare two specs and print differences
 seqspec diff spec1.yaml spec2.yaml -o diff.txt        # Compare specs and save differences to file
+seqspec diff -f json spec1.yaml spec2.yaml            # List the differences as JSON
 ---
 """,
         help="Compare two seqspec files and identify differences",
+        formatter_class=RawTextHelpFormatter,
     )
     subparser.add_argument(
         "yamlA", help="First sequencing specification yaml file", type=str
@@ -40,6 +70,16 @@ seqspec diff spec1.yaml spec2.yaml -o diff.txt        # Compare specs and save d
         type=Path,
         default=None,
     )
+    choices = ["text", "json"]
+    subparser.add_argument(
+        "-f",
+        "--format",
+        metavar="FORMAT",
+        help=f"The output format, [{', '.join(choices)}] (default: text)",
+        type=str,
+        default="text",
+        choices=choices,
+    )
     return subparser
 
 
@@ -60,7 +100,11 @@ def run_diff(parser: ArgumentParser, args: Namespace) -> None:
     spec_a = load_spec(args.yamlA)
     spec_b = load_spec(args.yamlB)
 
-    differences = compare_specs(spec_a, spec_b)
+    changes = diff_specs(spec_a, spec_b)
+    if getattr(args, "format", "text") == "json":
+        differences = format_json_changes(changes)
+    else:
+        differences = format_changes(changes)
 
     if args.output:
         args.output.write_text(differences)
@@ -68,31 +112,435 @@ def run_diff(parser: ArgumentParser, args: Namespace) -> None:
         print(differences)
 
 
-def compare_specs(spec_a: Assay, spec_b: Assay) -> str:
-    """Compare two specs and return a string describing their differences."""
-    differences = []
+class SpecChange(BaseModel):
+    """One difference between two specs.
+
+    `path` locates the changed object in spec A (in spec B for insertions), as
+    ids joined by "/", e.g. `library_spec/rna/rna_cell_bc/onlist` or
+    `sequence_spec/rna_R1/files/R1.fastq.gz`. Updates name the `field` and give
+    its values in `a` and `b` (the lists of modalities for `modality`); renames give the old and new ids; moves give the
+    old and new positions, and the path in spec B in `to`; deletions and
+    insertions give the object.
+    """
+
+    op: Literal["update", "insert", "delete", "rename", "move"]
+    kind: Literal["meta", "modality", "region", "onlist", "read", "file"]
+    path: str
+    field: Optional[str] = None
+    a: Any = None
+    b: Any = None
+    to: Optional[str] = None
+
+
+# id field and the field that makes two unmatched objects a rename
+ID_FIELDS = {"region": "region_id", "read": "read_id", "file": "file_id"}
+RENAME_FIELDS = {"region": "region_type", "read": "modality", "file": "filetype"}
+NESTED_FIELDS = {"regions", "onlist", "files"}
+META_SKIP = {"modalities", "library_spec", "sequence_spec"}
+
+
+def diff_specs(spec_a: Assay, spec_b: Assay) -> List[SpecChange]:
+    """Compare two specs structurally.
+
+    Args:
+        spec_a: The first spec.
+        spec_b: The second spec.
+
+    Returns:
+        The changes from spec A to spec B: metadata, modalities, then regions
+        and reads, top-down. Empty if the specs are equal.
+    """
+    differ = _Differ(spec_a, spec_b)
+    if differ.digest_a(spec_a) == differ.digest_b(spec_b):
+        return []
+    differ.meta(spec_a, spec_b)
+    differ.modalities(spec_a.modalities, spec_b.modalities)
+    differ.children(
+        "region",
+        "library_spec",
+        "library_spec",
+        spec_a.library_spec,
+        spec_b.library_spec,
+    )
+    differ.children(
+        "read",
+        "sequence_spec",
+        "sequence_spec",
+        spec_a.sequence_spec,
+        spec_b.sequence_spec,
+    )
+    return differ.finish()
+
+
+class _Differ:
+    def __init__(self, spec_a: Assay, spec_b: Assay):
+        self._digests_a = model_digests(spec_a)
+        self._digests_b = model_digests(spec_b)
+        self.changes: List[Optional[SpecChange]] = []
+        # (kind, digest) of deleted and inserted objects -> index in changes
+        self._deleted: Dict[Tuple[str, str], List[int]] = defaultdict(list)
+        self._inserted: Dict[Tuple[str, str], List[int]] = defaultdict(list)
+
+    def digest_a(self, model: BaseModel) -> str:
+        return self._digests_a[id(model)]
+
+    def digest_b(self, model: BaseModel) -> str:
+        return self._digests_b[id(model)]
+
+    def add(self, **change: Any) -> None:
+        self.changes.append(SpecChange(**change))
+
+    def meta(self, spec_a: Assay, spec_b: Assay) -> None:
+        for name in Assay.model_fields:
+            if name in META_SKIP:
+                continue
+            a, b = _plain(getattr(spec_a, name)), _plain(getattr(spec_b, name))
+            if a != b:
+                self.add(op="update", kind="meta", path="meta", field=name, a=a, b=b)
+
+    def modalities(self, a: List[str], b: List[str]) -> None:
+        # the order of the modalities carries no meaning
+        if set(a) != set(b):
+            self.add(
+                op="update", kind="modality", path="modalities", a=list(a), b=list(b)
+            )
+
+    def children(
+        self,
+        kind: str,
+        path_a: str,
+        path_b: str,
+        items_a: Sequence[BaseModel],
+        items_b: Sequence[BaseModel],
+    ) -> None:
+        id_field, rename_field = ID_FIELDS[kind], RENAME_FIELDS[kind]
+        keys_a = [self.digest_a(x) for x in items_a]
+        keys_b = [self.digest_b(x) for x in items_b]
+        ids_a = [getattr(x, id_field) for x in items_a]
+        ids_b = [getattr(x, id_field) for x in items_b]
+        pairs, moved, deleted, inserted = align(
+            keys_a,
+            keys_b,
+            ids_a,
+            ids_b,
+            [_plain(getattr(x, rename_field)) for x in items_a],
+            [_plain(getattr(x, rename_field)) for x in items_b],
+            lambda i, j: _similar(items_a[i], items_b[j]),
+        )
+        for i in deleted:
+            self._deleted[(kind, keys_a[i])].append(len(self.changes))
+            self.add(
+                op="delete",
+                kind=kind,
+                path=f"{path_a}/{ids_a[i]}",
+                a=items_a[i].model_dump(mode="json"),
+            )
+        for j in inserted:
+            self._inserted[(kind, keys_b[j])].append(len(self.changes))
+            self.add(
+                op="insert",
+                kind=kind,
+                path=f"{path_b}/{ids_b[j]}",
+                b=items_b[j].model_dump(mode="json"),
+            )
+        for i, j in pairs:
+            sub_a, sub_b = f"{path_a}/{ids_a[i]}", f"{path_b}/{ids_b[j]}"
+            if ids_a[i] != ids_b[j]:
+                self.add(op="rename", kind=kind, path=sub_a, a=ids_a[i], b=ids_b[j])
+            if (i, j) in moved:
+                self.add(op="move", kind=kind, path=sub_a, a=i, b=j, to=sub_b)
+            if keys_a[i] != keys_b[j]:
+                self.pair(kind, sub_a, sub_b, items_a[i], items_b[j])
+
+    def pair(
+        self, kind: str, path_a: str, path_b: str, a: BaseModel, b: BaseModel
+    ) -> None:
+        self.fields(kind, path_a, a, b, skip={ID_FIELDS[kind]})
+        if kind == "region":
+            self.onlist(path_a, a.onlist, b.onlist)  # type: ignore[attr-defined]
+            self.children("region", path_a, path_b, a.regions, b.regions)  # type: ignore[attr-defined]
+        elif kind == "read":
+            self.children(
+                "file",
+                f"{path_a}/files",
+                f"{path_b}/files",
+                a.files,  # type: ignore[attr-defined]
+                b.files,  # type: ignore[attr-defined]
+            )
+
+    def onlist(self, path: str, a: Any, b: Any) -> None:
+        path = f"{path}/onlist"
+        if a is None and b is None:
+            return
+        if a is None:
+            self.add(op="insert", kind="onlist", path=path, b=b.model_dump(mode="json"))
+        elif b is None:
+            self.add(op="delete", kind="onlist", path=path, a=a.model_dump(mode="json"))
+        elif self.digest_a(a) != self.digest_b(b):
+            self.fields("onlist", path, a, b)
+
+    def fields(
+        self,
+        kind: str,
+        path: str,
+        a: BaseModel,
+        b: BaseModel,
+        skip: AbstractSet[str] = frozenset(),
+    ) -> None:
+        for name in type(a).model_fields:
+            if name in skip or name in NESTED_FIELDS:
+                continue
+            va, vb = _plain(getattr(a, name)), _plain(getattr(b, name))
+            if va != vb:
+                self.add(op="update", kind=kind, path=path, field=name, a=va, b=vb)
+
+    def finish(self) -> List[SpecChange]:
+        # an object deleted in one place and inserted unchanged in another moved
+        for key, deletes in self._deleted.items():
+            for d, i in zip(deletes, self._inserted.get(key, [])):
+                deleted, inserted = self.changes[d], self.changes[i]
+                self.changes[d] = SpecChange(
+                    op="move",
+                    kind=deleted.kind,  # type: ignore[union-attr]
+                    path=deleted.path,  # type: ignore[union-attr]
+                    to=inserted.path,  # type: ignore[union-attr]
+                )
+                self.changes[i] = None
+        return [c for c in self.changes if c is not None]
+
+
+def align(
+    keys_a: Sequence[Any],
+    keys_b: Sequence[Any],
+    ids_a: Sequence[Any],
+    ids_b: Sequence[Any],
+    kinds_a: Sequence[Any],
+    kinds_b: Sequence[Any],
+    similar: Optional[Callable[[int, int], bool]] = None,
+) -> Tuple[List[Tuple[int, int]], Set[Tuple[int, int]], List[int], List[int]]:
+    """Align two ordered lists of children.
+
+    Items with equal keys (content digests) are matched first, then items with
+    equal ids. The longest run of matched pairs that are in the same order in
+    both lists anchors the alignment; the other matched pairs moved. Between
+    two anchors, unmatched items of the same kind are matched in order. Items
+    still unmatched are matched to later items of the same kind that are
+    `similar`; those moved if they are not between the same anchors.
+
+    Args:
+        keys_a, keys_b: Content keys of the items.
+        ids_a, ids_b: Ids of the items.
+        kinds_a, kinds_b: Kinds of the items; None never matches.
+        similar: Whether item i of list A and item j of list B are similar
+            enough to be the same item, renamed and moved.
+
+    Returns:
+        The matched pairs of indices, in the order of list A; the pairs that
+        moved; the unmatched indices of list A and of list B.
+    """
+    match: Dict[int, int] = {}
+    free: Dict[Any, deque] = defaultdict(deque)
+    for j, key in enumerate(keys_b):
+        free[key].append(j)
+    for i, key in enumerate(keys_a):
+        if free.get(key):
+            match[i] = free[key].popleft()
+    taken = set(match.values())
+    by_id: Dict[Any, int] = {}
+    for j, x in enumerate(ids_b):
+        if j not in taken:
+            by_id.setdefault(x, j)
+    for i, x in enumerate(ids_a):
+        if i not in match and x in by_id:
+            match[i] = j = by_id.pop(x)
+            taken.add(j)
+
+    # scanned from the end, so that of equally long runs the one keeping the
+    # earlier items in place is chosen
+    backwards = _increasing([(i, -j) for i, j in sorted(match.items(), reverse=True)])
+    anchors = [(i, -j) for i, j in reversed(backwards)]
+    moved = set(match.items()) - set(anchors)
+
+    # unmatched items of the same kind between two anchors were renamed
+    i0 = j0 = -1
+    for i1, j1 in anchors + [(len(keys_a), len(keys_b))]:
+        gap: Dict[Any, deque] = defaultdict(deque)
+        for j in range(j0 + 1, j1):
+            if j not in taken and kinds_b[j] is not None:
+                gap[kinds_b[j]].append(j)
+        for i in range(i0 + 1, i1):
+            if i not in match and gap.get(kinds_a[i]):
+                match[i] = j = gap[kinds_a[i]].popleft()
+                taken.add(j)
+        i0, j0 = i1, j1
+
+    if similar is not None:
+        left: Dict[Any, List[int]] = defaultdict(list)
+        for j in range(len(keys_b)):
+            if j not in taken and kinds_b[j] is not None:
+                left[kinds_b[j]].append(j)
+        anchors_i = [i for i, _ in anchors]
+        anchors_j = [j for _, j in anchors]
+        for i in range(len(keys_a)):
+            if i in match:
+                continue
+            candidates = left.get(kinds_a[i], [])
+            for n, j in enumerate(candidates):
+                if similar(i, j):
+                    match[i] = j
+                    taken.add(j)
+                    del candidates[n]
+                    if bisect_left(anchors_i, i) != bisect_left(anchors_j, j):
+                        moved.add((i, j))
+                    break
+
+    deleted = [i for i in range(len(keys_a)) if i not in match]
+    inserted = [j for j in range(len(keys_b)) if j not in taken]
+    return sorted(match.items()), moved, deleted, inserted
+
+
+def _increasing(pairs: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    # longest subsequence of pairs increasing in their second index, O(n log n)
+    tails: List[int] = []
+    tail_pos: List[int] = []
+    prev = [-1] * len(pairs)
+    for k, (_, j) in enumerate(pairs):
+        n = bisect_left(tails, j)
+        if n == len(tails):
+            tails.append(j)
+            tail_pos.append(k)
+        else:
+            tails[n] = j
+            tail_pos[n] = k
+        prev[k] = tail_pos[n - 1] if n else -1
+    out = []
+    k = tail_pos[-1] if tail_pos else -1
+    while k >= 0:
+        out.append(pairs[k])
+        k = prev[k]
+    return out[::-1]
+
+
+def _similar(a: BaseModel, b: BaseModel) -> bool:
+    # most of the fields are equal
+    fields = [f for f in type(a).model_fields if f not in NESTED_FIELDS]
+    same = sum(getattr(a, f) == getattr(b, f) for f in fields)
+    return 2 * same > len(fields)
+
+
+def _plain(value: Any) -> Any:
+    # a JSON-serializable form of a field value
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, list):
+        return [_plain(v) for v in value]
+    return value
+
+
+def format_json_changes(changes: List[SpecChange]) -> str:
+    """Format changes as a JSON list."""
+    return json.dumps(
+        [c.model_dump(exclude_unset=True) for c in changes], sort_keys=False, indent=4
+    )
 
-    # Compare modalities
-    modalities_a = set(spec_a.modalities)
-    modalities_b = set(spec_b.modalities)
 
-    if modalities_a != modalities_b:
-        differences.append("Modalities differ:")
-        differences.append(f"  Spec A: {', '.join(sorted(modalities_a))}")
-        differences.append(f"  Spec B: {', '.join(sorted(modalities_b))}")
+def format_changes(changes: List[SpecChange]) -> str:
+    """Format changes as text, by section: metadata, modalities, the regions of
+    each modality and the reads."""
+    if not changes:
+        return "No differences found"
+    meta = [c for c in changes if c.kind == "meta"]
+    modalities = [c for c in changes if c.kind == "modality"]
+    by_modality: Dict[str, List[SpecChange]] = {}
+    reads = []
+    for c in changes:
+        parts = c.path.split("/")
+        if parts[0] == "library_spec":
+            by_modality.setdefault(parts[1], []).append(c)
+        elif parts[0] == "sequence_spec":
+            reads.append(c)
 
-    # Compare common modalities
-    common_modalities = modalities_a.intersection(modalities_b)
-    for modality in common_modalities:
-        regions_a = spec_a.get_libspec(modality).get_leaves()
-        regions_b = spec_b.get_libspec(modality).get_leaves()
+    differences = []
+    if meta:
+        differences.append("Metadata differences:")
+        differences.extend(f"  - {c.field}: {c.a} != {c.b}" for c in meta)
+    for c in modalities:
+        differences.append("Modalities differ:")
+        differences.append(f"  Spec A: {', '.join(sorted(c.a))}")
+        differences.append(f"  Spec B: {', '.join(sorted(c.b))}")
+    for modality, group in by_modality.items():
+        differences.append(f"\nModality '{modality}' differences:")
+        differences.extend(_format_group(group, "Region", "Regions"))
+    if reads:
+        differences.append("\nSequence spec differences:")
+        differences.extend(_format_group(reads, "Read", "Reads"))
+    return "\n".join(differences).lstrip("\n")
+
+
+def _format_group(changes: List[SpecChange], noun: str, nouns: str) -> List[str]:
+    lines = []
+    for op, side in [("delete", "A"), ("insert", "B")]:
+        for kind, label in [
+            ("region", nouns),
+            ("read", nouns),
+            ("file", "Files"),
+            ("onlist", "Onlists"),
+        ]:
+            names = [_name(c) for c in changes if c.op == op and c.kind == kind]
+            if names:
+                lines.append(f"  {label} only in spec {side}:")
+                lines.extend(f"    - {n}" for n in sorted(names))
+    updates: Dict[str, List[str]] = {}
+    for c in changes:
+        if c.op != "update":
+            continue
+        if c.kind == "onlist":
+            owner, field = c.path.rsplit("/", 1)[0], f"onlist.{c.field}"
+        else:
+            owner, field = c.path, c.field
+        updates.setdefault(owner, []).append(f"{field}: {c.a} != {c.b}")
+    for owner, diffs in updates.items():
+        lines.append(f"  {_owner(owner, noun)} '{_last(owner)}' differences:")
+        lines.extend(f"    - {d}" for d in diffs)
+    for c in changes:
+        if c.op == "rename":
+            lines.append(f"  {_owner(c.path, noun)} '{c.a}' renamed to '{c.b}'")
+        elif c.op == "move" and c.a is not None:
+            lines.append(
+                f"  {_owner(c.path, noun)} '{_last(c.path)}' moved from position "
+                f"{c.a} to {c.b}"
+            )
+        elif c.op == "move":
+            lines.append(
+                f"  {_owner(c.path, noun)} '{_last(c.path)}' moved from {c.path} "
+                f"to {c.to}"
+            )
+    return lines
+
+
+def _name(change: SpecChange) -> str:
+    if change.kind == "file":
+        # read_id/file_id
+        parts = change.path.split("/")
+        return f"{parts[-3]}/{parts[-1]}"
+    if change.kind == "onlist":
+        return _last(change.path.rsplit("/", 1)[0])
+    return _last(change.path)
+
+
+def _owner(path: str, noun: str) -> str:
+    return "File" if "/files/" in path else noun
+
+
+def _last(path: str) -> str:
+    return path.rsplit("/", 1)[-1]
 
-        region_diffs = compare_regions(regions_a, regions_b)
-        if region_diffs:
-            differences.append(f"\nModality '{modality}' differences:")
-            differences.extend(region_diffs)
 
-    return "\n".join(differences) if differences else "No differences found"
+def compare_specs(spec_a: Assay, spec_b: Assay) -> str:
+    """Compare two specs and return a string describing their differences."""
+    return format_changes(diff_specs(spec_a, spec_b))
 
 
 def compare_regions(regions_a: List[Region], regions_b: List[Region]) -> List[str]:
@@ -11,7 +11,9 @@ from typing import Dict, List, Optional
 
 from seqspec.Assay import Assay
 from seqspec.File import File
-from seqspec.utils import load_spec
+from seqspec.session import open_session
+
+REMOTE_URLTYPES = ("http", "https", "ftp")
 
 
 def setup_file_args(parser) -> ArgumentParser:
@@ -174,17 +176,15 @@ def run_file(parser: ArgumentParser, args: Namespace) -> None:
     """Run the file command."""
     validate_file_args(parser, args)
 
-    spec = load_spec(args.yaml)
+    session = open_session(args.yaml)
     ids = args.ids.split(",") if args.ids else []
 
-    files = seqspec_file(
-        spec=spec,
-        modality=args.modality,
-        ids=ids,
-        selector=args.selector,
-    )
+    files = session.files(args.modality, ids, args.selector)
 
     if files:
+        if args.key in ("filesize", "all"):
+            files = fill_remote_filesizes(files)
+
         FORMAT = {
             "list": format_list_files_metadata,
             "paired": format_list_files,
@@ -203,6 +203,39 @@ def run_file(parser: ArgumentParser, args: Namespace) -> None:
             print(result)
 
 
+def fill_remote_filesizes(files: Dict[str, List[File]]) -> Dict[str, List[File]]:
+    """Fill in missing (zero) filesizes of remote files from their metadata.
+
+    Metadata comes from the persistent remote metadata cache when fresh, and
+    from concurrent HEAD probes otherwise. The files are not modified (they may
+    belong to a spec shared with other commands, see `seqspec batch`): files
+    whose size was found are replaced by copies with that size.
+
+    Returns:
+        `files`, or a copy in which the files whose size was found are replaced
+    """
+    missing = [
+        f
+        for items in files.values()
+        for f in items
+        if not f.filesize and f.urltype in REMOTE_URLTYPES
+    ]
+    if not missing:
+        return files
+    # requests is only imported when remote files are probed
+    from seqspec.remote import remote_files_meta
+
+    metas = remote_files_meta([f.url for f in missing])
+    sizes = {id(f): m.size for f, m in zip(missing, metas) if m.size is not None}
+    return {
+        key: [
+            f.model_copy(update={"filesize": sizes[id(f)]}) if id(f) in sizes else f
+            for f in items
+        ]
+        for key, items in files.items()
+    }
+
+
 def list_read_files(spec: Assay, modality: str) -> Dict[str, List[File]]:
     """List files for all reads in a modality."""
     files = defaultdict(list)
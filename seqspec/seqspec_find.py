@@ -13,7 +13,8 @@ from seqspec.File import File
 from seqspec.Read import Read
 from seqspec.Region import Region
 from seqspec.seqspec_file import list_all_files
-from seqspec.utils import load_spec, write_pydantic_to_file_or_stdout
+from seqspec.session import open_session
+from seqspec.utils import write_pydantic_to_file_or_stdout
 
 
 def setup_find_args(parser) -> ArgumentParser:
@@ -125,7 +126,7 @@ def run_find(parser: ArgumentParser, args: Namespace) -> None:
     """Run the find command."""
     validate_find_args(parser, args)
 
-    spec = load_spec(args.yaml)
+    spec = open_session(args.yaml).spec
 
     found = seqspec_find(spec, args.selector, args.modality, args.id)
 
@@ -8,7 +8,9 @@ from argparse import ArgumentParser, Namespace, RawTextHelpFormatter
 from pathlib import Path
 
 from seqspec.Assay import Assay
-from seqspec.utils import load_spec
+from seqspec.fragments import shared_dump
+from seqspec.serialize import dump_yaml, spec_format, write_yaml
+from seqspec.utils import load_spec, write_pydantic_to_file_or_stdout
 
 
 def setup_format_args(parser) -> ArgumentParser:
@@ -28,6 +30,8 @@ Automatically fill in missing fields in the spec.
 Examples:
 seqspec format spec.yaml              # Format spec and write to stdout
 seqspec format -o spec.yaml spec.yaml # Format and overwrite the spec
+seqspec format -o spec.json spec.yaml # Convert the spec to JSON
+seqspec format --anchors spec.yaml    # Write repeated regions once
 ---
 """,
         help="Autoformat seqspec file",
@@ -43,6 +47,18 @@ seqspec format -o spec.yaml spec.yaml # Format and overwrite the spec
         help="Path to output file",
         default=None,
     )
+    subparser.add_argument(
+        "-f",
+        "--format",
+        choices=["yaml", "json"],
+        help="Output format (default: json if OUT ends in .json or .json.gz, else yaml)",
+        default=None,
+    )
+    subparser.add_argument(
+        "--anchors",
+        action="store_true",
+        help="Write repeated regions and onlists once, as YAML anchors and aliases",
+    )
     return subparser
 
 
@@ -62,6 +78,10 @@ def validate_format_args(parser: ArgumentParser, args: Namespace) -> None:
     if args.output and Path(args.output).exists() and not Path(args.output).is_file():
         parser.error(f"Output path exists but is not a file: {args.output}")
 
+    fmt = args.format or (spec_format(args.output) if args.output else "yaml")
+    if args.anchors and fmt != "yaml":
+        parser.error("--anchors is only supported for YAML output")
+
 
 def run_format(parser: ArgumentParser, args: Namespace) -> None:
     """Run the format command.
@@ -75,10 +95,14 @@ def run_format(parser: ArgumentParser, args: Namespace) -> None:
     spec = load_spec(args.yaml, strict=False)
     spec = seqspec_format(spec)
 
-    if args.output:
-        spec.to_YAML(args.output)
-    else:
-        print(spec.to_YAML())
+    if args.anchors:
+        data = shared_dump(spec)
+        if args.output:
+            write_yaml(data, args.output)
+        else:
+            print(dump_yaml(data))
+        return
+    write_pydantic_to_file_or_stdout(spec, args.output, args.format)
 
 
 def seqspec_format(spec: Assay) -> Assay:
@@ -3,6 +3,7 @@
 This module provides functionality to identify the position of elements in a spec for use in downstream tools.
 """
 
+import time
 import warnings
 from argparse import SUPPRESS, ArgumentParser, Namespace, RawTextHelpFormatter
 from pathlib import Path
@@ -11,6 +12,7 @@ from typing import List, Optional
 from pydantic import BaseModel
 
 from seqspec.Assay import Assay
+from seqspec.profiling import phase, record_timings
 from seqspec.Region import (
     RegionCoordinate,
     RegionCoordinateDifference,
@@ -20,7 +22,9 @@ from seqspec.Region import (
 )
 from seqspec.seqspec_file import list_files_by_file_id
 from seqspec.seqspec_find import find_by_region_id
-from seqspec.utils import load_spec, map_read_id_to_regions
+from seqspec.session import open_session
+from seqspec.tracing import span
+from seqspec.utils import map_read_id_to_regions
 
 
 class Coordinate(BaseModel):
@@ -174,9 +178,16 @@ def seqspec_index(
         "read": get_index_by_read_ids,
     }
 
-    if not ids:
-        return GET_INDICES[idtype](spec, modality)
-    return GET_INDICES_BY_IDS[idtype](spec, modality, ids)
+    attributes = {"seqspec.modality": modality, "seqspec.index.selector": idtype}
+    with span("seqspec_index", **attributes) as s:
+        if not ids:
+            indices = GET_INDICES[idtype](spec, modality)
+        else:
+            indices = GET_INDICES_BY_IDS[idtype](spec, modality, ids)
+        if s is not None:
+            s.set_attribute("seqspec.index.ids", len(ids))
+            s.set_attribute("seqspec.index.coordinates", len(indices))
+    return indices
 
 
 def format_index(
@@ -211,23 +222,22 @@ def format_index(
         )
         return ""
 
-    return FORMAT[fmt](indices, subregion_type)
+    start = time.perf_counter()
+    with phase("format"):
+        result = FORMAT[fmt](indices, subregion_type)
+    record_timings("index_formatters", {fmt: time.perf_counter() - start})
+    return result
 
 
 def run_index(parser: ArgumentParser, args: Namespace) -> None:
     """Run the index command."""
     validate_index_args(parser, args)
 
-    spec = load_spec(args.yaml)
+    session = open_session(args.yaml)
     ids = args.ids.split(",") if args.ids else []
 
-    indices = seqspec_index(
-        spec,
-        args.modality,
-        ids,
-        args.selector,
-        args.rev,
-    )
+    with phase("index"):
+        indices = session.index(args.modality, ids, args.selector, args.rev)
 
     # filter index for no overlap if requested
     if args.overlap:
@@ -235,27 +245,29 @@ def run_index(parser: ArgumentParser, args: Namespace) -> None:
 
     result = format_index(indices, args.tool, args.subregion_type)
 
-    if args.output:
-        with open(args.output, "w") as f:
-            print(result, file=f)
-    else:
-        print(result)
+    with phase("write"):
+        if args.output:
+            with open(args.output, "w") as f:
+                print(result, file=f)
+        else:
+            print(result)
 
 
 def filter_index_no_overlap(indices: List[Coordinate]) -> List[Coordinate]:
     # list of coordinates
     # each coordinate has an rcv, a list of region coordiantes
     # want to ensure that the intersection between all of them is empty
+    # returns new coordinates, the input may be shared (see SeqSpecSession)
     rids = set()
+    filtered = []
     for idx in indices:
         new_rcv = []
         for rgn in idx.rcv:
             if rgn.region_id not in rids:
                 new_rcv.append(rgn)
                 rids.add(rgn.region_id)
-        idx.rcv = new_rcv
-    # print(indices)
-    return indices
+        filtered.append(idx.model_copy(update={"rcv": new_rcv}))
+    return filtered
 
 
 def get_index_by_files(spec: Assay, modality: str) -> List[Coordinate]:
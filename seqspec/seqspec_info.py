@@ -4,7 +4,8 @@ from pathlib import Path
 from typing import Dict
 
 from seqspec.Assay import Assay
-from seqspec.utils import load_spec
+from seqspec.session import open_session
+from seqspec.spec_hash import files_digest, model_digest, region_digests
 
 
 def setup_info_args(parser) -> ArgumentParser:
@@ -19,6 +20,7 @@ seqspec info -k modalities spec.yaml            # Get the list of modalities
 seqspec info -f json spec.yaml                  # Get meta information in json format
 seqspec info -f json -k library_spec spec.yaml  # Get library spec in json format
 seqspec info -f json -k sequence_spec spec.yaml # Get sequence spec in json format
+seqspec info -k hash spec.yaml                  # Get content hashes of the spec and its parts
 ---
 """,
         help="Get information from seqspec file",
@@ -26,7 +28,7 @@ seqspec info -f json -k sequence_spec spec.yaml # Get sequence spec in json form
     )
 
     subparser.add_argument("yaml", help="Sequencing specification yaml file", type=Path)
-    choices = ["modalities", "meta", "sequence_spec", "library_spec"]
+    choices = ["modalities", "meta", "sequence_spec", "library_spec", "hash"]
     subparser.add_argument(
         "-k",
         "--key",
@@ -72,11 +74,11 @@ def run_info(parser: ArgumentParser, args: Namespace) -> None:
     """Run the info command."""
     validate_info_args(parser, args)
 
-    spec = load_spec(args.yaml)
+    session = open_session(args.yaml)
 
     if args.key:
         # Extract data
-        info = seqspec_info(spec, args.key)
+        info = session.info(args.key)
         # Format info
         result = format_info(info, args.key, args.format)
 
@@ -95,7 +97,7 @@ def seqspec_info(spec: Assay, key: str) -> Dict:
 
     Args:
         spec: The Assay object to get info from
-        key: The type of information to retrieve (modalities, meta, sequence_spec, library_spec)
+        key: The type of information to retrieve (modalities, meta, sequence_spec, library_spec, hash)
 
     Returns:
         Dictionary containing the requested information
@@ -108,6 +110,7 @@ def seqspec_info(spec: Assay, key: str) -> Dict:
         "meta": seqspec_info_meta,
         "sequence_spec": seqspec_info_sequence_spec,
         "library_spec": seqspec_info_library_spec,
+        "hash": seqspec_info_hash,
     }
     if key not in INFO_FUNCS:
         raise KeyError(
@@ -121,7 +124,7 @@ def format_info(info: Dict, key: str, fmt: str = "tab") -> str:
 
     Args:
         info: Dictionary containing the information to format
-        key: The type of information to format (modalities, meta, sequence_spec, library_spec)
+        key: The type of information to format (modalities, meta, sequence_spec, library_spec, hash)
         fmt: Output format (tab or json)
 
     Returns:
@@ -135,6 +138,7 @@ def format_info(info: Dict, key: str, fmt: str = "tab") -> str:
         "meta": format_meta,
         "sequence_spec": format_sequence_spec,
         "library_spec": format_library_spec,
+        "hash": format_hash,
     }
     if key not in FORMAT_FUNCS:
         raise KeyError(
@@ -201,6 +205,47 @@ def seqspec_info_modalities(spec: Assay) -> Dict:
     return {"modalities": spec.list_modalities()}
 
 
+def seqspec_info_hash(spec: Assay) -> Dict:
+    """Get the content digests of the spec, its regions, reads and file lists.
+
+    See `seqspec.spec_hash` for how the digests are computed.
+
+    Args:
+        spec: The Assay object to get info from
+
+    Returns:
+        Dictionary containing the digest of the spec, of every region (in
+        depth-first order) by modality, and of every read and its files
+    """
+    library_spec = {}
+    for m in spec.list_modalities():
+        libspec = spec.get_libspec(m)
+        digests = region_digests(libspec)
+        regions = []
+        todo = [libspec]
+        while todo:
+            rgn = todo.pop()
+            regions.append({"region_id": rgn.region_id, "digest": digests[id(rgn)]})
+            todo.extend(reversed(rgn.regions))
+        library_spec[m] = regions
+    sequence_spec = [
+        {
+            "modality": r.modality,
+            "read_id": r.read_id,
+            "digest": model_digest(r),
+            "files_digest": files_digest(r.files),
+        }
+        for r in spec.sequence_spec
+    ]
+    return {
+        "hash": {
+            "spec": model_digest(spec),
+            "library_spec": library_spec,
+            "sequence_spec": sequence_spec,
+        }
+    }
+
+
 def format_meta(info: Dict, fmt: str = "tab") -> str:
     """Format meta information.
 
@@ -286,3 +331,29 @@ def format_library_spec(info: Dict, fmt: str = "tab") -> str:
             indent=4,
         )
     return ""
+
+
+def format_hash(info: Dict, fmt: str = "tab") -> str:
+    """Format content digests.
+
+    Args:
+        info: Dictionary containing digests from seqspec_info_hash
+        fmt: Output format (tab or json)
+
+    Returns:
+        Formatted string, one `kind modality id digest` line per digest in tab
+        format
+    """
+    hashes = info["hash"]
+    if fmt == "tab":
+        lines = [f"spec\t\t\t{hashes['spec']}"]
+        for modality, regions in hashes["library_spec"].items():
+            for r in regions:
+                lines.append(f"region\t{modality}\t{r['region_id']}\t{r['digest']}")
+        for r in hashes["sequence_spec"]:
+            lines.append(f"read\t{r['modality']}\t{r['read_id']}\t{r['digest']}")
+            lines.append(f"files\t{r['modality']}\t{r['read_id']}\t{r['files_digest']}")
+        return "\n".join(lines)
+    elif fmt == "json":
+        return json.dumps(hashes, sort_keys=False, indent=4)
+    return ""
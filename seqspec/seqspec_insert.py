@@ -14,10 +14,9 @@ from typing import List, Optional
 from seqspec.Assay import Assay
 from seqspec.Read import ReadInput
 from seqspec.Region import RegionInput
+from seqspec.roundtrip import load_spec_roundtrip
 from seqspec.utils import (
     load_reads,
-    load_spec,
-    write_pydantic_to_file_or_stdout,
 )
 
 __all__ = ["setup_insert_args", "run_insert"]
@@ -131,7 +130,7 @@ def run_insert(_: ArgumentParser, args: Namespace) -> None:
           to stdout.
     """
     validate_insert_args(args)
-    spec: Assay = load_spec(args.yaml)
+    spec, source = load_spec_roundtrip(args.yaml)
 
     # TODO validate the resource you are loading against the object, i guess this does it already
     resource_data = json.loads(args.resource)
@@ -143,7 +142,7 @@ def run_insert(_: ArgumentParser, args: Namespace) -> None:
         spec = seqspec_insert_reads(spec, args.modality, resource_data, args.after)
 
     spec.update_spec()
-    write_pydantic_to_file_or_stdout(spec, args.output)
+    source.write(spec, args.output)
 
 
 def seqspec_insert_reads(
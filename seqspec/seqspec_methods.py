@@ -9,7 +9,7 @@ from pathlib import Path
 from seqspec.Assay import Assay
 from seqspec.Read import File, Read
 from seqspec.Region import Region
-from seqspec.utils import load_spec
+from seqspec.session import open_session
 
 
 def setup_methods_args(parser) -> ArgumentParser:
@@ -62,7 +62,7 @@ def run_methods(parser: ArgumentParser, args: Namespace) -> None:
     """Run the methods command."""
     validate_methods_args(parser, args)
 
-    spec = load_spec(args.yaml)
+    spec = open_session(args.yaml).spec
     methods_text = methods(spec, args.modality)
 
     if args.output:
@@ -20,6 +20,7 @@ from seqspec.Assay import (
 from seqspec.File import FileInput
 from seqspec.Read import ReadInput
 from seqspec.Region import RegionInput
+from seqspec.roundtrip import load_spec_roundtrip
 from seqspec.utils import (
     load_assays,
     load_files,
@@ -29,8 +30,6 @@ from seqspec.utils import (
     load_regions,
     load_seqkits,
     load_seqprotocols,
-    load_spec,
-    write_pydantic_to_file_or_stdout,
 )
 
 
@@ -50,6 +49,7 @@ seqspec modify -m rna -o mod_spec.yaml -s seqprotocol -k '[{"protocol_id": "Illu
 seqspec modify -m rna -o mod_spec.yaml -s libkit -k '[{"kit_id": "Truseq_kit", "name": "Updated Truseq Kit"}]' spec.yaml
 seqspec modify -m rna -o mod_spec.yaml -s libprotocol -k '[{"protocol_id": "10x_protocol", "name": "Updated 10x Protocol"}]' spec.yaml
 seqspec modify -m rna -o mod_spec.yaml -s assay -k '[{"assay_id": "my_assay", "name": "Updated Assay Name"}]' spec.yaml
+seqspec modify -o mod_spec.yaml --patch edits.json spec.yaml   # Apply many modify/insert edits at once
 ---
 """,
         help="Modify attributes of various elements in seqspec file",
@@ -65,7 +65,14 @@ seqspec modify -m rna -o mod_spec.yaml -s assay -k '[{"assay_id": "my_assay", "n
         metavar="KEYS",
         help="JSON array of objects to modify. Each object must include an id field (read_id, region_id, file_id, kit_id, protocol_id, or assay_id).",
         type=str,
-        required=True,
+        default=None,
+    )
+    subparser.add_argument(
+        "--patch",
+        metavar="PATCH",
+        help="Patch document (path or inline JSON): a list of modify/insert operations applied in one transaction, instead of -m/-s/-k",
+        type=str,
+        default=None,
     )
 
     subparser.add_argument(
@@ -108,7 +115,7 @@ seqspec modify -m rna -o mod_spec.yaml -s assay -k '[{"assay_id": "my_assay", "n
         metavar="MODALITY",
         help="Modality of the assay",
         type=str,
-        required=True,
+        default=None,
     )
 
     return subparser
@@ -123,12 +130,25 @@ def validate_modify_args(parser: ArgumentParser, args: Namespace) -> None:
     if args.output and args.output.exists() and not args.output.is_file():
         parser.error(f"Output path exists but is not a file: {args.output}")
 
+    if args.patch is not None:
+        if args.keys is not None:
+            parser.error("--patch cannot be combined with -k")
+    elif args.keys is None or args.modality is None:
+        parser.error("the following arguments are required: -m/--modality, -k/--keys")
+
 
 def run_modify(parser: ArgumentParser, args: Namespace) -> None:
     """Run the modify command."""
     validate_modify_args(parser, args)
     # todo enable updating id with args.id
-    spec = load_spec(args.yaml)
+    spec, source = load_spec_roundtrip(args.yaml)
+
+    if args.patch is not None:
+        from seqspec.spec_patch import apply_patch, load_patch
+
+        spec = apply_patch(spec, load_patch(args.patch))
+        source.write(spec, args.output)
+        return
 
     # Parse inline JSON string into a list of dicts; sub-functions will load objects
     raw_keys = json.loads(args.keys)
@@ -142,7 +162,7 @@ def run_modify(parser: ArgumentParser, args: Namespace) -> None:
     # Update spec
     spec.update_spec()
 
-    write_pydantic_to_file_or_stdout(spec, args.output)
+    source.write(spec, args.output)
 
 
 class Selector(str, Enum):
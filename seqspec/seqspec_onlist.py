@@ -12,12 +12,9 @@ from seqspec.Assay import Assay
 from seqspec.Read import Read
 from seqspec.Region import Onlist, itx_read, project_regions_to_coordinates
 from seqspec.seqspec_find import find_by_region_id, find_by_region_type
-from seqspec.utils import (
-    load_spec,
-    map_read_id_to_regions,
-    read_local_list,
-    read_remote_list,
-)
+from seqspec.session import open_session
+from seqspec.tracing import span
+from seqspec.utils import map_read_id_to_regions, read_local_list
 
 
 def setup_onlist_args(parser) -> ArgumentParser:
@@ -104,11 +101,11 @@ def run_onlist(parser: ArgumentParser, args: Namespace) -> None:
     """Run the onlist command."""
     validate_onlist_args(parser, args)
 
-    base_path = args.yaml.parent.absolute()
-    spec = load_spec(args.yaml)
+    session = open_session(args.yaml)
+    base_path = session.base_path
 
     # Get onlists based on selector
-    onlists = get_onlists(spec, args.modality, args.selector, args.id)
+    onlists = session.onlists(args.modality, args.selector, args.id)
 
     if not onlists:
         print("No onlists found")
@@ -134,6 +131,19 @@ def run_onlist(parser: ArgumentParser, args: Namespace) -> None:
 
 def get_onlists(spec: Assay, modality: str, selector: str, id: str) -> List[Onlist]:
     """Get onlists based on selector type."""
+    attributes = {
+        "seqspec.modality": modality,
+        "seqspec.onlist.selector": selector,
+        "seqspec.onlist.id": id,
+    }
+    with span("get_onlists", **attributes) as s:
+        onlists = _get_onlists(spec, modality, selector, id)
+        if s is not None:
+            s.set_attribute("seqspec.onlist.count", len(onlists))
+    return onlists
+
+
+def _get_onlists(spec: Assay, modality: str, selector: str, id: str) -> List[Onlist]:
     if selector == "region-type":
         # Prefer ordering by read orientation when possible to ensure
         # consistency with the `read` selector behavior.
@@ -206,6 +216,8 @@ def download_onlists_to_path(
     onlists: List[Onlist], output_path: Path, base_path: Path
 ) -> List[Dict[str, str]]:
     """Download remote onlists and return local paths."""
+    from seqspec.remote import read_remote_list
+
     downloaded_paths = []
 
     for onlist in onlists:
@@ -231,6 +243,8 @@ def join_onlists_and_save(
     onlists: List[Onlist], format_type: str, output_path: Path, base_path: Path
 ) -> str:
     """Download onlists, join them, and save to output path."""
+    from seqspec.remote import read_remote_list
+
     # Download all onlists first
     onlist_contents = []
     for onlist in onlists:
@@ -20,7 +20,8 @@ from seqspec.Region import complement_sequence
 from seqspec.seqspec_index import project_regions_to_coordinates
 from seqspec.seqspec_print_html import print_seqspec_html
 from seqspec.seqspec_print_utils import libseq
-from seqspec.utils import REGION_TYPE_COLORS, load_spec
+from seqspec.session import open_session
+from seqspec.utils import REGION_TYPE_COLORS
 
 
 def setup_print_args(parser) -> ArgumentParser:
@@ -99,7 +100,7 @@ def run_print(parser: ArgumentParser, args: Namespace) -> None:
 
     validate_print_args(parser, args)
 
-    spec = load_spec(args.yaml)
+    spec = open_session(args.yaml).spec
     result = seqspec_print(spec, args.format)
 
     if args.output:
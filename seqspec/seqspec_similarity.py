@@ -0,0 +1,261 @@
+"""Similarity module for seqspec.
+
+This module provides pairwise similarities between many specs, for finding
+near-duplicate assays in a collection. Each spec is tokenized once into the
+feature space of `seqspec convert` (one row per leaf region, see
+`get_feature_names`), and summarized as a profile: for each modality and each
+part of the read structure (the first quarter of the leaf regions, the
+second, ...), the mean of the rows of the regions there. Lengths in the rows
+are log-scaled and positions made relative to the number of regions, so that
+profiles of specs with different numbers of regions compare. Similarities are
+the cosines between profiles, computed in blocks of rows.
+"""
+
+import os
+import sys
+import warnings
+from argparse import ArgumentParser, Namespace, RawTextHelpFormatter
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from seqspec.Assay import Assay
+from seqspec.seqspec_check import find_spec_files
+from seqspec.seqspec_convert import (
+    MODALITIES,
+    MODALITY_INDEX,
+    get_feature_names,
+    seqspec_to_token,
+)
+from seqspec.utils import load_spec
+
+# parts of the read structure of a modality that are profiled separately
+POSITION_BINS = 4
+# region length scaled to 1 in the profiles; longer regions are above 1
+LENGTH_SCALE = 2048
+CHUNK_SIZE = 1024
+
+
+def setup_similarity_args(parser):
+    """Create and configure the similarity command subparser."""
+    subparser = parser.add_parser(
+        "similarity",
+        description="""
+Compute the pairwise similarities of many specs.
+
+Writes a matrix of the cosine similarities of the spec profiles (1 for specs
+with the same read structure) to OUT/similarity.npy, or of the distances
+(1 - similarity) to OUT/distance.npy, and its row labels (spec path and
+assay_id, tab-separated) to OUT/labels.txt. Specs that cannot be loaded or
+tokenized are skipped with a warning.
+
+Examples:
+seqspec similarity -o out specs/                 # All specs in a directory
+seqspec similarity -o out --manifest specs.txt   # The specs listed in a file
+seqspec similarity -o out -j 8 --distance specs/ # Distances, 8 worker processes
+---
+""",
+        help="Compute pairwise similarities between many specs",
+        formatter_class=RawTextHelpFormatter,
+    )
+    subparser.add_argument(
+        "-o",
+        "--output",
+        metavar="OUT",
+        help="Output directory",
+        type=Path,
+        required=True,
+    )
+    subparser.add_argument(
+        "--distance",
+        help="Write distances (1 - similarity) instead of similarities",
+        action="store_true",
+        default=False,
+    )
+    subparser.add_argument(
+        "--manifest",
+        metavar="FILE",
+        help="File listing spec paths, one per line (relative to the file)",
+        type=Path,
+        default=None,
+    )
+    subparser.add_argument(
+        "-j",
+        "--jobs",
+        metavar="N",
+        help="Number of worker processes tokenizing specs (default: CPU count)",
+        type=int,
+        default=None,
+    )
+    subparser.add_argument(
+        "--chunk-size",
+        metavar="N",
+        help=f"Rows of the matrix computed at once (default: {CHUNK_SIZE})",
+        type=int,
+        default=CHUNK_SIZE,
+    )
+    subparser.add_argument(
+        "yaml",
+        help="Sequencing specification yaml file(s) or directories of them",
+        type=Path,
+        nargs="*",
+    )
+    return subparser
+
+
+def validate_similarity_args(parser: ArgumentParser, args: Namespace) -> None:
+    """Validate the similarity command arguments."""
+    if not args.yaml and not args.manifest:
+        parser.error("No spec given: pass yaml files, directories or --manifest")
+    for p in args.yaml:
+        if not Path(p).exists():
+            parser.error(f"Input file does not exist: {p}")
+    if args.manifest and not Path(args.manifest).is_file():
+        parser.error(f"Manifest does not exist: {args.manifest}")
+    if args.jobs is not None and args.jobs < 1:
+        parser.error(f"--jobs must be at least 1: {args.jobs}")
+    if args.chunk_size < 1:
+        parser.error(f"--chunk-size must be at least 1: {args.chunk_size}")
+    if Path(args.output).exists() and not Path(args.output).is_dir():
+        parser.error(f"Output path exists but is not a directory: {args.output}")
+
+
+def run_similarity(parser: ArgumentParser, args: Namespace) -> None:
+    """Run the similarity command."""
+    validate_similarity_args(parser, args)
+
+    specs = find_spec_files(args.yaml, args.manifest)
+    labels, profiles = spec_profiles(specs, args.jobs)
+    if not labels:
+        print("No spec could be tokenized", file=sys.stderr)
+        sys.exit(1)
+
+    out = Path(args.output)
+    out.mkdir(parents=True, exist_ok=True)
+    name = "distance.npy" if args.distance else "similarity.npy"
+    matrix = np.lib.format.open_memmap(
+        out / name, mode="w+", dtype=np.float32, shape=(len(labels), len(labels))
+    )
+    similarity_matrix(profiles, args.chunk_size, args.distance, out=matrix)
+    matrix.flush()
+    del matrix
+    with open(out / "labels.txt", "w") as f:
+        for path, assay_id in labels:
+            f.write(f"{path}\t{assay_id}\n")
+
+
+def spec_profile(spec: Assay) -> np.ndarray:
+    """Return the profile of a spec, see the module documentation.
+
+    Returns:
+        Vector of `len(MODALITIES) * POSITION_BINS * len(get_feature_names())`
+        floats: the mean token of the regions of each modality and position
+        bin. Regions of modalities that are not in the schema are left out.
+    """
+    matrix, rows = seqspec_to_token(spec)
+    n_features = len(get_feature_names())
+    profile = np.zeros((len(MODALITIES) * POSITION_BINS, n_features))
+    if not rows:
+        return profile.ravel()
+
+    tokens = matrix.astype(float)
+    # lengths and positions are the last three columns
+    tokens[:, -3:-1] = np.log1p(tokens[:, -3:-1]) / np.log1p(LENGTH_SCALE)
+    counts = Counter(modality for _, modality, _ in rows)
+    n_regions = np.array([counts[modality] for _, modality, _ in rows])
+    relative = (tokens[:, -1] - 1) / n_regions
+    tokens[:, -1] = relative
+
+    modality = np.array([MODALITY_INDEX.get(m.lower(), -1) for _, m, _ in rows])
+    bins = np.minimum((relative * POSITION_BINS).astype(int), POSITION_BINS - 1)
+    keep = modality >= 0
+    cells = modality[keep] * POSITION_BINS + bins[keep]
+    np.add.at(profile, cells, tokens[keep])
+    filled = np.bincount(cells, minlength=len(profile))
+    profile[filled > 0] /= filled[filled > 0, None]
+    return profile.ravel()
+
+
+def _profile_file(path: str) -> Tuple[str, str, Optional[np.ndarray], str]:
+    # the unit of work of `spec_profiles`
+    try:
+        spec = load_spec(path, strict=False)
+        return path, spec.assay_id, spec_profile(spec), ""
+    except Exception as e:
+        return path, "", None, str(e)
+
+
+def spec_profiles(
+    specs: List[Path], jobs: Optional[int] = None
+) -> Tuple[List[Tuple[str, str]], np.ndarray]:
+    """Load and profile many spec files in a process pool.
+
+    Specs that cannot be loaded or tokenized are skipped with a warning.
+
+    Args:
+        specs: Paths of the spec files
+        jobs: Number of worker processes (default: CPU count)
+
+    Returns:
+        The (path, assay_id) of the profiled specs, in the order given, and
+        their profiles, one per row.
+    """
+    paths = [str(s) for s in specs]
+    jobs = min(jobs or os.cpu_count() or 1, len(paths))
+    if jobs <= 1:
+        results = [_profile_file(p) for p in paths]
+    else:
+        chunksize = max(1, len(paths) // (jobs * 4))
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(_profile_file, paths, chunksize=chunksize))
+
+    labels = []
+    profiles = []
+    for path, assay_id, profile, error in results:
+        if profile is None:
+            warnings.warn(f"Skipping {path}: {error}")
+            continue
+        labels.append((path, assay_id))
+        profiles.append(profile)
+    n_features = len(MODALITIES) * POSITION_BINS * len(get_feature_names())
+    return labels, np.array(profiles).reshape(len(profiles), n_features)
+
+
+def similarity_matrix(
+    profiles: np.ndarray,
+    chunk_size: int = CHUNK_SIZE,
+    distance: bool = False,
+    out: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Return the pairwise cosine similarities (or distances) of profiles.
+
+    The matrix is computed `chunk_size` rows at a time, so that with `out` a
+    memory-mapped array (see `numpy.lib.format.open_memmap`) only the profiles
+    and one block of rows are in memory. Every spec has similarity 1 with
+    itself, also one without regions (whose profile is all zeros).
+
+    Args:
+        profiles: One profile per row, see `spec_profile`
+        chunk_size: Number of rows computed at once
+        distance: Return `1 - similarity` instead
+        out: Array of shape (n, n) to write the matrix to
+
+    Returns:
+        The float32 matrix, `out` if given.
+    """
+    unit = np.asarray(profiles, dtype=np.float32)
+    norms = np.linalg.norm(unit, axis=1, keepdims=True)
+    unit = unit / np.where(norms > 0, norms, 1)
+    n = len(unit)
+    if out is None:
+        out = np.empty((n, n), dtype=np.float32)
+    for start in range(0, n, chunk_size):
+        stop = min(start + chunk_size, n)
+        block = unit[start:stop] @ unit.T
+        np.clip(block, 0, 1, out=block)
+        block[np.arange(stop - start), np.arange(start, stop)] = 1
+        out[start:stop] = 1 - block if distance else block
+    return out
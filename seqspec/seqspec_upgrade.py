@@ -9,7 +9,7 @@ from pathlib import Path
 from seqspec.Assay import Assay
 from seqspec.File import File
 from seqspec.Region import Onlist
-from seqspec.utils import load_spec
+from seqspec.utils import load_spec, write_pydantic_to_file_or_stdout
 
 
 def setup_upgrade_args(parser) -> ArgumentParser:
@@ -22,6 +22,7 @@ Upgrade seqspec file from older versions to the current version.
 Examples:
 seqspec upgrade -o upgraded.yaml spec.yaml  # Upgrade and save to new file
 seqspec upgrade spec.yaml                   # Upgrade and print to stdout
+seqspec upgrade -o upgraded.json spec.yaml  # Upgrade and save as JSON
 ---
 """,
         help="Upgrade seqspec file to current version",
@@ -36,6 +37,13 @@ seqspec upgrade spec.yaml                   # Upgrade and print to stdout
         type=Path,
         default=None,
     )
+    subparser.add_argument(
+        "-f",
+        "--format",
+        choices=["yaml", "json"],
+        help="Output format (default: json if OUT ends in .json or .json.gz, else yaml)",
+        default=None,
+    )
     return subparser
 
 
@@ -56,10 +64,7 @@ def run_upgrade(parser: ArgumentParser, args: Namespace) -> None:
     version = spec.seqspec_version
     upgraded_spec = seqspec_upgrade(spec, version)
 
-    if args.output:
-        args.output.write_text(upgraded_spec.to_YAML())
-    else:
-        print(upgraded_spec.to_YAML())
+    write_pydantic_to_file_or_stdout(upgraded_spec, args.output, args.format)
 
 
 def seqspec_upgrade(spec: Assay, version: str) -> Assay:
@@ -8,7 +8,7 @@ from pathlib import Path
 from typing import Dict
 
 from seqspec.Assay import Assay
-from seqspec.utils import load_spec
+from seqspec.session import open_session
 
 from . import __version__
 
@@ -54,7 +54,7 @@ def run_version(parser: ArgumentParser, args: Namespace) -> None:
     """Run the version command."""
     validate_version_args(parser, args)
 
-    spec = load_spec(args.yaml)
+    spec = open_session(args.yaml).spec
     vinfo = seqspec_version(spec)
     finfo = format_version(vinfo)
 
@@ -0,0 +1,175 @@
+"""Serialize module for seqspec.
+
+This module provides the writers behind `seqspec format`, `split`, `modify`,
+`insert` and friends. YAML is emitted with libyaml's `CSafeDumper` when PyYAML
+was built with it, and the output is the same, byte for byte, as the
+pure-Python `yaml.dump(data, sort_keys=False)` used before: documents the C
+emitter would render differently (strings it writes in double quotes, which
+it wraps differently: non-ASCII or control characters, or a space next to a
+line break; or values that are not plain YAML types) fall back to the Python
+emitter. JSON goes through pydantic's
+`model_dump_json`.
+
+Files are written to a temporary file next to the target and renamed over it,
+so readers never see a partially written spec and a failed write leaves the
+previous file in place. Outputs that are not regular files, such as
+`/dev/stdout` or a named pipe, are written to directly. Paths ending in `.gz` are gzipped; paths ending in
+`.json` or `.json.gz` hold JSON specs (see `spec_format`).
+"""
+
+import gzip
+import io
+import os
+import secrets
+import stat
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Any, Iterator, Optional, Union
+
+import yaml
+from pydantic_core import to_json
+
+try:
+    from yaml import CSafeDumper as FastDumper
+except ImportError:  # PyYAML built without libyaml
+    FastDumper = None
+
+JSON_INDENT = 4
+JSON_SUFFIXES = (".json", ".json.gz")
+
+_PLAIN_TYPES = (str, int, float, bool, type(None))
+# the line width of both emitters
+_WIDTH = 80
+
+
+def spec_format(path: Union[str, Path]) -> str:
+    """Return the format of a spec file from its name: "json" or "yaml"."""
+    return "json" if str(path).lower().endswith(JSON_SUFFIXES) else "yaml"
+
+
+def dump_yaml(data: Any, stream: Optional[IO[str]] = None) -> Optional[str]:
+    """Dump plain data (e.g. a `model_dump()`) as YAML, keeping key order.
+
+    Args:
+        data: Dicts, lists and scalars.
+        stream: Text stream to write to; if None, the YAML is returned.
+
+    Returns:
+        The YAML if `stream` is None.
+    """
+    if FastDumper is not None and fast_dump_safe(data):
+        return yaml.dump(data, stream, Dumper=FastDumper, sort_keys=False)
+    return yaml.dump(data, stream, sort_keys=False)
+
+
+def fast_dump_safe(data: Any) -> bool:
+    """Return whether libyaml renders `data` exactly as the Python emitter does.
+
+    That is the case for dicts, lists and scalars whose strings only contain
+    printable ASCII and newlines, and are not written in double quotes: their
+    newlines are not next to a space, and multi-line strings are values no
+    longer than a line.
+    """
+    todo = [data]
+    while todo:
+        o = todo.pop()
+        if isinstance(o, str):
+            if not (o.isascii() and o.replace("\n", "").isprintable()):
+                return False
+            if "\n" in o and (" \n" in o or "\n " in o or len(o) > _WIDTH):
+                return False
+        elif isinstance(o, dict):
+            if any(isinstance(k, str) and "\n" in k for k in o):
+                return False
+            todo.extend(o.keys())
+            todo.extend(o.values())
+        elif isinstance(o, list):
+            todo.extend(o)
+        elif type(o) not in _PLAIN_TYPES:
+            return False
+    return True
+
+
+def dump_json(resource: Any) -> str:
+    """Dump a model, a list of models or plain data as indented JSON."""
+    if hasattr(resource, "model_dump_json"):
+        return resource.model_dump_json(indent=JSON_INDENT)
+    return to_json(resource, indent=JSON_INDENT).decode()
+
+
+@contextmanager
+def atomic_open(path: Union[str, Path]) -> Iterator[IO[str]]:
+    """Open a temporary file next to `path` for writing; rename it over `path`
+    when the block succeeds, remove it when it fails.
+
+    The file gets the mode of the file it replaces, or the default mode for new
+    files under the current umask. If `path` ends in `.gz`, it is gzipped. A
+    symlink is kept and the file it points to replaced. Paths that are not
+    regular files (`/dev/stdout`, named pipes) are written to directly.
+    """
+    if not _replaceable(path):
+        # appending does not truncate what the shell redirected /dev/stdout to
+        with open(path, "ab") as raw, _text_writer(raw, str(path)) as f:
+            yield f
+        return
+
+    path = Path(os.path.realpath(path))
+    tmp = path.with_name(f".{path.name}.{secrets.token_hex(4)}.tmp")
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+    try:
+        with os.fdopen(fd, "wb") as raw:
+            with _text_writer(raw, path.name) as f:
+                yield f
+            raw.flush()
+            os.fsync(raw.fileno())
+        try:
+            os.chmod(tmp, os.stat(path).st_mode & 0o7777)
+        except FileNotFoundError:
+            pass
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def _replaceable(path: Union[str, Path]) -> bool:
+    # devices, pipes and descriptor links such as /dev/stdout (which may point
+    # to a regular file the shell redirected to) must keep their inode: their
+    # reader or the shell holds it open
+    if os.path.islink(path) and os.path.abspath(path).startswith(("/dev/", "/proc/")):
+        return False
+    try:
+        return stat.S_ISREG(os.stat(path).st_mode)
+    except FileNotFoundError:
+        return True
+
+
+@contextmanager
+def _text_writer(raw: IO[bytes], name: str) -> Iterator[IO[str]]:
+    # text stream over `raw`, gzipped for `.gz` names; `raw` is left open
+    if name.endswith(".gz"):
+        gz = gzip.GzipFile(fileobj=raw, mode="wb", mtime=0)
+        f = io.TextIOWrapper(gz, encoding="utf-8")
+    else:
+        gz = None
+        f = io.TextIOWrapper(raw)
+    yield f
+    f.flush()
+    f.detach()
+    if gz is not None:
+        gz.close()
+
+
+def write_yaml(data: Any, path: Union[str, Path]) -> None:
+    """Write plain data as YAML to `path`, atomically. See `dump_yaml`."""
+    with atomic_open(path) as f:
+        dump_yaml(data, f)
+
+
+def write_json(resource: Any, path: Union[str, Path]) -> None:
+    """Write a model or list of models as JSON to `path`, atomically."""
+    with atomic_open(path) as f:
+        f.write(dump_json(resource))
@@ -0,0 +1,278 @@
+"""Session module for seqspec.
+
+This module provides `SeqSpecSession`, which wraps a loaded spec and memoizes
+what the subcommands derive from it: index coordinates, file maps, onlists,
+resolved onlist locations, loaded (packed) onlists and info tables. Notebooks and
+pipelines that query the same spec many times pay for each artifact once:
+
+    session = SeqSpecSession.load("spec.yaml")
+    session.index("rna", selector="file")
+    session.files("rna", selector="read")
+    session.onlist_array(session.onlists("rna", "region-type", "barcode")[0])
+
+Cached results are shared between calls and must not be modified; copy them
+first. The spec itself is only modified inside `session.mutate()`, which clears
+the caches when the block exits. Cached results are kept within a memory budget
+and evicted least recently used first. Sessions can be queried from several
+threads.
+
+Subcommands get their spec with `open_session`, so that `seqspec batch` can run
+many of them against one loaded spec (see `shared_session`).
+"""
+
+import os
+import sys
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Union,
+)
+
+from seqspec.Assay import Assay
+from seqspec.File import File
+from seqspec.Region import Onlist
+from seqspec.utils import load_spec
+
+# default memory budget of the caches of one session, in bytes
+MAX_BYTES = 256 * 1024 * 1024
+
+
+class SeqSpecSession:
+    """A loaded spec with memoized index, file, onlist and info results."""
+
+    def __init__(
+        self,
+        spec: Assay,
+        base_path: Union[str, Path, None] = None,
+        max_bytes: int = MAX_BYTES,
+    ):
+        """
+        Args:
+            spec: The loaded spec.
+            base_path: Directory local files and onlists are relative to
+                (default: the directory of the spec file, if known, else the
+                current directory).
+            max_bytes: Memory budget of the caches. Results larger than the
+                budget are computed but not kept.
+        """
+        if base_path is None:
+            spec_path = getattr(spec, "_spec_path", None)
+            base_path = Path(spec_path).parent if spec_path else Path.cwd()
+        self.spec = spec
+        # the file the spec was loaded from, see `load`
+        self.spec_fn: Optional[Path] = None
+        self.base_path = Path(base_path).absolute()
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._cache: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._sizes: Dict[Hashable, int] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(
+        cls, spec_fn: Union[str, Path], max_bytes: int = MAX_BYTES
+    ) -> "SeqSpecSession":
+        """Load a spec file into a new session."""
+        session = cls(load_spec(spec_fn), Path(spec_fn).parent, max_bytes)
+        session.spec_fn = Path(spec_fn)
+        return session
+
+    def index(
+        self,
+        modality: str,
+        ids: Sequence[str] = (),
+        selector: str = "read",
+        rev: bool = False,
+    ) -> list:
+        """Return the coordinates of reads, regions or files. See `seqspec_index`."""
+        from seqspec.seqspec_index import seqspec_index
+
+        return self._get(
+            ("index", modality, tuple(ids), selector, rev),
+            lambda: seqspec_index(self.spec, modality, list(ids), selector, rev),
+        )
+
+    def files(
+        self, modality: str, ids: Sequence[str] = (), selector: str = "read"
+    ) -> Dict[str, List[File]]:
+        """Return the files of reads, regions or files. See `seqspec_file`."""
+        from seqspec.seqspec_file import seqspec_file
+
+        return self._get(
+            ("files", modality, tuple(ids), selector),
+            lambda: seqspec_file(self.spec, modality, list(ids), selector),
+        )
+
+    def onlists(self, modality: str, selector: str, id: str) -> List[Onlist]:
+        """Return the onlists of a read, region or region type. See `get_onlists`."""
+        from seqspec.seqspec_onlist import get_onlists
+
+        return self._get(
+            ("onlists", modality, selector, id),
+            lambda: get_onlists(self.spec, modality, selector, id),
+        )
+
+    def onlist_location(self, onlist: Onlist) -> str:
+        """Return the path of a local onlist, resolved against `base_path`, or its url."""
+        if onlist.urltype == "local":
+            return str(self.base_path / Path(onlist.url))
+        return onlist.url
+
+    def onlist_array(self, onlist: Onlist):
+        """Return the contents of an onlist as a `PackedOnlist`.
+
+        Local onlists are memory-mapped from their packed sidecar and reloaded if
+        the file changes; remote onlists are downloaded once per session.
+        """
+        if onlist.urltype == "local":
+            from seqspec.cache import stat_key
+            from seqspec.packed_onlist import load_packed_onlist
+
+            path = self.onlist_location(onlist)
+            try:
+                version = stat_key(os.stat(path))
+            except OSError:
+                version = None
+            return self._get(
+                ("onlist_array", "local", path, version),
+                lambda: load_packed_onlist(path),
+            )
+
+        from seqspec.packed_onlist import PackedOnlist
+        from seqspec.remote import read_remote_list
+
+        return self._get(
+            ("onlist_array", onlist.urltype, onlist.url),
+            lambda: PackedOnlist.from_sequences(read_remote_list(onlist)),
+        )
+
+    def info(self, key: str) -> Dict:
+        """Return information about the spec. See `seqspec_info`."""
+        from seqspec.seqspec_info import seqspec_info
+
+        return self._get(("info", key), lambda: seqspec_info(self.spec, key))
+
+    @contextmanager
+    def mutate(self) -> Iterator[Assay]:
+        """Modify the spec in a block; the caches are cleared when it exits."""
+        try:
+            yield self.spec
+        finally:
+            self.invalidate()
+
+    def reload(self) -> None:
+        """Load the spec again from its file, e.g. after it was rewritten."""
+        if self.spec_fn is None:
+            raise ValueError("Session was not loaded from a file")
+        self.spec = load_spec(self.spec_fn)
+        self.invalidate()
+
+    def invalidate(self) -> None:
+        """Clear all cached results, e.g. after the spec was modified in place."""
+        with self._lock:
+            self._cache.clear()
+            self._sizes.clear()
+            self._bytes = 0
+
+    def cache_info(self) -> Dict[str, int]:
+        """Return the cache hits, misses, number of entries and estimated bytes."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self._cache),
+            "bytes": self._bytes,
+        }
+
+    def _get(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        with self._lock:
+            if key in self._cache:
+                self.hits += 1
+                self._cache.move_to_end(key)
+                return self._cache[key]
+            self.misses += 1
+        # computed outside the lock; concurrent misses of one key may both compute
+        value = compute()
+        size = estimate_bytes(value)
+        if size > self.max_bytes:
+            return value
+        with self._lock:
+            if key in self._cache:
+                return self._cache[key]
+            self._cache[key] = value
+            self._sizes[key] = size
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                old, _ = self._cache.popitem(last=False)
+                self._bytes -= self._sizes.pop(old)
+        return value
+
+
+# sessions shared by the subcommands run by `seqspec batch`, by spec path
+_shared: Dict[str, SeqSpecSession] = {}
+
+
+def open_session(spec_fn: Union[str, Path]) -> SeqSpecSession:
+    """Return the shared session of a spec file, or a new session loading it."""
+    session = _shared.get(str(Path(spec_fn).resolve()))
+    return session if session is not None else SeqSpecSession.load(spec_fn)
+
+
+@contextmanager
+def shared_session(
+    spec_fn: Union[str, Path], max_bytes: int = MAX_BYTES
+) -> Iterator[SeqSpecSession]:
+    """Load a spec once and share it with every `open_session` of it in a block."""
+    key = str(Path(spec_fn).resolve())
+    session = SeqSpecSession.load(spec_fn, max_bytes)
+    previous = _shared.get(key)
+    _shared[key] = session
+    try:
+        yield session
+    finally:
+        if previous is None:
+            del _shared[key]
+        else:
+            _shared[key] = previous
+
+
+def estimate_bytes(obj: Any) -> int:
+    """Estimate the memory held by an object and everything it references.
+
+    Numpy arrays count their data buffer (`nbytes`), so memory-mapped onlists
+    are counted at their full size.
+    """
+    seen = set()
+    total = 0
+    todo = [obj]
+    while todo:
+        o = todo.pop()
+        if id(o) in seen or isinstance(o, type):
+            continue
+        seen.add(id(o))
+        total += sys.getsizeof(o)
+        nbytes = getattr(o, "nbytes", None)
+        if isinstance(nbytes, int):
+            total += nbytes
+            continue
+        if isinstance(o, (str, bytes, int, float, bool)) or o is None:
+            continue
+        if isinstance(o, dict):
+            todo.extend(o.keys())
+            todo.extend(o.values())
+        elif isinstance(o, (list, tuple, set, frozenset)):
+            todo.extend(o)
+        elif hasattr(o, "__dict__"):
+            todo.append(vars(o))
+    return total
@@ -0,0 +1,236 @@
+"""Span exporters module for seqspec.
+
+This module provides OpenTelemetry span exporters: `SummarySpanExporter` logs
+one line per span (used by `seqspec build`) and `JsonlSpanExporter` appends
+spans to a JSON Lines file (used by `seqspec build --trace` and
+`seqspec.tracing`). It imports the OpenTelemetry SDK, so it is only loaded when
+spans are exported.
+"""
+
+import json
+import logging
+from pathlib import Path
+
+from opentelemetry.sdk.trace.export import (
+    SpanExporter,
+    SpanExportResult,
+)
+from opentelemetry.trace import StatusCode
+
+
+class SummarySpanExporter(SpanExporter):
+    """
+    Simple: 1 line per span with key info. No args/outputs.
+    Extended: includes tool args + outputs (truncated).
+    """
+
+    def __init__(self, logger: logging.Logger, mode: str):
+        assert mode in {"simple", "extended"}
+        self.logger = logger
+        self.mode = mode
+
+    def export(self, spans):
+        for s in spans:
+            attrs = dict(getattr(s, "attributes", {}) or {})
+
+            # --- infer kind (LLM/TOOL/AGENT/...) ---
+            # Primary: OpenInference attribute when OTLP transport is used
+            kind = attrs.get("openinference.span.kind")
+            # Fallbacks for robustness
+            if not kind:
+                # Some exporters encode kind directly or via presence of attrs
+                if attrs.get("openinference.tool.name"):
+                    kind = "TOOL"
+                elif attrs.get("openinference.model") or attrs.get("llm.model_name"):
+                    kind = "LLM"
+                elif s.name.lower().startswith("agent"):
+                    kind = "AGENT"
+                else:
+                    kind = "CHAIN"
+
+            # --- outcome from span status ---
+            status = getattr(getattr(s, "status", None), "status_code", None)
+            if status == StatusCode.OK:
+                result = "ok"
+            elif status == StatusCode.ERROR:
+                result = "error"
+            else:
+                result = "unset"
+
+            # Optional extras
+            tool_name = attrs.get("openinference.tool.name")
+            model = attrs.get("openinference.model") or attrs.get("llm.model_name")
+
+            if self.mode == "simple":
+                # Compact, user-centric line
+                # e.g. "[span] seqspec_insert_regions type=TOOL result=ok tool=seqspec_insert_regions"
+                parts = [
+                    f"[span] {s.name}",
+                    f"type={kind}",
+                    f"result={result}",
+                ]
+                if tool_name:
+                    parts.append(f"tool={tool_name}")
+                elif model:
+                    parts.append(f"model={model}")
+                self.logger.info(" ".join(parts))
+                continue  # next span
+
+            # ----- extended mode (existing behavior) -----
+            # keep existing extended fields & truncation
+            ctx = s.get_span_context()
+            dur_ms = (
+                (s.end_time - s.start_time) / 1e6
+                if (s.end_time and s.start_time)
+                else 0.0
+            )
+
+            model = attrs.get("openinference.model", model)  # reuse model if set above
+            usage_in = attrs.get("openinference.usage.input_tokens")
+            usage_out = attrs.get("openinference.usage.output_tokens")
+            usage_reason = attrs.get("openinference.usage.reasoning_tokens")
+
+            base = (
+                f"[span] name={s.name} "
+                f"trace={ctx.trace_id:032x} span={ctx.span_id:016x} "
+                f"dur={dur_ms:.1f}ms"
+            )
+
+            extras = []
+            if model:
+                extras.append(f"model={model}")
+            if tool_name:
+                extras.append(f"tool={tool_name}")
+            if (
+                usage_in is not None
+                or usage_out is not None
+                or usage_reason is not None
+            ):
+                extras.append(
+                    f"tokens(in={usage_in},out={usage_out},reason={usage_reason})"
+                )
+            extras.append(f"type={kind}")
+            extras.append(f"result={result}")
+
+            line = base + (" " + " ".join(extras) if extras else "")
+
+            if self.mode == "extended":
+                targs = attrs.get("openinference.tool.args")
+                tout = attrs.get("openinference.tool.output")
+                if targs is not None:
+                    line += " args=" + _truncate_for_console(targs, 400)
+                if tout is not None:
+                    line += " output=" + _truncate_for_console(tout, 400)
+
+            self.logger.info(line)
+
+        return SpanExportResult.SUCCESS
+
+
+def _truncate_for_console(val, limit: int = 400) -> str:
+    try:
+        s = val if isinstance(val, str) else json.dumps(val, ensure_ascii=False)
+    except Exception:
+        s = str(val)
+    return s if len(s) <= limit else s[:limit] + "…"
+
+
+class JsonlSpanExporter(SpanExporter):
+    """Writes spans as JSON lines for later analysis."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._fh = self.path.open("a", encoding="utf-8")
+
+    def shutdown(self):
+        try:
+            self._fh.close()
+        except Exception:
+            pass
+
+    def export(self, spans):
+        import json
+
+        for s in spans:
+            ctx = s.get_span_context()
+            # parent: may be None; when present it's a SpanContext
+            parent_span_id = None
+            try:
+                if s.parent:
+                    parent_span_id = f"{s.parent.span_id:016x}"
+            except Exception:
+                parent_span_id = None
+
+            # times can be 0 if the span didn't end cleanly
+            start = getattr(s, "start_time", 0) or 0
+            end = getattr(s, "end_time", 0) or 0
+            dur_ms = (end - start) / 1e6 if end and start else 0.0
+
+            # attributes/events/resource: coerce to JSON-safe
+            attrs = _json_safe_dict(getattr(s, "attributes", {}) or {})
+            events = []
+            try:
+                for e in getattr(s, "events", []) or []:
+                    events.append(
+                        {
+                            "name": getattr(e, "name", None),
+                            "attributes": _json_safe_dict(
+                                getattr(e, "attributes", {}) or {}
+                            ),
+                        }
+                    )
+            except Exception:
+                pass
+
+            resource_attrs = {}
+            try:
+                resource_attrs = _json_safe_dict(
+                    getattr(s, "resource", None).attributes
+                )  # <-- FIX
+            except Exception:
+                resource_attrs = {}
+
+            rec = {
+                "trace_id": f"{ctx.trace_id:032x}",
+                "span_id": f"{ctx.span_id:016x}",
+                "parent_span_id": parent_span_id,
+                "name": s.name,
+                "start_time_unix_nano": start,
+                "end_time_unix_nano": end,
+                "duration_ms": dur_ms,
+                "attributes": attrs,
+                "events": events,
+                "resource": resource_attrs,
+            }
+            self._fh.write(json.dumps(rec, ensure_ascii=False) + "\n")
+            self._fh.flush()
+        return SpanExportResult.SUCCESS
+
+
+def _json_safe(obj):
+    # keep it compact + resilient
+    import json
+    from pathlib import Path as _Path
+
+    if obj is None:
+        return None
+    if isinstance(obj, (str, int, float, bool)):
+        return obj
+    if isinstance(obj, (list, tuple)):
+        return [_json_safe(x) for x in obj]
+    if isinstance(obj, dict):
+        return {str(k): _json_safe(v) for k, v in obj.items()}
+    if isinstance(obj, _Path):
+        return str(obj)
+    try:
+        return json.loads(json.dumps(obj))  # best-effort coercion
+    except Exception:
+        return str(obj)
+
+
+def _json_safe_dict(d):
+    try:
+        return {str(k): _json_safe(v) for k, v in dict(d).items()}
+    except Exception:
+        # last resort
+        return {}
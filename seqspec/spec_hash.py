@@ -0,0 +1,188 @@
+"""Spec hash module for seqspec.
+
+This module provides content digests of specs and their parts. Model digests
+are Merkle hashes: a region's digest covers its own fields and the digests of
+its subregions (a read's covers the digests of its files, a spec's those of
+its reads and regions), so an edit changes the digests of the edited node and
+its ancestors only, and unchanged subtrees can be recognized across runs.
+
+Digests are computed from the validated models, so an omitted field and a
+field set to its default hash the same. Fields are taken in sorted order,
+enums by value, and fields that are None are left out. The digest of a model
+includes its class name: a `File` and an `Onlist` with the same fields differ.
+
+The spec models (`Assay`, `Region`, `Read`, `File`, `Onlist` and the kits and
+protocols) keep their digest in a slot, see `DigestCache`. Assigning a field
+clears it; lists changed in place and edited children are detected by
+comparing the child digests the cached value was computed from.
+
+Compact specs (see `seqspec.compact`) are hashed as the models they stand for,
+so a compact spec and its model have the same digests.
+"""
+
+import hashlib
+import json
+from enum import Enum
+from typing import Any, Dict, List, Tuple, get_args, get_origin
+
+from pydantic import BaseModel
+
+DIGEST_SIZE = 16
+
+
+class DigestCache:
+    """Mixin of the spec models that caches their digest on the instance.
+
+    Models using it declare `__slots__ = ("_digest_cache",)`: the slot is not a
+    field or private attribute, so it is not dumped, compared, copied or
+    pickled.
+    """
+
+    __slots__ = ()
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        object.__setattr__(self, "_digest_cache", None)
+        super().__setattr__(name, value)
+
+    def digest(self) -> str:
+        """Return the content digest of this model, see `model_digest`."""
+        return model_digest(self)  # type: ignore[arg-type]
+
+
+_ENCODER = json.JSONEncoder(sort_keys=True, separators=(",", ":"), default=str)
+
+
+def digest(data: Any) -> str:
+    """Return the hex digest of JSON-serializable data."""
+    blob = _ENCODER.encode(data)
+    return hashlib.blake2b(blob.encode(), digest_size=DIGEST_SIZE).hexdigest()
+
+
+def model_digest(model: BaseModel) -> str:
+    """Return the Merkle digest of a model, e.g. of an `Assay` or a `Region`.
+
+    The digest is cached on models with a `DigestCache`, and recomputed when a
+    field was assigned or a nested list or model changed since.
+    """
+    return _digest(model, {})
+
+
+def _digest(model: BaseModel, seen: Dict[int, str]) -> str:
+    # `seen` holds the digests already computed in this traversal, so that
+    # every node is visited once
+    d = seen.get(id(model))
+    if d is not None:
+        return d
+    cls = _model_class(model)
+    fields, nested = _fields(cls)
+    parts = []
+    for name in nested:
+        value = getattr(model, name)
+        if isinstance(value, (list, tuple)) or _model_class(value) is not None:
+            parts.append((name, _canonical(value, seen)))
+    key = tuple(parts)
+    cached = None
+    if isinstance(model, DigestCache):
+        try:
+            cached = model._digest_cache  # type: ignore[attr-defined]
+        except AttributeError:
+            pass
+    if cached is not None and cached[1] == key:
+        d = cached[0]
+    else:
+        data = dict(parts)
+        for name in fields:
+            if name in data:
+                continue
+            value = getattr(model, name)
+            if type(value) in _PLAIN:
+                data[name] = value
+            elif value is not None:
+                data[name] = _canonical(value, seen)
+        d = digest([cls.__name__, data])
+        if isinstance(model, DigestCache):
+            object.__setattr__(model, "_digest_cache", (d, key))
+    seen[id(model)] = d
+    return d
+
+
+def files_digest(files: List[BaseModel]) -> str:
+    """Return the digest of a list of files, from the digests of the files."""
+    seen: Dict[int, str] = {}
+    return digest(["files", [_digest(f, seen) for f in files]])
+
+
+def model_digests(model: BaseModel) -> Dict[int, str]:
+    """Return the digest of a model and of every model nested in it.
+
+    Returns:
+        Dictionary mapping `id(m)` to the digest of `m`, for the model and all
+        the regions, reads, files, onlists, etc. it contains.
+    """
+    seen: Dict[int, str] = {}
+    _digest(model, seen)
+    return seen
+
+
+def region_digests(region: BaseModel) -> Dict[int, str]:
+    """Return the Merkle digest of every region in a tree.
+
+    Returns:
+        Dictionary mapping `id(region)` to its digest, for the region and all of
+        its descendants.
+    """
+    seen = model_digests(region)
+    digests: Dict[int, str] = {}
+    todo = [region]
+    while todo:
+        rgn = todo.pop()
+        digests[id(rgn)] = seen[id(rgn)]
+        todo.extend(rgn.regions)  # type: ignore[attr-defined]
+    return digests
+
+
+_FIELDS: Dict[type, Tuple[Tuple[str, ...], Tuple[str, ...]]] = {}
+_PLAIN = {str, int, float, bool}
+
+
+def _fields(cls: type) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    # the sorted field names, and those that can hold lists or models
+    fields = _FIELDS.get(cls)
+    if fields is None:
+        names = tuple(sorted(cls.model_fields))  # type: ignore[attr-defined]
+        nested = tuple(
+            n
+            for n in names
+            if _may_nest(cls.model_fields[n].annotation)  # type: ignore[attr-defined]
+        )
+        fields = _FIELDS[cls] = (names, nested)
+    return fields
+
+
+def _model_class(value: Any) -> Any:
+    # the pydantic class of a model or of a compact one, None for other values
+    if isinstance(value, BaseModel):
+        return type(value)
+    model = getattr(type(value), "_model", None)
+    return model if isinstance(model, type) and issubclass(model, BaseModel) else None
+
+
+def _may_nest(annotation: Any) -> bool:
+    if annotation is list or get_origin(annotation) is list:
+        return True
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return True
+    return any(_may_nest(a) for a in get_args(annotation))
+
+
+def _canonical(value: Any, seen: Dict[int, str]) -> Any:
+    # a JSON-serializable, hashable form of a field value
+    if type(value) in _PLAIN:
+        return value
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (list, tuple)):
+        return tuple(_canonical(v, seen) for v in value)
+    if _model_class(value) is not None:
+        return _digest(value, seen)
+    return value
@@ -0,0 +1,165 @@
+"""Spec patch module for seqspec.
+
+This module provides patch documents: lists of edits to a spec expressed with
+the selectors of `seqspec modify` and `seqspec insert`, applied in one
+transaction. Each operation is
+
+    {"op": "modify", "selector": "region", "modality": "rna",
+     "objects": [{"region_id": "rna_cell_bc", "name": "Cell barcode"}]}
+    {"op": "insert", "selector": "read", "modality": "rna", "after": "rna_R1",
+     "objects": [{"read_id": "rna_I1", "primer_id": "rna_truseq_read1", ...}]}
+
+where `objects` are the `-k` objects of `seqspec modify` (selectors read,
+region, file, seqkit, seqprotocol, libkit, libprotocol, assay) or the `-r`
+resources of `seqspec insert` (selectors read, region).
+
+`apply_patch` edits a copy of the spec, updates the derived attributes of the
+modified libraries once, validates the result once and only then returns it, so
+an error in any operation leaves the spec unchanged. Unlike `seqspec modify`,
+objects whose id does not exist are an error rather than skipped.
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Literal, Optional, Set, Union
+
+import yaml
+from pydantic import BaseModel, ValidationError
+
+from seqspec.Assay import Assay
+from seqspec.seqspec_insert import seqspec_insert_reads
+from seqspec.seqspec_modify import Selector, seqspec_modify
+from seqspec.utils import load_reads, load_regions
+
+# field identifying the objects of each modify selector
+ID_FIELDS = {
+    Selector.READ: "read_id",
+    Selector.REGION: "region_id",
+    Selector.FILE: "file_id",
+    Selector.SEQKIT: "kit_id",
+    Selector.SEQPROTOCOL: "protocol_id",
+    Selector.LIBKIT: "kit_id",
+    Selector.LIBPROTOCOL: "protocol_id",
+    Selector.ASSAY: "assay_id",
+}
+INSERT_SELECTORS = {"read", "region"}
+
+
+class PatchOperation(BaseModel):
+    op: Literal["modify", "insert"]
+    selector: str
+    modality: str
+    objects: List[Dict[str, Any]]
+    after: Optional[str] = None
+
+
+def load_patch(
+    source: Union[str, Path, List[Dict[str, Any]]],
+) -> List[PatchOperation]:
+    """Load a patch document.
+
+    Args:
+        source: A list of operation dicts, a path to a YAML/JSON file with that
+            list, or the list as an inline JSON string.
+
+    Returns:
+        The operations, in order.
+    """
+    if isinstance(source, (str, Path)):
+        if Path(source).is_file():
+            with open(source) as f:
+                source = yaml.safe_load(f)
+        else:
+            source = json.loads(str(source))
+    if not isinstance(source, list):
+        raise ValueError("A patch must be a list of operations")
+    return [PatchOperation(**op) for op in source]
+
+
+def apply_patch(spec: Assay, operations: List[PatchOperation]) -> Assay:
+    """Apply patch operations to a spec in one transaction.
+
+    Args:
+        spec: The spec to patch. It is not modified.
+        operations: Operations applied in order, see `load_patch`.
+
+    Returns:
+        A patched copy of the spec.
+
+    Raises:
+        ValueError: If an operation is invalid or refers to an id that does not
+            exist, or if the patched spec does not validate. Nothing is applied.
+    """
+    patched = spec.model_copy(deep=True)
+    # libraries whose derived attributes (sequence, lengths) need an update
+    stale: Set[str] = set()
+    for idx, operation in enumerate(operations):
+        try:
+            patched = _apply_operation(patched, operation)
+        except (ValueError, KeyError, IndexError, ValidationError) as e:
+            raise ValueError(
+                f"Patch operation {idx} ({operation.op} {operation.selector}) failed: {e}"
+            ) from e
+        if operation.selector == "region":
+            stale.add(operation.modality)
+
+    for modality in stale:
+        patched.get_libspec(modality).update_attr()
+    try:
+        Assay.model_validate(patched.model_dump())
+    except ValidationError as e:
+        raise ValueError(f"Patched spec is invalid: {e}") from e
+    return patched
+
+
+def _apply_operation(spec: Assay, operation: PatchOperation) -> Assay:
+    if operation.op == "insert":
+        if operation.selector not in INSERT_SELECTORS:
+            raise ValueError(f"Cannot insert with selector '{operation.selector}'")
+        if operation.selector == "read":
+            reads = load_reads(operation.objects)
+            return seqspec_insert_reads(
+                spec, operation.modality, reads, operation.after
+            )
+        regions = load_regions(operation.objects)
+        spec.insert_regions(
+            [r.to_region() for r in regions],
+            operation.modality,
+            operation.after,
+            update=False,
+        )
+        return spec
+
+    selector = Selector(operation.selector)
+    id_field = ID_FIELDS[selector]
+    ids = [obj.get(id_field) for obj in operation.objects]
+    missing = _missing_ids(spec, operation.modality, selector, ids)
+    if missing:
+        raise ValueError(f"No {selector.value} with {id_field} {missing}")
+    return seqspec_modify(spec, operation.modality, operation.objects, selector)
+
+
+def _missing_ids(
+    spec: Assay, modality: str, selector: Selector, ids: List[Any]
+) -> List[Any]:
+    if selector == Selector.REGION:
+        libspec = spec.get_libspec(modality)
+        return [i for i in ids if not libspec.get_region_by_id(i)]
+    if selector == Selector.READ:
+        existing = {r.read_id for r in spec.get_seqspec(modality)}
+    elif selector == Selector.FILE:
+        existing = {f.file_id for r in spec.get_seqspec(modality) for f in r.files}
+    elif selector == Selector.ASSAY:
+        existing = {spec.assay_id}
+    else:
+        items = {
+            Selector.SEQKIT: spec.sequence_kit,
+            Selector.SEQPROTOCOL: spec.sequence_protocol,
+            Selector.LIBKIT: spec.library_kit,
+            Selector.LIBPROTOCOL: spec.library_protocol,
+        }[selector]
+        field = ID_FIELDS[selector]
+        existing = (
+            {getattr(i, field) for i in items} if isinstance(items, list) else set()
+        )
+    return [i for i in ids if i not in existing]
@@ -0,0 +1,118 @@
+"""Tracing module for seqspec.
+
+This module provides OpenTelemetry spans for seqspec subcommands and core
+functions (`load_spec`, `seqspec_check`, `seqspec_index`, `get_onlists`,
+`read_remote_list`, remote probes), with attributes such as spec size, region
+count, bytes downloaded and cache hits.
+
+Tracing is off unless enabled with `seqspec --trace FILE`, the `SEQSPEC_TRACE`
+environment variable or `enable_tracing`. When off, `span` returns a shared
+no-op context and OpenTelemetry is not imported, so instrumented code costs a
+global lookup. `SEQSPEC_TRACE` is either a path, to write spans as JSON Lines
+(see `span_exporters.JsonlSpanExporter`), or `otel`, to emit spans through the globally
+configured tracer provider so they nest in the caller's traces:
+
+    with span("my_step", **{"seqspec.modality": "rna"}) as s:
+        ...
+        if s is not None:
+            s.set_attribute("seqspec.count", n)
+"""
+
+import atexit
+import os
+from contextlib import nullcontext
+from typing import TYPE_CHECKING, Any, ContextManager, Optional, Union
+
+if TYPE_CHECKING:
+    from seqspec.Assay import Assay
+    from seqspec.Region import Region
+
+TRACE_ENV = "SEQSPEC_TRACE"
+# SEQSPEC_TRACE value selecting the global tracer provider
+GLOBAL_PROVIDER = "otel"
+
+_NOOP = nullcontext()
+_tracer = None
+_provider = None
+
+
+def enable_tracing(path: Union[str, os.PathLike, None] = None):
+    """Start emitting spans.
+
+    Args:
+        path: File to append spans to as JSON Lines. If None, spans go to the
+            global OpenTelemetry tracer provider configured by the application.
+
+    Returns:
+        The tracer used for seqspec spans.
+    """
+    global _tracer, _provider
+    from opentelemetry import trace
+
+    disable_tracing()
+    if path is None:
+        _tracer = trace.get_tracer("seqspec")
+        return _tracer
+
+    from opentelemetry.sdk import trace as trace_sdk
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+
+    from seqspec.span_exporters import JsonlSpanExporter
+
+    _provider = trace_sdk.TracerProvider()
+    _provider.add_span_processor(SimpleSpanProcessor(JsonlSpanExporter(path)))
+    _tracer = _provider.get_tracer("seqspec")
+    return _tracer
+
+
+def disable_tracing() -> None:
+    """Stop emitting spans and close the span file, if any."""
+    global _tracer, _provider
+    if _provider is not None:
+        _provider.shutdown()
+    _tracer = _provider = None
+
+
+def tracing_enabled() -> bool:
+    return _tracer is not None
+
+
+def span(name: str, **attributes: Any) -> ContextManager[Optional[Any]]:
+    """Return a context manager for a span, yielding it (or None when tracing is off)."""
+    if _tracer is None:
+        return _NOOP
+    return _tracer.start_as_current_span(name, attributes=attributes)
+
+
+def region_count(spec: "Assay") -> int:
+    """Return the number of regions in a spec, at all levels."""
+
+    def count(rgn: "Region") -> int:
+        return 1 + sum(count(r) for r in rgn.regions)
+
+    return sum(count(r) for r in spec.library_spec)
+
+
+def set_spec_attributes(s, spec: "Assay", spec_fn=None) -> None:
+    """Set the size attributes of a loaded spec on a span (None when tracing is off)."""
+    if s is None:
+        return
+    if spec_fn is not None:
+        s.set_attribute("seqspec.spec.path", str(spec_fn))
+        try:
+            s.set_attribute("seqspec.spec.bytes", os.path.getsize(spec_fn))
+        except OSError:
+            pass
+    s.set_attribute("seqspec.spec.modalities", len(spec.modalities))
+    s.set_attribute("seqspec.spec.regions", region_count(spec))
+    s.set_attribute("seqspec.spec.reads", len(spec.sequence_spec))
+
+
+def _init_from_env() -> None:
+    value = os.environ.get(TRACE_ENV)
+    if value:
+        enable_tracing(None if value == GLOBAL_PROVIDER else value)
+
+
+_init_from_env()
+atexit.register(disable_tracing)
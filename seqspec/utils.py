@@ -1,22 +1,12 @@
 import gzip
-import io
 import json
-import logging
 import os
 import re
+from importlib import import_module
 from pathlib import Path
 from typing import IO, Any, Dict, List, Optional, Tuple, Union
 
-import requests
 import yaml
-from Bio import GenBank
-from opentelemetry.sdk.trace.export import (
-    SpanExporter,
-    SpanExportResult,
-)
-
-# at top of file with other imports
-from opentelemetry.trace import StatusCode
 from pydantic import ValidationError
 
 from seqspec.Assay import (
@@ -28,8 +18,35 @@ from seqspec.Assay import (
     SeqProtocolInput,
 )
 from seqspec.File import File, FileInput
+from seqspec.fragments import share_aliases
+from seqspec.profiling import phase
 from seqspec.Read import Read, ReadInput
 from seqspec.Region import Onlist, Region, RegionInput
+from seqspec.serialize import (
+    dump_json,
+    dump_yaml,
+    spec_format,
+    write_json,
+    write_yaml,
+)
+from seqspec.tracing import set_spec_attributes, span
+
+# helpers that moved to modules with heavy dependencies (requests, Biopython,
+# OpenTelemetry), re-exported here and imported on first use
+_MOVED = {
+    "read_remote_list": "seqspec.remote",
+    "load_genbank": "seqspec.genbank",
+    "load_genbank_stream": "seqspec.genbank",
+    "SummarySpanExporter": "seqspec.span_exporters",
+    "JsonlSpanExporter": "seqspec.span_exporters",
+}
+
+
+def __getattr__(name: str):
+    if name in _MOVED:
+        return getattr(import_module(_MOVED[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 # --- Known tags to strip from the YAML ---
 KNOWN_TAGS = [
@@ -104,65 +121,131 @@ def format_pydantic_validation_object(error_path: str) -> str:
     return result
 
 
+def load_spec_dict(spec_fn: Union[str, Path]) -> dict:
+    """
+    Loads a YAML or gzipped YAML spec file and strips tags, returning the raw dict.
+    JSON specs (`.json`, `.json.gz`) are parsed with `json.loads`.
+    """
+    if spec_format(spec_fn) == "json":
+        with phase("parse"):
+            return json.loads(read_spec_bytes(spec_fn))
+
+    # Check if the file is gzip by reading the magic number
+    with open(spec_fn, "rb") as f:
+        magic = f.read(2)
+
+    with phase("parse"):
+        if magic == b"\x1f\x8b":
+            with gzip.open(spec_fn, "rt") as stream:
+                return safe_load_strip_tags(stream)
+        else:
+            with open(spec_fn, "r") as stream:
+                return safe_load_strip_tags(stream)
+
+
 def load_spec(spec_fn: Union[str, Path], strict=True) -> Assay:
     """
     Loads a YAML or gzipped YAML spec file, strips tags, and constructs an Assay object.
+    JSON specs (`.json`, `.json.gz`) are loaded with `load_spec_json`.
     If strict=True and validation fails, prints all errors and raises an exception.
     """
-    # Check if the file is gzip by reading the magic number
+    with span("load_spec") as s:
+        if spec_format(spec_fn) == "json":
+            spec = load_spec_json(spec_fn, strict)
+        else:
+            spec = load_spec_from_dict(load_spec_dict(spec_fn), spec_fn, strict)
+        set_spec_attributes(s, spec, spec_fn)
+        return spec
+
+
+def load_spec_json(spec_fn: Union[str, Path], strict=True) -> Assay:
+    """
+    Loads a JSON or gzipped JSON spec file. The JSON is parsed and validated in
+    one pass by pydantic (`model_validate_json`); there are no tags to strip.
+    """
+    with phase("parse"):
+        raw = read_spec_bytes(spec_fn)
+    with phase("validate"):
+        try:
+            if strict:
+                assay = Assay.model_validate_json(raw)
+            else:
+                from seqspec.Assay import AssayInput
+
+                assay = AssayInput.model_validate_json(raw).to_assay()
+        except ValidationError as e:
+            if not strict:
+                raise
+            _report_validation_error(e)
+    _set_spec_path(assay, spec_fn)
+    return assay
+
+
+def read_spec_bytes(spec_fn: Union[str, Path]) -> bytes:
+    """Reads a spec file, gunzipping it if it is gzipped."""
     with open(spec_fn, "rb") as f:
-        magic = f.read(2)
+        raw = f.read()
+    if raw[:2] == b"\x1f\x8b":
+        raw = gzip.decompress(raw)
+    return raw
 
-    if magic == b"\x1f\x8b":
-        with gzip.open(spec_fn, "rt") as stream:
-            data_dict = safe_load_strip_tags(stream)
-    else:
-        with open(spec_fn, "r") as stream:
-            data_dict = safe_load_strip_tags(stream)
 
+def load_spec_from_dict(
+    data_dict: dict, spec_fn: Union[str, Path, None] = None, strict=True
+) -> Assay:
+    """
+    Constructs an Assay object from a raw spec dict (see `load_spec_dict`).
+    `spec_fn`, if given, is recorded so local files resolve relative to the spec.
+    """
+    with phase("validate"):
+        return _spec_from_dict(data_dict, spec_fn, strict)
+
+
+def _spec_from_dict(data_dict: dict, spec_fn, strict: bool) -> Assay:
     if strict:
         try:
-            assay = Assay(**data_dict)
-            # record the absolute path of the spec on the created object
-            try:
-                assay._spec_path = str(Path(spec_fn).resolve())
-            except Exception:
-                assay._spec_path = None
-            return assay
+            assay = Assay(**share_aliases(data_dict))
         except ValidationError as e:
-            verrors = e.errors()
-            errors = []
-            for idx, err in enumerate(verrors, 1):
-                # err['loc'] is a tuple of the error path, join with dots for readability
-                err_path = ".".join(str(x) for x in err.get("loc", []))
-                err_type = err.get("type", "unknown")
-                err_msg = err.get("msg", "")
-                # Compose a descriptive error message
-                errors.append(
-                    {
-                        "error_type": err_type,
-                        "error_message": err_msg,
-                        "error_object": format_pydantic_validation_object(err_path),
-                        "full_error": err,
-                    }
-                )
-
-            for idx, error in enumerate(errors, 1):
-                print(
-                    f"[error {idx}] {error['error_message']} in {error['error_object']}"
-                )
-            raise ValueError(
-                "Invalid spec. Correct errors then verify spec with `seqspec format` and `seqspec check`."
-            )
+            _report_validation_error(e)
     else:
         from seqspec.Assay import AssayInput
 
         assay = AssayInput(**data_dict).to_assay()
-        try:
-            assay._spec_path = str(Path(spec_fn).resolve())
-        except Exception:
-            assay._spec_path = None
-        return assay
+    _set_spec_path(assay, spec_fn)
+    return assay
+
+
+def _set_spec_path(assay: Assay, spec_fn) -> None:
+    # record the absolute path of the spec on the created object
+    try:
+        assay._spec_path = str(Path(spec_fn).resolve()) if spec_fn else None
+    except Exception:
+        assay._spec_path = None
+
+
+def _report_validation_error(e: ValidationError) -> None:
+    verrors = e.errors()
+    errors = []
+    for idx, err in enumerate(verrors, 1):
+        # err['loc'] is a tuple of the error path, join with dots for readability
+        err_path = ".".join(str(x) for x in err.get("loc", []))
+        err_type = err.get("type", "unknown")
+        err_msg = err.get("msg", "")
+        # Compose a descriptive error message
+        errors.append(
+            {
+                "error_type": err_type,
+                "error_message": err_msg,
+                "error_object": format_pydantic_validation_object(err_path),
+                "full_error": err,
+            }
+        )
+
+    for idx, error in enumerate(errors, 1):
+        print(f"[error {idx}] {error['error_message']} in {error['error_object']}")
+    raise ValueError(
+        "Invalid spec. Correct errors then verify spec with `seqspec format` and `seqspec check`."
+    )
 
 
 def load_regions(
@@ -453,16 +536,6 @@ def yaml_safe_dump(obj):
         return obj
 
 
-def load_genbank(gbk_fn: str):
-    with open(gbk_fn, "r") as stream:
-        return load_genbank_stream(stream)
-
-
-def load_genbank_stream(gbk_stream: io.IOBase):
-    data: GenBank = GenBank.read(gbk_stream)  # type: ignore
-    return data
-
-
 def write_read(header, seq, qual, f):
     f.write(f"{header}\n{seq}\n+\n{qual}\n")
 
@@ -472,16 +545,32 @@ def write_pydantic_to_file_or_stdout(
         Read, File, Region, Assay, List[Read], List[File], List[Region], Assay
     ],
     output: Optional[Path],
+    fmt: Optional[str] = None,
 ) -> None:
-    """Write spec to file or stdout."""
-    dump = yaml_safe_dump(resource)
+    """Write spec to file or stdout.
 
-    # Handle output
+    Files are replaced atomically, see `seqspec.serialize`.
+
+    Args:
+        resource: Model or list of models to write.
+        output: Path to write to, or None for stdout.
+        fmt: "yaml" or "json"; by default, JSON if `output` ends in `.json`
+            or `.json.gz` and YAML otherwise.
+    """
+    if fmt is None:
+        fmt = spec_format(output) if output else "yaml"
+    if fmt == "json":
+        if output:
+            write_json(resource, output)
+        else:
+            print(dump_json(resource))
+        return
+
+    dump = yaml_safe_dump(resource)
     if output:
-        with open(output, "w") as f:
-            yaml.dump(dump, f, sort_keys=False)
+        write_yaml(dump, output)
     else:
-        print(yaml.dump(dump, sort_keys=False))
+        print(dump_yaml(dump))
 
 
 def yield_onlist_contents(stream):
@@ -489,61 +578,31 @@ def yield_onlist_contents(stream):
         yield line.strip().split()[0]
 
 
-def read_local_list(onlist: Onlist, base_path: str = "") -> List[str]:
-    filename = os.path.join(base_path, onlist.filename)
-    stream = open(filename, "rb")
-    # do we need to decompress?
-    if filename.endswith(".gz"):
-        stream = gzip.GzipFile(fileobj=stream)
+def iter_local_list(filename: Union[str, Path]):
+    """Yield the entries of a local, optionally gzipped, onlist file."""
+    if str(filename).endswith(".gz"):
+        stream = gzip.open(filename, "rt")
+    else:
+        stream = open(filename, "r")
+    with stream:
+        yield from yield_onlist_contents(stream)
 
-    # convert to text stream
-    stream = io.TextIOWrapper(stream)
 
-    results = []
-    for i in yield_onlist_contents(stream):
-        results.append(i)
-    stream.close()
-    return results
+def read_local_packed_list(onlist: Onlist, base_path: str = ""):
+    """Read a local onlist in its 2-bit packed, memory-mapped form.
 
+    The packed sidecar is written next to the onlist on first read and reused
+    while the onlist is unchanged. See `seqspec.packed_onlist`.
+    """
+    from seqspec.packed_onlist import load_packed_onlist
 
-def read_remote_list(onlist: Onlist, base_path: str = "") -> List[str]:
-    """Given an onlist object read the local or remote data"""
-    filename = str(onlist.filename)
-    if onlist.url:
-        filename = str(onlist.url)
+    filename = os.path.join(base_path, onlist.filename)
+    return load_packed_onlist(filename)
 
-    stream = None
-    try:
-        # open stream
-        auth = get_remote_auth_token()
-        response = requests.get(filename, stream=True, auth=auth)
-        response.raise_for_status()
-        # Read into an in-memory bytes buffer to satisfy type expectations
-        content_buffer = io.BytesIO(response.content)
-
-        # do we need to decompress?
-        if filename.endswith(".gz"):
-            # Read decompressed bytes into a new BytesIO to present IO[bytes]
-            with gzip.GzipFile(fileobj=content_buffer) as gz:
-                decompressed = gz.read()
-            binary_stream = io.BytesIO(decompressed)
-        else:
-            binary_stream = content_buffer
-
-        # convert to text stream
-        stream = io.TextIOWrapper(binary_stream)
-
-        results = []
-        for i in yield_onlist_contents(stream):
-            # add the new line when writing to file
-            results.append(i)
-    finally:
-        if stream is None:
-            print("Warning: unable to open barcode file {}".format(filename))
-        else:
-            stream.close()
 
-    return results
+def read_local_list(onlist: Onlist, base_path: str = "") -> List[str]:
+    """Read a local onlist as a list of strings, in file order."""
+    return read_local_packed_list(onlist, base_path).to_list()
 
 
 def get_remote_auth_token():
@@ -568,23 +627,10 @@ def region_ids_in_spec(seqspec, modality, region_ids):
 
 
 def file_exists(uri):
-    try:
-        if uri.startswith("https://api.data.igvf.org"):
-            auth = get_remote_auth_token()
-            if auth is None:
-                print("Warning: IGVF_API_KEY and IGVF_SECRET_KEY not set")
-            r = requests.head(uri, auth=auth)
-            if r.status_code == 307:
-                # igvf download link will redirect to a presigned amazon s3 url, HEAD request will not work.
-                r = requests.get(r.headers["Location"], headers={"Range": "bytes=0-0"})
-                return r.status_code == 206
-            return r.status_code == 200
-        r = requests.head(uri)
-        if r.status_code == 302:
-            return file_exists(r.headers["Location"])
-        return r.status_code == 200
-    except requests.ConnectionError:
-        return False
+    """Check that a remote file exists. See `seqspec.remote.remote_file_exists`."""
+    from seqspec.remote import remote_file_exists
+
+    return remote_file_exists(uri)
 
 
 REGION_TYPE_COLORS = {
@@ -651,224 +697,3 @@ def map_read_id_to_regions(
         rgns = leaves[primer_idx + 1 :]
 
     return (read, rgns)
-
-
-### LLM Utils
-
-
-class SummarySpanExporter(SpanExporter):
-    """
-    Simple: 1 line per span with key info. No args/outputs.
-    Extended: includes tool args + outputs (truncated).
-    """
-
-    def __init__(self, logger: logging.Logger, mode: str):
-        assert mode in {"simple", "extended"}
-        self.logger = logger
-        self.mode = mode
-
-    def export(self, spans):
-        for s in spans:
-            attrs = dict(getattr(s, "attributes", {}) or {})
-
-            # --- infer kind (LLM/TOOL/AGENT/...) ---
-            # Primary: OpenInference attribute when OTLP transport is used
-            kind = attrs.get("openinference.span.kind")
-            # Fallbacks for robustness
-            if not kind:
-                # Some exporters encode kind directly or via presence of attrs
-                if attrs.get("openinference.tool.name"):
-                    kind = "TOOL"
-                elif attrs.get("openinference.model") or attrs.get("llm.model_name"):
-                    kind = "LLM"
-                elif s.name.lower().startswith("agent"):
-                    kind = "AGENT"
-                else:
-                    kind = "CHAIN"
-
-            # --- outcome from span status ---
-            status = getattr(getattr(s, "status", None), "status_code", None)
-            if status == StatusCode.OK:
-                result = "ok"
-            elif status == StatusCode.ERROR:
-                result = "error"
-            else:
-                result = "unset"
-
-            # Optional extras
-            tool_name = attrs.get("openinference.tool.name")
-            model = attrs.get("openinference.model") or attrs.get("llm.model_name")
-
-            if self.mode == "simple":
-                # Compact, user-centric line
-                # e.g. "[span] seqspec_insert_regions type=TOOL result=ok tool=seqspec_insert_regions"
-                parts = [
-                    f"[span] {s.name}",
-                    f"type={kind}",
-                    f"result={result}",
-                ]
-                if tool_name:
-                    parts.append(f"tool={tool_name}")
-                elif model:
-                    parts.append(f"model={model}")
-                self.logger.info(" ".join(parts))
-                continue  # next span
-
-            # ----- extended mode (existing behavior) -----
-            # keep existing extended fields & truncation
-            ctx = s.get_span_context()
-            dur_ms = (
-                (s.end_time - s.start_time) / 1e6
-                if (s.end_time and s.start_time)
-                else 0.0
-            )
-
-            model = attrs.get("openinference.model", model)  # reuse model if set above
-            usage_in = attrs.get("openinference.usage.input_tokens")
-            usage_out = attrs.get("openinference.usage.output_tokens")
-            usage_reason = attrs.get("openinference.usage.reasoning_tokens")
-
-            base = (
-                f"[span] name={s.name} "
-                f"trace={ctx.trace_id:032x} span={ctx.span_id:016x} "
-                f"dur={dur_ms:.1f}ms"
-            )
-
-            extras = []
-            if model:
-                extras.append(f"model={model}")
-            if tool_name:
-                extras.append(f"tool={tool_name}")
-            if (
-                usage_in is not None
-                or usage_out is not None
-                or usage_reason is not None
-            ):
-                extras.append(
-                    f"tokens(in={usage_in},out={usage_out},reason={usage_reason})"
-                )
-            extras.append(f"type={kind}")
-            extras.append(f"result={result}")
-
-            line = base + (" " + " ".join(extras) if extras else "")
-
-            if self.mode == "extended":
-                targs = attrs.get("openinference.tool.args")
-                tout = attrs.get("openinference.tool.output")
-                if targs is not None:
-                    line += " args=" + _truncate_for_console(targs, 400)
-                if tout is not None:
-                    line += " output=" + _truncate_for_console(tout, 400)
-
-            self.logger.info(line)
-
-        return SpanExportResult.SUCCESS
-
-
-def _truncate_for_console(val, limit: int = 400) -> str:
-    try:
-        s = val if isinstance(val, str) else json.dumps(val, ensure_ascii=False)
-    except Exception:
-        s = str(val)
-    return s if len(s) <= limit else s[:limit] + "…"
-
-
-class JsonlSpanExporter(SpanExporter):
-    """Writes spans as JSON lines for later analysis."""
-
-    def __init__(self, path: Path):
-        self.path = Path(path)
-        self._fh = self.path.open("a", encoding="utf-8")
-
-    def shutdown(self):
-        try:
-            self._fh.close()
-        except Exception:
-            pass
-
-    def export(self, spans):
-        import json
-
-        for s in spans:
-            ctx = s.get_span_context()
-            # parent: may be None; when present it's a SpanContext
-            parent_span_id = None
-            try:
-                if s.parent:
-                    parent_span_id = f"{s.parent.span_id:016x}"
-            except Exception:
-                parent_span_id = None
-
-            # times can be 0 if the span didn't end cleanly
-            start = getattr(s, "start_time", 0) or 0
-            end = getattr(s, "end_time", 0) or 0
-            dur_ms = (end - start) / 1e6 if end and start else 0.0
-
-            # attributes/events/resource: coerce to JSON-safe
-            attrs = _json_safe_dict(getattr(s, "attributes", {}) or {})
-            events = []
-            try:
-                for e in getattr(s, "events", []) or []:
-                    events.append(
-                        {
-                            "name": getattr(e, "name", None),
-                            "attributes": _json_safe_dict(
-                                getattr(e, "attributes", {}) or {}
-                            ),
-                        }
-                    )
-            except Exception:
-                pass
-
-            resource_attrs = {}
-            try:
-                resource_attrs = _json_safe_dict(
-                    getattr(s, "resource", None).attributes
-                )  # <-- FIX
-            except Exception:
-                resource_attrs = {}
-
-            rec = {
-                "trace_id": f"{ctx.trace_id:032x}",
-                "span_id": f"{ctx.span_id:016x}",
-                "parent_span_id": parent_span_id,
-                "name": s.name,
-                "start_time_unix_nano": start,
-                "end_time_unix_nano": end,
-                "duration_ms": dur_ms,
-                "attributes": attrs,
-                "events": events,
-                "resource": resource_attrs,
-            }
-            self._fh.write(json.dumps(rec, ensure_ascii=False) + "\n")
-            self._fh.flush()
-        return SpanExportResult.SUCCESS
-
-
-def _json_safe(obj):
-    # keep it compact + resilient
-    import json
-    from pathlib import Path as _Path
-
-    if obj is None:
-        return None
-    if isinstance(obj, (str, int, float, bool)):
-        return obj
-    if isinstance(obj, (list, tuple)):
-        return [_json_safe(x) for x in obj]
-    if isinstance(obj, dict):
-        return {str(k): _json_safe(v) for k, v in obj.items()}
-    if isinstance(obj, _Path):
-        return str(obj)
-    try:
-        return json.loads(json.dumps(obj))  # best-effort coercion
-    except Exception:
-        return str(obj)
-
-
-def _json_safe_dict(d):
-    try:
-        return {str(k): _json_safe(v) for k, v in dict(d).items()}
-    except Exception:
-        # last resort
-        return {}
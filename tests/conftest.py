@@ -5,13 +5,111 @@ Pytest configuration and fixtures for seqspec tests.
 import pytest
 import tempfile
 import os
+import subprocess
+import sys
+from pathlib import Path
+
 import yaml
+import seqspec
 from seqspec.Assay import Assay
 from seqspec.Region import Region
 from seqspec.Read import Read
 from seqspec.utils import load_spec
 
 
+@pytest.fixture(autouse=True)
+def isolated_cache_dir(tmp_path, monkeypatch):
+    """Keep persistent caches (md5, remote metadata) out of the user cache dir."""
+    monkeypatch.setenv("SEQSPEC_CACHE_DIR", str(tmp_path / "seqspec-cache"))
+
+
+def _run_python(code, *flags):
+    """Run code in a fresh interpreter, so that no seqspec module is imported yet."""
+    env = dict(os.environ, PYTHONPATH=str(Path(seqspec.__file__).parents[1]))
+    return subprocess.run(
+        [sys.executable, *flags, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=env,
+    )
+
+
+@pytest.fixture
+def run_python():
+    """Run code in a fresh interpreter and return the completed process."""
+    return _run_python
+
+
+# what loading any spec imports: import-time budgets are multiples of its
+# import time, so that they hold on slow and busy machines alike
+BASELINE_MODULES = ("pydantic", "yaml")
+
+
+def _import_times(code):
+    # the total time in ms of the imports made by the code, i.e. after
+    # interpreter startup (`site`), and the cumulative time of each module
+    total, started, modules = 0.0, False, {}
+    for line in _run_python(code, "-X", "importtime").stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line.split("|")
+        if not cumulative.strip().isdigit():
+            continue
+        ms = int(cumulative) / 1000
+        modules.setdefault(name.strip(), ms)
+        if name.startswith("  "):
+            continue
+        if started:
+            total += ms
+        started = started or name.strip() == "site"
+    return total, modules
+
+
+def _import_time_ms(code, runs=5):
+    """Measure the import time of code in ms with `python -X importtime`.
+
+    Sums the top-level imports made by the code, i.e. after interpreter startup
+    (`site`), and returns the best of a few runs to be robust to a busy machine.
+    """
+    return min(_import_times(code)[0] for _ in range(runs))
+
+
+def _import_time_ratio(code, runs=5):
+    """Measure the import time of code in multiples of the time it spent
+    importing `BASELINE_MODULES`, which it must import, in the same run.
+
+    Both are measured under the same load, so the ratio hardly depends on how
+    busy the machine is. Returns the best of a few runs.
+    """
+    best = None
+    for _ in range(runs):
+        total, modules = _import_times(code)
+        base = sum(modules[m] for m in BASELINE_MODULES)
+        best = total / base if best is None else min(best, total / base)
+    return best
+
+
+@pytest.fixture
+def import_time_ms():
+    """Measure the import time of code in ms, see `_import_time_ms`."""
+    return _import_time_ms
+
+
+@pytest.fixture
+def import_time_ratio():
+    """Measure the import time of code relative to its baseline imports, see
+    `_import_time_ratio`."""
+    return _import_time_ratio
+
+
+@pytest.fixture(scope="session")
+def baseline_import_ms():
+    """Import time in ms of `BASELINE_MODULES`, for code that does not import
+    them."""
+    return _import_time_ms("import " + ", ".join(BASELINE_MODULES))
+
+
 @pytest.fixture
 def sample_assay():
     """Create a sample assay for testing."""
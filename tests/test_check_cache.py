@@ -0,0 +1,54 @@
+import json
+
+from seqspec.Assay import Assay
+from seqspec.check_cache import CheckCache
+from seqspec.seqspec_check import RULES, check
+
+
+def test_incremental_check_reuses_unchanged_subtrees(temp_spec: Assay, tmp_path):
+    """Test that an incremental check matches a full check and skips unchanged subtrees"""
+    path = tmp_path / "spec.yaml.check-cache.json"
+    cache = CheckCache(path)
+    assert check(temp_spec, cache=cache) == check(temp_spec)
+    cache.save()
+
+    # break one region of the rna modality
+    rna = temp_spec.get_libspec("rna")
+    edited = rna.regions[0]
+    edited.max_len = edited.min_len - 1
+
+    rule = RULES["check_region_lengths"]
+    visited = []
+    original = rule.leave_region
+
+    def spy(self, rgn, modality):
+        visited.append(rgn.region_id)
+        original(self, rgn, modality)
+
+    rule.leave_region = spy
+    try:
+        cache = CheckCache(path)
+        errors = check(temp_spec, cache=cache)
+    finally:
+        rule.leave_region = original
+    assert errors == check(temp_spec)
+    assert any(e["error_message"].startswith(f"'{edited.region_id}'") for e in errors)
+    assert cache.hits > 0
+    # only the edited region, its ancestors and their direct leaves were revisited
+    assert "rna" in visited and edited.region_id in visited
+    assert "atac" not in visited and "protein" not in visited
+
+
+def test_check_cache_discards_other_versions(tmp_path):
+    """Test that a cache written by another seqspec version is ignored"""
+    path = tmp_path / "spec.yaml.check-cache.json"
+    cache = CheckCache(path)
+    cache.put("schema", "key", [])
+    cache.save()
+    assert CheckCache(path).get("schema", "key") == []
+
+    data = json.loads(path.read_text())
+    data["version"] = "0.0.0"
+    path.write_text(json.dumps(data))
+    assert CheckCache(path).get("schema", "key") is None
+    assert CheckCache.path_for("a/spec.yaml").name == "spec.yaml.check-cache.json"
@@ -0,0 +1,84 @@
+from seqspec.Assay import Assay
+from seqspec.check_engine import CheckRule, run_rules
+from seqspec.seqspec_check import RULES
+
+
+def _walk(rgn):
+    yield rgn
+    for sub in rgn.regions:
+        yield from _walk(sub)
+
+
+def _run(spec, rule):
+    """Run a single rule and return its instance"""
+    seen = []
+
+    class Keep(rule):
+        def finish(self):
+            seen.append(self)
+            super().finish()
+
+    run_rules(spec, [Keep])
+    return seen[0]
+
+
+def test_run_rules_single_traversal(temp_spec: Assay):
+    """Test that a pluggable rule sees every region pre/post-order, then every read"""
+
+    class Trace(CheckRule):
+        name = "trace"
+
+        def __init__(self, ctx):
+            super().__init__(ctx)
+            self.events = []
+
+        def enter_region(self, rgn, modality):
+            self.events.append(("enter", rgn.region_id))
+
+        def leave_region(self, rgn, modality):
+            self.events.append(("leave", rgn.region_id))
+
+        def visit_read(self, read):
+            # region facts are complete by the time reads are visited
+            assert read.primer_id in self.ctx.leaf_ids
+            self.events.append(("read", read.read_id))
+
+        def finish(self):
+            self.error(f"{len(self.events)} events", "spec")
+
+    events = _run(temp_spec, Trace).events
+    regions = [r for m in temp_spec.modalities for r in _walk(temp_spec.get_libspec(m))]
+    assert [e[1] for e in events if e[0] == "enter"] == [r.region_id for r in regions]
+    assert events.index(("leave", "rna")) > events.index(("leave", "rna_cell_bc"))
+    assert [e[1] for e in events if e[0] == "read"] == [
+        r.read_id for r in temp_spec.sequence_spec
+    ]
+
+    # errors are grouped by rule, in the order the rules are given
+    errors = run_rules(temp_spec, [Trace, RULES["check_unique_read_ids"]])
+    assert [e["error_type"] for e in errors] == ["trace"]
+
+
+def test_elements_max_len_matches_tree_walk(temp_spec: Assay):
+    """Test that primer positions from the traversal agree with get_leaves_with_region_id"""
+
+    def expected(read):
+        libspec = temp_spec.get_libspec(read.modality)
+        leaves = libspec.get_leaves_with_region_id(read.primer_id)
+        pidx = [r.region_id for r in leaves].index(read.primer_id)
+        elements = leaves[pidx + 1 :] if read.strand == "pos" else leaves[:pidx]
+        return sum(r.max_len for r in elements)
+
+    # a primer id that occurs twice takes the tree walk fallback
+    rna = temp_spec.get_libspec("rna")
+    rna.regions.append(rna.regions[0].model_copy(deep=True))
+
+    ctx = _run(temp_spec, CheckRule).ctx
+    for read in temp_spec.sequence_spec:
+        for strand in ("pos", "neg"):
+            read.strand = strand
+            assert ctx.elements_max_len(read) == expected(read)
+
+    read = temp_spec.sequence_spec[0]
+    read.primer_id = "not_a_region"
+    assert ctx.elements_max_len(read) is None
@@ -0,0 +1,69 @@
+import hashlib
+
+from seqspec.cache import Md5Cache, stat_key
+from seqspec.checksum import md5_local, md5sums
+from seqspec.seqspec_check import seqspec_check
+
+
+def test_md5_local(tmp_path):
+    """Test hashing a local file with a small buffer"""
+    fn = tmp_path / "reads.fastq"
+    data = b"@r1\nACGT\n+\nIIII\n" * 1000
+    fn.write_bytes(data)
+    assert md5_local(str(fn), bufsize=7) == hashlib.md5(data).hexdigest()
+
+
+def test_md5sums_cached(tmp_path, monkeypatch):
+    """Test that digests are cached by file identity and missing files are None"""
+    monkeypatch.setenv("SEQSPEC_CACHE_DIR", str(tmp_path / "cache"))
+    fn = tmp_path / "a.txt"
+    fn.write_bytes(b"ACGT\n")
+    expected = hashlib.md5(b"ACGT\n").hexdigest()
+
+    targets = [
+        (str(fn), False),
+        (str(tmp_path / "missing.txt"), False),
+        (str(fn), False),
+    ]
+    assert md5sums(targets) == [expected, None, expected]
+
+    key = stat_key(fn.stat())
+    assert Md5Cache().get([key]) == {key: expected}
+
+    # a cached digest is returned without reading the file
+    Md5Cache().put({key: "0" * 32})
+    assert md5sums([(str(fn), False)]) == ["0" * 32]
+
+
+def test_seqspec_check_md5(temp_spec, tmp_path, monkeypatch):
+    """Test that check --md5 reports mismatching read files only"""
+    monkeypatch.setenv("SEQSPEC_CACHE_DIR", str(tmp_path / "cache"))
+    good = tmp_path / "good.fastq"
+    bad = tmp_path / "bad.fastq"
+    good.write_bytes(b"good")
+    bad.write_bytes(b"bad")
+
+    # keep onlists out of it, remote ones would be downloaded
+    for m in temp_spec.modalities:
+        for rgn in temp_spec.get_libspec(m).get_onlist_regions():
+            rgn.onlist.md5 = ""
+
+    reads = temp_spec.get_seqspec("rna")
+    for read, fn, md5 in [
+        (reads[0], good, hashlib.md5(b"good").hexdigest()),
+        (reads[1], bad, hashlib.md5(b"good").hexdigest()),
+    ]:
+        read.files[0].url = str(fn)
+        read.files[0].md5 = md5
+
+    errors = [
+        e
+        for e in seqspec_check(temp_spec, md5=True)
+        if e["error_type"] == "check_md5sum"
+    ]
+    assert len(errors) == 1
+    assert errors[0]["error_object"] == "file"
+    assert reads[1].files[0].filename in errors[0]["error_message"]
+
+    errors = seqspec_check(temp_spec)
+    assert not [e for e in errors if e["error_type"] == "check_md5sum"]
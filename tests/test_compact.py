@@ -0,0 +1,95 @@
+import pickle
+
+import pytest
+
+from seqspec.compact import CompactAssay, CompactPool, CompactRegion, compact
+from seqspec.seqspec_file import seqspec_file
+from seqspec.seqspec_find import seqspec_find
+from seqspec.seqspec_index import seqspec_index
+from seqspec.seqspec_info import format_info, seqspec_info
+from seqspec.spec_hash import files_digest, model_digest
+
+
+def test_compact_dump(temp_spec):
+    """Test that a compact spec has the content of the model and converts back"""
+    c = compact(temp_spec)
+    assert isinstance(c, CompactAssay)
+    assert c.model_dump() == temp_spec.model_dump()
+    assert c.list_modalities() == temp_spec.list_modalities()
+
+    model = c.to_model()
+    assert model.model_dump() == temp_spec.model_dump()
+    assert model._spec_path == temp_spec._spec_path
+
+
+def test_compact_queries(temp_spec):
+    """Test that the query functions give the same results for compact specs"""
+    c = compact(temp_spec)
+    for m in temp_spec.list_modalities():
+        for idtype in ["read", "file", "region"]:
+            expected = seqspec_index(temp_spec, m, [], idtype)
+            assert seqspec_index(c, m, [], idtype) == expected
+        for selector in ["read", "file", "region"]:
+            expected = seqspec_find(temp_spec, selector, m)
+            found = seqspec_find(c, selector, m)
+            assert [x.model_dump() for x in found] == [x.model_dump() for x in expected]
+        files = seqspec_file(c, m)
+        expected = seqspec_file(temp_spec, m)
+        assert {k: [f.model_dump() for f in v] for k, v in files.items()} == {
+            k: [f.model_dump() for f in v] for k, v in expected.items()
+        }
+    for key in ["modalities", "meta", "hash"]:
+        assert format_info(seqspec_info(c, key), key, "json") == format_info(
+            seqspec_info(temp_spec, key), key, "json"
+        )
+
+
+def test_compact_read_only(temp_spec):
+    """Test that compact objects cannot be modified"""
+    c = compact(temp_spec)
+    with pytest.raises(AttributeError, match="read-only"):
+        c.name = "renamed"
+    with pytest.raises(AttributeError, match="read-only"):
+        c.library_spec[0].regions[0].min_len = 3
+    with pytest.raises(AttributeError):
+        c.library_spec[0].extra = 1
+    assert isinstance(c.library_spec, tuple)
+
+
+def test_compact_pool_shares(temp_spec):
+    """Test that a pool shares equal strings and subtrees across specs"""
+    pool = CompactPool()
+    a = pool.compact(temp_spec)
+    size = len(pool)
+    b = pool.compact(temp_spec.model_copy(deep=True))
+    assert a is not b
+    assert len(pool) == size
+    assert a.library_spec[0] is b.library_spec[0]
+    assert a.sequence_spec[0] is b.sequence_spec[0]
+    assert a.library_spec[0].region_id is b.library_spec[0].region_id
+
+    other = temp_spec.model_copy(deep=True)
+    other.library_spec[0].regions[0].min_len += 1
+    d = pool.compact(other)
+    assert d.library_spec[0] is not a.library_spec[0]
+    assert d.library_spec[0].regions[1] is a.library_spec[0].regions[1]
+
+
+def test_compact_pickle(temp_spec):
+    """Test that compact specs pickle to equal specs"""
+    c = compact(temp_spec)
+    loaded = pickle.loads(pickle.dumps(c))
+    assert loaded == c
+    assert loaded._spec_path == c._spec_path
+    assert isinstance(loaded.library_spec[0], CompactRegion)
+    assert loaded.model_dump() == temp_spec.model_dump()
+
+
+def test_compact_digests(temp_spec):
+    """Test that compact specs have the digests of the models they stand for"""
+    c = compact(temp_spec)
+    assert model_digest(c) == model_digest(temp_spec)
+    assert model_digest(c.library_spec[0]) == model_digest(temp_spec.library_spec[0])
+    assert files_digest(c.sequence_spec[0].files) == files_digest(
+        temp_spec.sequence_spec[0].files
+    )
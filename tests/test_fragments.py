@@ -0,0 +1,88 @@
+import json
+from argparse import Namespace
+
+import yaml
+
+from seqspec.fragments import share_aliases, shared_dump
+from seqspec.roundtrip import load_spec_roundtrip
+from seqspec.seqspec_format import run_format
+from seqspec.seqspec_modify import run_modify
+from seqspec.serialize import dump_yaml
+from seqspec.utils import load_spec, load_spec_dict
+
+
+def _regions(spec):
+    todo = list(spec.library_spec)
+    while todo:
+        r = todo.pop()
+        yield r
+        todo.extend(r.regions)
+
+
+def test_shared_dump(temp_spec, tmp_path):
+    """Test that repeated regions and onlists are written once and load as
+    separate instances"""
+    text = dump_yaml(shared_dump(temp_spec))
+    assert "*id001" in text
+    assert len(text) < len(dump_yaml(temp_spec.model_dump()))
+    assert yaml.safe_load(text) == temp_spec.model_dump()
+
+    path = tmp_path / "anchored.yaml"
+    path.write_text(text)
+    spec = load_spec(path)
+    assert spec.model_dump() == temp_spec.model_dump()
+    regions = list(_regions(spec))
+    nodes = regions + [r.onlist for r in regions if r.onlist is not None]
+    assert len(nodes) == len({id(n) for n in nodes})
+
+
+def test_share_aliases_leaves_data(temp_spec, temp_spec_file):
+    """Test that raw data without aliases is returned as is, and data with
+    aliases is not modified"""
+    data = load_spec_dict(temp_spec_file)
+    assert share_aliases(data) is data
+
+    data = yaml.safe_load(dump_yaml(shared_dump(temp_spec)))
+    before = yaml.safe_dump(data)
+    shared = share_aliases(data)
+    assert shared is not data
+    assert yaml.safe_dump(data) == before
+
+
+def test_format_anchors(temp_spec_file, tmp_path):
+    """Test seqspec format --anchors and that edits keep the anchors"""
+    out = tmp_path / "out.yaml"
+    args = Namespace(yaml=temp_spec_file, output=out, format=None, anchors=True)
+    run_format(None, args)
+    assert "&id001" in out.read_text()
+
+    spec, source = load_spec_roundtrip(out)
+    spec.name = "renamed"
+    source.write(spec, out)
+    assert "&id001" in out.read_text()
+    assert load_spec(out).name == "renamed"
+
+
+def test_edit_aliased_region(temp_spec, tmp_path):
+    """Test that modifying one occurrence of an aliased region leaves the others"""
+    region = temp_spec.get_libspec("rna").regions[0]
+    temp_spec.get_libspec("protein").regions.append(region.model_copy(deep=True))
+    region_id = region.region_id
+    path = tmp_path / "anchored.yaml"
+    path.write_text(dump_yaml(shared_dump(temp_spec)))
+    assert path.read_text().count("*id") == 3
+
+    args = Namespace(
+        yaml=path,
+        output=path,
+        patch=None,
+        keys=json.dumps([{"region_id": region_id, "name": "renamed"}]),
+        modality="rna",
+        selector="region",
+    )
+    run_modify(None, args)
+
+    spec = load_spec(path)
+    assert spec.get_libspec("rna").get_region_by_id(region_id)[0].name == "renamed"
+    protein = spec.get_libspec("protein").get_region_by_id(region_id)[0]
+    assert protein.name == region.name
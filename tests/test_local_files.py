@@ -0,0 +1,52 @@
+import os
+
+from seqspec.Assay import Assay
+from seqspec.local_files import LocalFileIndex
+from seqspec.seqspec_check import check
+
+
+def test_local_file_index_matches_os(tmp_path, monkeypatch):
+    """Test that listing-based existence and stats agree with os.path"""
+    (tmp_path / "a").mkdir()
+    (tmp_path / "a" / "r1.fastq.gz").write_bytes(b"ACGT")
+    (tmp_path / "a" / "link").symlink_to(tmp_path / "a" / "r1.fastq.gz")
+    (tmp_path / "a" / "broken").symlink_to(tmp_path / "missing")
+    paths = [
+        str(tmp_path / "a" / name)
+        for name in ["r1.fastq.gz", "link", "broken", "absent", ""]
+    ]
+    paths += [str(tmp_path / "b" / "r1.fastq.gz"), str(tmp_path / "a" / "..")]
+    paths += [str(tmp_path / "a" / "r1.fastq.gz" / "x")]
+
+    scanned = []
+    listdir = os.scandir
+    monkeypatch.setattr(os, "scandir", lambda p: scanned.append(p) or listdir(p))
+    index = LocalFileIndex(paths)
+    assert [index.exists(p) for p in paths] == [os.path.exists(p) for p in paths]
+    # one listing per directory
+    assert sorted(scanned) == sorted(
+        str(tmp_path / d) for d in ["", "a", "b", "a/r1.fastq.gz"]
+    )
+
+    stats = index.stats(paths[:4])
+    assert stats[paths[0]].st_size == stats[paths[1]].st_size == 4
+    assert stats[paths[2]] is None and stats[paths[3]] is None
+    assert index.stat(paths[0]) is stats[paths[0]]
+
+
+def test_check_file_sizes(temp_spec: Assay, tmp_path):
+    """Test that local files whose size differs from their filesize are reported"""
+    fn = tmp_path / "R1.fastq.gz"
+    fn.write_bytes(b"ACGT")
+    files = temp_spec.sequence_spec[0].files
+    files[0].url, files[0].urltype, files[0].filesize = str(fn), "local", 5
+    errors = [e for e in check(temp_spec) if e["error_type"] == "check_file_sizes"]
+    assert errors == [
+        {
+            "error_type": "check_file_sizes",
+            "error_message": f"{files[0].filename} filesize 4 does not match 5",
+            "error_object": "file",
+        }
+    ]
+    files[0].filesize = 4
+    assert not [e for e in check(temp_spec) if e["error_type"] == "check_file_sizes"]
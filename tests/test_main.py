@@ -0,0 +1,75 @@
+import json
+
+import pytest
+
+from seqspec.main import COMMANDS, find_command, setup_parser
+
+# import-time budgets, in multiples of importing pydantic and yaml (see
+# `import_time_ratio`; the parser, which must not import them, is compared to
+# `baseline_import_ms`). A command that loads a spec also builds the pydantic
+# schemas of the spec models on import, which takes a few times as long as
+# importing pydantic itself: that (150-250 ms here) puts a 100 ms start of such
+# commands out of reach.
+PARSER_IMPORT_BUDGET = 1.5
+COMMAND_IMPORT_BUDGET = 5
+# modules that only some commands need
+HEAVY_MODULES = [
+    "agents",
+    "openinference",
+    "matplotlib",
+    "newick",
+    "numpy",
+    "jsonschema",
+]
+
+
+def _imported(run_python, command) -> set:
+    code = (
+        "import json, sys; from seqspec.main import setup_parser; "
+        f"setup_parser({command!r}); print(json.dumps(sorted(sys.modules)))"
+    )
+    modules = json.loads(run_python(code).stdout)
+    return {m.split(".")[0] for m in modules} | set(modules)
+
+
+def test_setup_parser_imports_only_the_command(run_python):
+    """Test that building the parser imports only the dispatched command's module"""
+    imported = _imported(run_python, None)
+    assert not any(f"seqspec.{module}" in imported for module, _ in COMMANDS.values())
+    assert not imported & set(HEAVY_MODULES)
+
+    imported = _imported(run_python, "index")
+    assert "seqspec.seqspec_index" in imported
+    assert "seqspec.seqspec_build" not in imported
+    assert not imported & set(HEAVY_MODULES)
+
+    parser, command_to_parser = setup_parser("index")
+    assert list(command_to_parser) == list(COMMANDS)
+    args = parser.parse_args(["index", "-m", "rna", "spec.yaml"])
+    assert args.command == "index" and args.modality == "rna"
+
+
+def test_find_command():
+    """Test that the command is found after global options and their values"""
+    assert find_command(["--trace", "index", "check", "spec.yaml"]) == "check"
+    assert find_command(["--profile", "version", "spec.yaml"]) == "version"
+    assert find_command(["-h"]) is None
+    assert find_command(["nope"]) is None
+
+
+def test_cli_import_time(import_time_ms, baseline_import_ms):
+    """Test that importing the CLI and building its parser stays within budget"""
+    budget = PARSER_IMPORT_BUDGET * baseline_import_ms
+    ms = import_time_ms("from seqspec.main import setup_parser; setup_parser()")
+    assert ms < budget, f"CLI imports took {ms:.0f} ms, budget {budget:.0f} ms"
+
+
+@pytest.mark.parametrize("command", ["version", "index"])
+def test_command_import_time(import_time_ratio, command):
+    """Test that dispatching a common command stays within budget"""
+    ratio = import_time_ratio(
+        f"from seqspec.main import setup_parser; setup_parser({command!r})"
+    )
+    assert ratio < COMMAND_IMPORT_BUDGET, (
+        f"{command} imports took {ratio:.1f} times as long as pydantic and yaml"
+    )
@@ -0,0 +1,94 @@
+import gzip
+
+from seqspec.onlist_stats import onlist_stats
+from seqspec.seqspec_check import seqspec_check
+from seqspec.utils import load_spec
+
+
+def test_onlist_stats_counts():
+    """Test counts, length histogram and invalid characters"""
+    stats = onlist_stats(["AAAA", "AAAA", "CCCC", "acgt", "GGNGG", "TTRT"])
+    assert stats.count == 6
+    assert stats.distinct == 5
+    assert stats.lengths == {4: 5, 5: 1}
+    assert stats.invalid == 2
+    assert stats.min_hamming == 0
+
+
+def test_onlist_stats_min_hamming():
+    """Test exact and sampled minimum Hamming distance"""
+    stats = onlist_stats(["AAAA", "CCCC", "GGGG", "TTTT"])
+    assert (stats.min_hamming, stats.min_hamming_exact) == (4, True)
+
+    stats = onlist_stats(["AAAA", "CCCC", "AACC", "GGGT"])
+    assert stats.min_hamming == 2
+
+    stats = onlist_stats(["AAAA", "CCCC", "ACAA"])
+    assert stats.min_hamming == 1
+
+    entries = [
+        "".join("ACGT"[(i >> (2 * j)) & 3] for j in range(6)) for i in range(0, 4096, 3)
+    ]
+    stats = onlist_stats(entries, sample_size=64)
+    assert stats.min_hamming == 1
+
+    # all entries at distance 2: the sampled estimate is still exact in value
+    entries = [a + a for a in "ACGT"]
+    stats = onlist_stats([e + "AAAA" for e in entries], sample_size=2)
+    assert stats.min_hamming == 2
+    assert not stats.min_hamming_exact
+
+
+def test_check_onlist_contents(temp_spec, tmp_path):
+    """Test that onlist content problems are reported against the region"""
+    onlist = tmp_path / "bc.txt.gz"
+    with gzip.open(onlist, "wt") as f:
+        f.write("ACGTACGTACGTACG\nACGTACGTACGTACG\nacgtacgtacgtacg\nACGT\n")
+
+    rgn = temp_spec.get_libspec("protein").get_region_by_id("protein_seq")[0]
+    rgn.onlist.url = str(onlist)
+    errors = [
+        e["error_message"]
+        for e in seqspec_check(temp_spec)
+        if e["error_type"] == "check_onlist_contents"
+    ]
+    assert len(errors) == 3
+    assert "1 duplicate entries" in errors[0]
+    assert "1 entries with characters other than A, C, G, T, N" in errors[1]
+    assert "1 entries with length outside (15, 15)" in errors[2]
+
+    errors = seqspec_check(temp_spec, "igvf_onlist_skip")
+    assert not [e for e in errors if e["error_type"] == "check_onlist_contents"]
+
+
+def test_check_onlist_hamming(temp_spec, tmp_path):
+    """Test that entries one substitution apart are only reported when strict"""
+    onlist = tmp_path / "bc.txt"
+    onlist.write_text("ACGTACGTACGTACG\nACGTACGTACGTACC\nTTTTTTTTTTTTTTT\n")
+
+    rgn = temp_spec.get_libspec("protein").get_region_by_id("protein_seq")[0]
+    rgn.onlist.url = str(onlist)
+    onlist_types = {"check_onlist_contents", "check_onlist_hamming"}
+    errors = seqspec_check(temp_spec)
+    assert not [e for e in errors if e["error_type"] in onlist_types]
+
+    errors = [
+        e["error_message"]
+        for e in seqspec_check(temp_spec, strict=True)
+        if e["error_type"] in onlist_types
+    ]
+    assert len(errors) == 1
+    assert "minimum Hamming distance 1" in errors[0]
+
+    errors = seqspec_check(temp_spec, "igvf_onlist_skip", strict=True)
+    assert not [e for e in errors if e["error_type"] in onlist_types]
+
+
+def test_check_onlist_contents_empty_url(temp_spec_file):
+    """Test that an empty onlist url, i.e. the spec's directory, is not opened"""
+    spec = load_spec(temp_spec_file)
+    rgn = spec.get_libspec("protein").get_region_by_id("protein_seq")[0]
+    rgn.onlist.url = ""
+    rgn.onlist.urltype = "local"
+    errors = seqspec_check(spec)
+    assert not [e for e in errors if e["error_type"] == "check_onlist_contents"]
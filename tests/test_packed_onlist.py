@@ -0,0 +1,75 @@
+import gzip
+import os
+
+import numpy as np
+
+from seqspec.packed_onlist import (
+    PackedOnlist,
+    decode_codes,
+    encode_sequences,
+    load_packed_onlist,
+    sidecar_path,
+)
+from seqspec.Region import Onlist
+from seqspec.utils import read_local_list
+
+
+def test_encode_decode_roundtrip():
+    """Test that packable sequences of mixed length round-trip"""
+    seqs = ["ACGT", "A", "AA", "", "T" * 31, "GATTACA"]
+    codes, valid = encode_sequences(seqs)
+    assert valid.all()
+    assert len(set(codes.tolist())) == len(seqs)
+    assert decode_codes(codes) == seqs
+
+
+def test_encode_invalid():
+    """Test that N, IUPAC, lowercase and long sequences are not packable"""
+    seqs = ["ACGN", "ACGR", "acgt", "A" * 32, "ACGT"]
+    _, valid = encode_sequences(seqs)
+    assert valid.tolist() == [False, False, False, False, True]
+
+
+def test_packed_onlist_view_and_lookup():
+    """Test that the text view preserves order and lookups are exact"""
+    seqs = ["TTTT", "ACGN", "AAAA", "CCCC", "acgt", "AAAA"]
+    packed = PackedOnlist.from_sequences(seqs)
+    assert len(packed) == len(seqs)
+    assert packed.to_list() == seqs
+    assert packed.side == ["ACGN", "acgt"]
+    hits = packed.contains(["AAAA", "GGGG", "ACGN", "ACGT", "acgt", "AAA"])
+    assert hits.tolist() == [True, False, True, False, True, False]
+    assert "CCCC" in packed
+
+
+def test_load_packed_onlist_sidecar(tmp_path):
+    """Test that the sidecar is written, memory-mapped and rebuilt when stale"""
+    fn = tmp_path / "onlist.txt.gz"
+    with gzip.open(fn, "wt") as f:
+        f.write("AAAC\nTTTG extra\nNNNN\n")
+
+    packed = load_packed_onlist(fn)
+    assert sidecar_path(fn).exists()
+    assert packed.to_list() == ["AAAC", "TTTG", "NNNN"]
+
+    reopened = load_packed_onlist(fn)
+    assert isinstance(reopened.codes, np.memmap) or isinstance(
+        reopened.codes.base, np.memmap
+    )
+    assert read_local_list(
+        Onlist(
+            file_id="onlist",
+            filename="onlist.txt.gz",
+            filetype="txt",
+            filesize=0,
+            url="onlist.txt.gz",
+            urltype="local",
+            md5="",
+        ),
+        str(tmp_path),
+    ) == ["AAAC", "TTTG", "NNNN"]
+
+    with gzip.open(fn, "wt") as f:
+        f.write("GGGG\n")
+    os.utime(fn, ns=(0, 0))
+    assert load_packed_onlist(fn).to_list() == ["GGGG"]
@@ -0,0 +1,56 @@
+import json
+import sys
+
+from seqspec.main import main
+from seqspec.profiling import active_profiler, phase, profile
+from seqspec.seqspec_check import RULES, check
+from seqspec.utils import load_spec
+
+
+def test_profile_phases_and_check_rules():
+    """Test nested phases, peak memory and per-rule timings from the context API"""
+    with profile() as prof:
+        assert active_profiler() is prof
+        spec = load_spec("tests/fixtures/spec.yaml")
+        with phase("outer"):
+            with phase("alloc"):
+                blob = bytearray(4 * 1024 * 1024)
+            del blob
+            check(spec)
+    assert active_profiler() is None
+
+    phases = prof.phases
+    assert {"parse", "validate", "outer", "outer/alloc", "outer/check"} <= set(phases)
+    assert phases["outer/alloc"]["peak_bytes"] >= 4 * 1024 * 1024
+    # a phase's peak includes its children's
+    assert phases["outer"]["peak_bytes"] >= phases["outer/alloc"]["peak_bytes"]
+    assert prof.peak_bytes >= phases["outer"]["peak_bytes"]
+    assert phases["outer"]["wall_seconds"] >= phases["outer/check"]["wall_seconds"]
+    assert set(prof.report()["timings"]["check_rules"]) == {
+        r.name for r in RULES.values() if not r.optional
+    }
+
+    # phases outside of a profile are no-ops
+    with phase("ignored"):
+        pass
+    assert "ignored" not in prof.phases
+
+
+def test_main_profile_report(tmp_path, monkeypatch, capsys):
+    """Test that --profile-output writes a JSON report for a subcommand"""
+    report_fn = tmp_path / "profile.json"
+    pstats_fn = tmp_path / "profile.pstats"
+    argv = ["seqspec", "--profile-output", str(report_fn)]
+    argv += ["--profile-pstats", str(pstats_fn)]
+    argv += ["index", "-t", "kb", "-m", "rna", "-s", "read"]
+    monkeypatch.setattr(sys, "argv", argv + ["tests/fixtures/spec.yaml"])
+    main()
+    assert capsys.readouterr().out.strip()
+
+    report = json.loads(report_fn.read_text())
+    assert report["command"] == "index"
+    for name in ["import", "index", "index/parse", "index/format", "index/write"]:
+        assert report["phases"][name]["wall_seconds"] >= 0
+    assert list(report["timings"]["index_formatters"]) == ["kb"]
+    assert report["max_rss_bytes"] is None or report["max_rss_bytes"] > 0
+    assert pstats_fn.stat().st_size > 0
@@ -0,0 +1,110 @@
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import requests
+
+from seqspec.cache import RemoteMetaCache
+from seqspec.remote import (
+    RemoteMeta,
+    remote_file_exists,
+    remote_file_meta,
+    remote_files_exist,
+    remote_files_meta,
+)
+
+
+def _response(status, location=None, headers=None):
+    r = MagicMock()
+    r.status_code = status
+    r.headers = {"Location": location} if location else {}
+    r.headers.update(headers or {})
+    return r
+
+
+def test_remote_file_exists_redirect():
+    """Test that redirects are followed and errors count as missing"""
+    session = MagicMock()
+    session.head.side_effect = [
+        _response(302, "https://mirror.example.org/a.txt"),
+        _response(200),
+    ]
+    assert remote_file_exists("https://example.org/a.txt", session)
+    assert session.head.call_args.kwargs["timeout"]
+
+    session.head.side_effect = requests.Timeout()
+    assert not remote_file_exists("https://example.org/a.txt", session)
+
+
+def test_remote_file_meta_closes_session():
+    """Test that a session created for a single probe is closed"""
+    session = MagicMock()
+    session.__enter__.return_value = session
+    session.head.return_value = _response(200, headers={"Content-Length": "3"})
+    with patch("seqspec.remote.make_session", return_value=session):
+        assert remote_file_meta("https://example.org/a.txt").size == 3
+    session.__exit__.assert_called_once()
+
+
+def test_remote_file_exists_igvf():
+    """Test that IGVF presigned redirects are probed with a ranged GET"""
+    session = MagicMock()
+    session.head.return_value = _response(307, "https://s3.example.org/a?sig=1")
+    session.get.return_value = _response(206, headers={"Content-Range": "bytes 0-0/42"})
+    assert remote_file_exists("https://api.data.igvf.org/a/@@download", session)
+    assert session.get.call_args.kwargs["headers"] == {"Range": "bytes=0-0"}
+
+
+def test_remote_files_exist_order_and_host_limit():
+    """Test that results keep input order and per-host concurrency is bounded"""
+    lock = threading.Lock()
+    active = {}
+    peak = {}
+
+    def fake_meta(uri, session, timeout):
+        host = uri.split("/")[2]
+        with lock:
+            active[host] = active.get(host, 0) + 1
+            peak[host] = max(peak.get(host, 0), active[host])
+        time.sleep(0.01)
+        with lock:
+            active[host] -= 1
+        return RemoteMeta(url=uri, exists="missing" not in uri)
+
+    uris = [f"https://a.org/{i}" for i in range(20)] + [
+        "https://b.org/missing",
+        "https://a.org/0",
+    ]
+    with patch("seqspec.remote.remote_file_meta", side_effect=fake_meta):
+        found = remote_files_exist(
+            uris, max_workers=8, max_per_host=2, cache=RemoteMetaCache(ttl=0)
+        )
+    assert found == [True] * 20 + [False, True]
+    assert peak["a.org"] <= 2
+
+
+def test_remote_files_meta_cache(tmp_path):
+    """Test that metadata of existing files is served from the cache within the TTL"""
+    cache = RemoteMetaCache(tmp_path / "cache.sqlite", ttl=60)
+    session = MagicMock()
+    session.head.side_effect = lambda uri, **kw: (
+        _response(404)
+        if "missing" in uri
+        else _response(200, headers={"Content-Length": "7", "ETag": '"abc"'})
+    )
+    uris = ["https://example.org/a.txt", "https://example.org/missing.txt"]
+    with patch("seqspec.remote.make_session", return_value=session):
+        first = remote_files_meta(uris, cache=cache)
+        second = remote_files_meta(uris, cache=cache)
+    assert [m.exists for m in first] == [True, False]
+    assert first[0].size == 7 and first[0].etag == '"abc"'
+    assert second[0] == first[0]
+    # the existing file was probed once, the missing one every time
+    assert [c.args[0] for c in session.head.call_args_list] == [
+        uris[0],
+        uris[1],
+        uris[1],
+    ]
+
+    expired = RemoteMetaCache(tmp_path / "cache.sqlite", ttl=0)
+    assert expired.get(["https://example.org/a.txt"]) == {}
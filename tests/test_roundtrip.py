@@ -0,0 +1,135 @@
+import difflib
+from argparse import Namespace
+
+import pytest
+
+from seqspec.fragments import shared_dump
+from seqspec.roundtrip import load_spec_roundtrip
+from seqspec.seqspec_insert import seqspec_insert_reads
+from seqspec.seqspec_modify import run_modify
+from seqspec.serialize import dump_yaml
+from seqspec.utils import load_reads, load_spec
+
+
+def _changed_lines(a: str, b: str):
+    return [
+        line
+        for line in difflib.unified_diff(a.splitlines(), b.splitlines(), n=0)
+        if line[:1] in "+-" and line[:3] not in ("+++", "---")
+    ]
+
+
+def _commented(temp_spec_file, tmp_path):
+    # the fixture spec with a comment, a tag and non-default quoting
+    text = open(temp_spec_file).read()
+    text = "# hand-edited\n" + text.replace(
+        "  - read_id: rna_R1\n", "  - !Read  # first read\n    read_id: 'rna_R1'\n", 1
+    )
+    path = tmp_path / "commented.yaml"
+    path.write_text(text)
+    return path
+
+
+def test_render_unchanged(temp_spec_file, tmp_path):
+    """Test that an unchanged spec is written back verbatim"""
+    path = _commented(temp_spec_file, tmp_path)
+    spec, source = load_spec_roundtrip(path)
+    assert spec.model_dump() == load_spec(path).model_dump()
+    assert source.render(spec) == path.read_text()
+
+
+def test_render_modified(temp_spec_file, tmp_path):
+    """Test that only the changed fields are re-emitted"""
+    path = _commented(temp_spec_file, tmp_path)
+    spec, source = load_spec_roundtrip(path)
+    spec.get_read("rna_R1").name = "renamed"
+    spec.get_read("rna_R2").files[0].url = "./R2.fq.gz"
+
+    text = source.render(spec)
+    changed = _changed_lines(path.read_text(), text)
+    assert len(changed) == 4
+    assert "# first read" in text and "read_id: 'rna_R1'" in text
+    path.write_text(text)
+    assert load_spec(path).model_dump() == spec.model_dump()
+
+
+def test_render_inserted(temp_spec_file, tmp_path):
+    """Test inserting reads and regions splices in the new items"""
+    path = _commented(temp_spec_file, tmp_path)
+    spec, source = load_spec_roundtrip(path)
+    read = spec.get_read("rna_R1")
+    new = read.model_dump() | {"read_id": "rna_I1", "name": "Index 1"}
+    spec = seqspec_insert_reads(spec, "rna", load_reads([new]), "rna_R1")
+    spec.insert_regions(
+        [spec.get_libspec("rna").get_leaves()[0].model_copy(update={"region_id": "x"})],
+        "rna",
+        "rna_umi",
+    )
+
+    text = source.render(spec)
+    assert "# hand-edited" in text and "# first read" in text
+    assert len(_changed_lines(path.read_text(), text)) < 50
+    path.write_text(text)
+    assert load_spec(path).model_dump() == spec.model_dump()
+
+
+def test_render_falls_back(tmp_path, temp_spec_file):
+    """Test that documents with aliases are written whole, with repeats shared"""
+    text = open(temp_spec_file).read()
+    text = text.replace("name: DOGMA", "name: &name DOGMA", 1)
+    text = text.replace('lib_struct: ""', "lib_struct: *name", 1)
+    path = tmp_path / "anchored.yaml"
+    path.write_text(text)
+    spec, source = load_spec_roundtrip(path)
+    spec.name = "renamed"
+    assert source.render(spec) == dump_yaml(shared_dump(spec))
+
+
+def test_run_modify_keeps_formatting(temp_spec_file, tmp_path):
+    """Test that seqspec modify keeps comments and formatting"""
+    path = _commented(temp_spec_file, tmp_path)
+    out = tmp_path / "out.yaml"
+    args = Namespace(
+        yaml=path,
+        output=out,
+        patch=None,
+        keys='[{"read_id": "rna_R1", "name": "renamed"}]',
+        modality="rna",
+        selector="read",
+    )
+    run_modify(None, args)
+    assert len(_changed_lines(path.read_text(), out.read_text())) == 2
+    assert load_spec(out).get_read("rna_R1").name == "renamed"
+
+
+def test_roundtrip_json(temp_spec, tmp_path):
+    """Test that JSON specs are written back as JSON, or converted by suffix"""
+    path = tmp_path / "spec.json"
+    temp_spec.to_JSON(path)
+    spec, source = load_spec_roundtrip(path)
+    assert source.render(spec) == path.read_text()
+    spec.name = "renamed"
+    source.write(spec, path)
+    assert load_spec(path).name == "renamed"
+    source.write(spec, tmp_path / "spec.yaml")
+    assert load_spec(tmp_path / "spec.yaml").model_dump() == spec.model_dump()
+
+
+@pytest.mark.parametrize("index", [0, 1, -1])
+def test_render_removed(temp_spec, tmp_path, index):
+    """Test that removing the first, a middle or the last item drops its lines"""
+    read = temp_spec.get_read("rna_R1")
+    read.files = [
+        read.files[0].model_copy(update={"file_id": f"R1_L{i}.fastq.gz"})
+        for i in range(3)
+    ]
+    path = tmp_path / "spec.yaml"
+    temp_spec.to_YAML(path)
+
+    spec, source = load_spec_roundtrip(path)
+    del spec.get_read("rna_R1").files[index]
+    del spec.get_libspec("rna").regions[index]
+    text = source.render(spec)
+    path.write_text(text)
+    assert load_spec(path).model_dump() == spec.model_dump()
+    assert "[]" not in [line.strip() for line in text.splitlines()]
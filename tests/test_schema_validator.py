@@ -0,0 +1,85 @@
+import copy
+import random
+
+from seqspec.schema_validator import (
+    compile_schema,
+    load_schema,
+    schema_errors,
+    schema_predicate,
+    schema_validator,
+)
+from seqspec.seqspec_check import seqspec_check
+from seqspec.utils import load_spec_dict, load_spec_from_dict
+
+SPEC = "tests/fixtures/spec.yaml"
+
+
+def test_compiled_schema_agrees_with_jsonschema():
+    """Test that the compiled predicate accepts exactly what Draft4Validator accepts"""
+    base = load_spec_dict(SPEC)
+    predicate, validator = schema_predicate(), schema_validator()
+    assert predicate is not validator.is_valid  # the schema compiles
+    assert predicate(base) and validator.is_valid(base)
+
+    values = [None, True, 0, -1, 1.5, 3000, "", "X", "rna", "pos", [], {}, [1]]
+    rng = random.Random(0)
+    for _ in range(300):
+        d = copy.deepcopy(base)
+        node = d
+        # walk down to a random container and replace or drop one of its values
+        for _ in range(rng.randint(0, 5)):
+            children = node if isinstance(node, list) else list(node.values())
+            children = [c for c in children if isinstance(c, (dict, list)) and c]
+            if not children:
+                break
+            node = rng.choice(children)
+        if isinstance(node, dict):
+            key = rng.choice(list(node) + ["extra"])
+            if rng.random() < 0.2:
+                node.pop(key, None)
+            else:
+                node[key] = rng.choice(values)
+        else:
+            node[rng.randrange(len(node))] = rng.choice(values)
+        assert predicate(d) == validator.is_valid(d)
+
+
+def test_compile_schema_keywords():
+    """Test $ref recursion and the Draft 4 treatment of exclusiveMinimum"""
+    schema = {
+        "$defs": {
+            "node": {
+                "type": "object",
+                "required": ["n"],
+                "properties": {
+                    "n": {"type": "integer", "minimum": 0, "exclusiveMinimum": True},
+                    "children": {"type": "array", "items": {"$ref": "#/$defs/node"}},
+                },
+                "additionalProperties": False,
+            }
+        },
+        "$ref": "#/$defs/node",
+    }
+    check = compile_schema(schema)
+    assert check({"n": 1, "children": [{"n": 2, "children": []}]})
+    assert not check({"n": 1, "children": [{"n": 0}]})
+    assert not check({"n": True})
+    assert not check({"n": 1, "other": 1})
+
+
+def test_check_schema_validates_raw_dict():
+    """Test that check validates the parsed file, which pydantic leaves untouched"""
+    raw = load_spec_dict(SPEC)
+    raw["library_spec"][0]["regions"][0]["sequence_type"] = "not_a_type"
+    snapshot = copy.deepcopy(raw)
+    spec = load_spec_from_dict(raw, SPEC, strict=False)
+    assert raw == snapshot
+
+    errors = [
+        e for e in seqspec_check(spec, raw=raw) if e["error_type"] == "check_schema"
+    ]
+    expected = list(schema_errors(raw))
+    assert len(errors) == len(expected) > 0
+    assert "not_a_type" in errors[0]["error_message"]
+    assert list(schema_errors(load_spec_dict(SPEC))) == []
+    assert load_schema() is load_schema()
@@ -0,0 +1,105 @@
+import json
+import os
+from argparse import Namespace
+from unittest.mock import patch
+
+import pytest
+
+from seqspec import session as session_module
+from seqspec.seqspec_batch import parse_commands, run_batch, seqspec_batch
+from seqspec.seqspec_index import format_index, seqspec_index
+from seqspec.seqspec_info import format_info, seqspec_info
+
+
+def test_parse_commands():
+    """Test parsing commands from lines and from JSON"""
+    text = """
+# kallisto
+seqspec index -m rna -t kb -o "kb out.txt"
+
+file -m rna
+"""
+    assert parse_commands(text) == [
+        ["index", "-m", "rna", "-t", "kb", "-o", "kb out.txt"],
+        ["file", "-m", "rna"],
+    ]
+    text = json.dumps([["index", "-m", "rna"], "info -k modalities"])
+    assert parse_commands(text) == [
+        ["index", "-m", "rna"],
+        ["info", "-k", "modalities"],
+    ]
+    with pytest.raises(ValueError):
+        parse_commands(json.dumps([[]]))
+
+
+def test_seqspec_batch(temp_spec_file, dogmaseq_dig_spec, tmp_path):
+    """Test that commands share one loaded spec and keep their own outputs"""
+    kb = tmp_path / "kb.txt"
+    commands = [
+        ["index", "-m", "rna", "-t", "kb", "-s", "file", "-o", str(kb)],
+        ["index", "-m", "rna", "-t", "tab"],
+        ["info", "-k", "modalities"],
+        ["onlist", "-m", "rna", "-s", "region", "-i", "rna_cell_bc"],
+    ]
+    with patch.object(
+        session_module, "load_spec", wraps=session_module.load_spec
+    ) as load:
+        results = seqspec_batch(temp_spec_file, commands, jobs=4)
+    assert load.call_count == 1
+
+    assert [argv for argv, _, _ in results] == commands
+    assert [error for _, _, error in results] == [None] * 4
+    indices = seqspec_index(dogmaseq_dig_spec, "rna", [], "file")
+    assert kb.read_text() == format_index(indices, "kb") + "\n"
+    assert results[0][1] == ""
+    indices = seqspec_index(dogmaseq_dig_spec, "rna", [], "read")
+    assert results[1][1] == format_index(indices, "tab") + "\n"
+    info = seqspec_info(dogmaseq_dig_spec, "modalities")
+    assert results[2][1] == format_info(info, "modalities") + "\n"
+    assert results[3][1].strip().endswith("RNA-737K-arc-v1.txt.gz")
+
+
+def test_seqspec_batch_errors(temp_spec_file):
+    """Test that failing commands are reported and the others still run"""
+    commands = [
+        ["nope"],
+        ["index", "-m", "rna", "--bogus"],
+        ["info", "-k", "nokey"],
+        ["info", "-k", "modalities"],
+    ]
+    results = seqspec_batch(temp_spec_file, commands, jobs=2)
+    errors = [error for _, _, error in results]
+    assert errors[0] == "Unknown command: nope"
+    assert errors[1].startswith("invalid arguments")
+    assert "nokey" in errors[2]
+    assert errors[3] is None and results[3][1]
+
+
+def test_seqspec_batch_reloads_rewritten_spec(temp_spec_file):
+    """Test that the spec is reloaded after a command rewrites it"""
+    commands = [
+        ["info", "-k", "meta", "-f", "json"],
+        ["modify", "-m", "rna", "-k", '[{"read_id": "rna_R1", "name": "renamed"}]'],
+        ["find", "-m", "rna", "-s", "read", "-i", "rna_R1"],
+    ]
+    commands[1] += ["-o", temp_spec_file]
+    st = os.stat(temp_spec_file)
+    results = seqspec_batch(temp_spec_file, commands)
+    assert [error for _, _, error in results] == [None] * 3
+    assert os.stat(temp_spec_file).st_mtime_ns != st.st_mtime_ns
+    assert "renamed" in results[2][1]
+
+
+def test_run_batch_stdin(temp_spec_file, capsys, monkeypatch):
+    """Test reading JSON commands from stdin and printing outputs in order"""
+    import io
+
+    commands = [["info", "-k", "modalities"], ["nope"], ["version"]]
+    monkeypatch.setattr("sys.stdin", io.StringIO(json.dumps(commands)))
+    args = Namespace(yaml=temp_spec_file, commands="-", jobs=None)
+    with pytest.raises(SystemExit) as e:
+        run_batch(None, args)
+    assert e.value.code == 1
+    out, err = capsys.readouterr()
+    assert out.index("rna") < out.index("seqspec version")
+    assert "Error in `nope`" in err and "1 of 3 commands failed" in err
@@ -35,4 +35,73 @@ def test_seqspec_check(dogmaseq_dig_spec: Assay):
     )
     
     errors = seqspec_check(spec=invalid_spec)
-    assert len(errors) > 0  # Should have errors for invalid spec
\ No newline at end of file
+    assert len(errors) > 0  # Should have errors for invalid spec
+
+def test_seqspec_check_batch(tmp_path, capsys):
+    """Test checking several specs from a manifest with a JSON Lines report"""
+    import json
+    from argparse import Namespace
+
+    from seqspec.seqspec_check import find_spec_files, run_check
+
+    spec = Path("tests/fixtures/spec.yaml").resolve()
+    broken = tmp_path / "nested" / "broken.yaml"
+    broken.parent.mkdir()
+    broken.write_text("not: [a, spec")
+    manifest = tmp_path / "specs.txt"
+    manifest.write_text(f"# specs to check\n{spec}\n\nnested/broken.yaml\n")
+
+    assert find_spec_files([], manifest) == [spec, broken]
+    assert find_spec_files([tmp_path, broken]) == [broken]
+    args = Namespace(
+        yaml=[],
+        manifest=manifest,
+        jobs=2,
+        skip=None,
+        md5=False,
+        strict=False,
+        incremental=False,
+        output=None,
+    )
+    with pytest.raises(SystemExit) as exit_info:
+        run_check(ArgumentParser(), args)
+    assert exit_info.value.code == 1
+
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    reports = {r["spec"]: r for r in lines[:-1]}
+    assert "exception" in reports[str(broken)]
+    assert reports[str(spec)]["error_count"] == len(reports[str(spec)]["errors"])
+    assert reports[str(spec)]["rule_seconds"]
+
+    summary = lines[-1]["summary"]
+    assert summary["specs"] == 2
+    assert str(broken) in summary["failed_specs"]
+    assert list(summary["error_counts"]) == [str(spec), str(broken)]
+
+
+def test_seqspec_check_missing_field(tmp_path):
+    """Test that a missing top-level field is a schema error on that field"""
+    import yaml
+
+    from seqspec.seqspec_check import load_check_spec
+
+    data = yaml.safe_load(Path("tests/fixtures/spec.yaml").read_text())
+    del data["library_kit"]
+    path = tmp_path / "spec.yaml"
+    path.write_text(yaml.safe_dump(data, sort_keys=False))
+
+    spec, raw = load_check_spec(path)
+    errors = [
+        e for e in seqspec_check(spec, raw=raw) if e["error_type"] == "check_schema"
+    ]
+    assert errors == [
+        {
+            "error_type": "check_schema",
+            "error_message": "'library_kit' is a required property in spec",
+            "error_object": "'library_kit'",
+        }
+    ]
+
+    # the IGVF filters match on the field
+    errors = seqspec_check(spec, "igvf", raw=raw)
+    assert not [e for e in errors if e["error_type"] == "check_schema"]
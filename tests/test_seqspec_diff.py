@@ -1005,4 +1005,117 @@ def test_run_diff_nonexistent_file(tmp_path):
     
     # Test that it raises an error for nonexistent file
     with pytest.raises(ValueError, match="Input file B does not exist"):
-        run_diff(parser, args) 
\ No newline at end of file
+        run_diff(parser, args) 
+
+def test_diff_specs_identical(dogmaseq_dig_spec, temp_spec):
+    """Test that equal specs have no changes"""
+    from seqspec.seqspec_diff import diff_specs
+
+    assert diff_specs(dogmaseq_dig_spec, temp_spec) == []
+
+
+def test_diff_specs_modality_order(dogmaseq_dig_spec, temp_spec):
+    """Test that reordered modalities are not a change"""
+    from seqspec.seqspec_diff import diff_specs
+
+    temp_spec.modalities = temp_spec.modalities[::-1]
+    assert diff_specs(dogmaseq_dig_spec, temp_spec) == []
+    assert compare_specs(dogmaseq_dig_spec, temp_spec) == "No differences found"
+
+
+def test_diff_specs_structural(dogmaseq_dig_spec, temp_spec):
+    """Test that diff_specs reports updates, renames, moves, onlists and files"""
+    from seqspec.File import File
+    from seqspec.seqspec_diff import diff_specs
+
+    rna = temp_spec.get_libspec("rna")
+    ids = [r.region_id for r in rna.regions]
+    umi = ids.index("rna_umi")
+    rna.regions.insert(0, rna.regions.pop(umi))
+    cell_bc = rna.get_region_by_id("rna_cell_bc")[0]
+    cell_bc.region_id = "rna_bc"
+    cell_bc.onlist.filename = "other.txt"
+    temp_spec.name = "renamed"
+    read = temp_spec.sequence_spec[0]
+    extra = File(**{**read.files[0].model_dump(), "file_id": "extra.fastq.gz"})
+    read.files.append(extra)
+    moved = temp_spec.get_libspec("tag").regions.pop(1)
+    temp_spec.get_libspec("atac").regions.append(moved)
+
+    changes = [
+        c.model_dump(exclude_unset=True)
+        for c in diff_specs(dogmaseq_dig_spec, temp_spec)
+    ]
+    assert {
+        "op": "update",
+        "kind": "meta",
+        "path": "meta",
+        "field": "name",
+        "a": "DOGMAseq-DIG/Illumina",
+        "b": "renamed",
+    } in changes
+    assert {
+        "op": "move",
+        "kind": "region",
+        "path": "library_spec/rna/rna_umi",
+        "a": umi,
+        "b": 0,
+        "to": "library_spec/rna/rna_umi",
+    } in changes
+    assert {
+        "op": "rename",
+        "kind": "region",
+        "path": "library_spec/rna/rna_cell_bc",
+        "a": "rna_cell_bc",
+        "b": "rna_bc",
+    } in changes
+    assert {
+        "op": "update",
+        "kind": "onlist",
+        "path": "library_spec/rna/rna_cell_bc/onlist",
+        "field": "filename",
+        "a": "RNA-737K-arc-v1.txt",
+        "b": "other.txt",
+    } in changes
+    assert {
+        "op": "insert",
+        "kind": "file",
+        "path": f"sequence_spec/{read.read_id}/files/extra.fastq.gz",
+        "b": extra.model_dump(),
+    } in changes
+    assert {
+        "op": "move",
+        "kind": "region",
+        "path": f"library_spec/tag/{moved.region_id}",
+        "to": f"library_spec/atac/{moved.region_id}",
+    } in changes
+    assert len(changes) == 6
+
+
+def test_run_diff_json(tmp_path, dogmaseq_dig_spec, temp_spec):
+    """Test run_diff with JSON output"""
+    import json
+
+    temp_spec.get_libspec("rna").regions[0].max_len = 99
+    spec_file_a = tmp_path / "spec_a.yaml"
+    spec_file_b = tmp_path / "spec_b.yaml"
+    output_file = tmp_path / "diff.json"
+    dogmaseq_dig_spec.to_YAML(spec_file_a)
+    temp_spec.to_YAML(spec_file_b)
+
+    args = Namespace(
+        yamlA=spec_file_a, yamlB=spec_file_b, output=output_file, format="json"
+    )
+    run_diff(ArgumentParser(), args)
+    changes = json.loads(output_file.read_text())
+    region_id = temp_spec.get_libspec("rna").regions[0].region_id
+    assert changes == [
+        {
+            "op": "update",
+            "kind": "region",
+            "path": f"library_spec/rna/{region_id}",
+            "field": "max_len",
+            "a": dogmaseq_dig_spec.get_libspec("rna").regions[0].max_len,
+            "b": 99,
+        }
+    ]
@@ -1,6 +1,9 @@
-from seqspec.seqspec_file import seqspec_file
+from unittest.mock import patch
+
+from seqspec.seqspec_file import fill_remote_filesizes, seqspec_file
 from seqspec.Assay import Assay
 from seqspec.File import File
+from seqspec.remote import RemoteMeta
 
 
 def test_seqspec_file(dogmaseq_dig_spec: Assay):
@@ -103,3 +106,24 @@ def test_list_files_by_id(dogmaseq_dig_spec: Assay):
     rna_cell_bc_file = files["rna_cell_bc"][0]
     assert rna_cell_bc_file.file_id == "RNA-737K-arc-v1.txt"
 
+
+
+def test_fill_remote_filesizes():
+    """Test that only missing sizes of remote files are filled in, on copies"""
+    remote = File(
+        file_id="a", filename="a.txt", filetype="txt", filesize=0,
+        url="https://example.org/a.txt", urltype="https", md5="",
+    )
+    local = remote.model_copy(update={"file_id": "b", "urltype": "local"})
+    known = remote.model_copy(update={"file_id": "c", "filesize": 5})
+    files = {"r1": [remote, local, known]}
+    meta = RemoteMeta(url=remote.url, exists=True, size=42)
+    with patch(
+        "seqspec.remote.remote_files_meta", return_value=[meta]
+    ) as probe:
+        filled = fill_remote_filesizes(files)
+    probe.assert_called_once_with([remote.url])
+    assert [f.filesize for f in filled["r1"]] == [42, 0, 5]
+    # the files, e.g. of a spec shared by a batch, are left unchanged
+    assert [f.filesize for f in files["r1"]] == [0, 0, 5]
+    assert filled["r1"][1] is local
@@ -1,10 +1,12 @@
 """Tests for seqspec_format module."""
 
+from argparse import Namespace
 
 from seqspec.Assay import Assay
 from seqspec.Region import Region
 
-from seqspec.seqspec_format import seqspec_format
+from seqspec.seqspec_format import run_format, seqspec_format
+from seqspec.utils import load_spec
 
 
 def test_format_spec_basic():
@@ -377,4 +379,17 @@ def test_format_spec_complex_structure():
     
     assert leaf2.sequence == "X" * 6
     assert leaf2.min_len == 6
-    assert leaf2.max_len == 6 
\ No newline at end of file
+    assert leaf2.max_len == 6
+
+
+def test_run_format_converts(temp_spec_file, tmp_path):
+    """Test converting a spec to JSON and back to YAML"""
+    as_json = tmp_path / "spec.json"
+    as_yaml = tmp_path / "spec.yaml"
+    run_format(None, Namespace(yaml=temp_spec_file, output=as_json, format=None, anchors=False))
+    assert as_json.read_text().startswith("{")
+    run_format(None, Namespace(yaml=as_json, output=as_yaml, format=None, anchors=False))
+    expected = tmp_path / "expected.yaml"
+    run_format(None, Namespace(yaml=temp_spec_file, output=expected, format="yaml", anchors=False))
+    assert as_yaml.read_text() == expected.read_text()
+    assert load_spec(as_json).model_dump() == load_spec(expected).model_dump()
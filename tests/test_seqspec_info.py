@@ -102,4 +102,22 @@ def test_seqspec_info_meta(dogmaseq_dig_spec: Assay):
     assert meta["assay_id"] == "DOGMAseq-DIG"
     assert meta["name"] == "DOGMAseq-DIG/Illumina"
     assert "description" in meta
-    assert "seqspec_version" in meta
\ No newline at end of file
+    assert "seqspec_version" in meta
+
+def test_seqspec_info_hash(dogmaseq_dig_spec: Assay):
+    """Test seqspec_info with hash key"""
+    info = seqspec_info(spec=dogmaseq_dig_spec, key="hash")
+    hashes = info["hash"]
+    assert hashes["spec"] == dogmaseq_dig_spec.digest()
+    rna = hashes["library_spec"]["rna"]
+    assert rna[0] == {
+        "region_id": "rna",
+        "digest": dogmaseq_dig_spec.get_libspec("rna").digest(),
+    }
+    assert len(rna) == 1 + len(dogmaseq_dig_spec.get_libspec("rna").regions)
+    assert len(hashes["sequence_spec"]) == len(dogmaseq_dig_spec.sequence_spec)
+
+    lines = format_info(info, "hash", "tab").split("\n")
+    assert lines[0] == f"spec\t\t\t{hashes['spec']}"
+    assert "region\trna\trna\t" + rna[0]["digest"] in lines
+    assert json.loads(format_info(info, "hash", "json")) == hashes
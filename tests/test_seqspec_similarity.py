@@ -0,0 +1,87 @@
+from argparse import ArgumentParser, Namespace
+
+import numpy as np
+import pytest
+
+from seqspec.seqspec_convert import seqspec_to_token
+from seqspec.seqspec_similarity import (
+    run_similarity,
+    similarity_matrix,
+    spec_profile,
+    spec_profiles,
+)
+
+
+def test_seqspec_to_token(temp_spec):
+    """Test that a spec tokenizes into one row per leaf region"""
+    matrix, rows = seqspec_to_token(temp_spec)
+    leaves = sum(
+        len(temp_spec.get_libspec(m).get_leaves()) for m in temp_spec.modalities
+    )
+    assert matrix.shape[0] == len(rows) == leaves
+    assert matrix[:, -1].min() == 1
+
+
+def test_similarity_matrix(temp_spec):
+    """Test that the matrix is symmetric, 1 on the diagonal and within [0, 1]"""
+    other = temp_spec.model_copy(deep=True)
+    for region in other.get_libspec(other.modalities[0]).get_leaves():
+        region.min_len = region.max_len = region.max_len * 3 + 1
+    empty = np.zeros_like(spec_profile(temp_spec))
+    profiles = np.array([spec_profile(temp_spec), spec_profile(other), empty])
+
+    m = similarity_matrix(profiles)
+    assert m.shape == (3, 3)
+    assert np.allclose(m, m.T)
+    assert np.allclose(np.diag(m), 1)
+    assert 0 < m[0, 1] < 1
+    assert m[0, 2] == 0
+    assert np.allclose(similarity_matrix(profiles, distance=True), 1 - m)
+
+
+def test_similarity_matrix_chunks():
+    """Test that the matrix does not depend on the chunk size"""
+    profiles = np.random.default_rng(0).random((25, 40))
+    expected = similarity_matrix(profiles)
+    for chunk_size in [1, 7, 25, 100]:
+        assert np.allclose(similarity_matrix(profiles, chunk_size), expected)
+
+
+def test_spec_profiles_skips(temp_spec_file, tmp_path):
+    """Test that specs that cannot be loaded are skipped with a warning"""
+    bad = tmp_path / "bad.yaml"
+    bad.write_text("not: [a spec")
+    with pytest.warns(UserWarning, match="Skipping"):
+        labels, profiles = spec_profiles([temp_spec_file, bad], jobs=1)
+    assert [p for p, _ in labels] == [temp_spec_file]
+    assert profiles.shape[0] == 1
+
+
+def test_run_similarity(temp_spec, tmp_path):
+    """Test that run writes the matrix and its labels"""
+    specs = tmp_path / "specs"
+    specs.mkdir()
+    temp_spec.to_YAML(specs / "a.yaml")
+    temp_spec.assay_id = "other"
+    temp_spec.library_spec[0].regions[0].max_len += 100
+    temp_spec.to_YAML(specs / "b.yaml")
+
+    out = tmp_path / "out"
+    args = Namespace(
+        yaml=[specs],
+        manifest=None,
+        jobs=1,
+        chunk_size=1,
+        distance=True,
+        output=out,
+    )
+    run_similarity(ArgumentParser(), args)
+    m = np.load(out / "distance.npy")
+    assert m.shape == (2, 2)
+    assert np.allclose(np.diag(m), 0)
+    assert m[0, 1] > 0
+    labels = (out / "labels.txt").read_text().splitlines()
+    assert [line.split("\t")[1] for line in labels] == [
+        "DOGMAseq-DIG",
+        "other",
+    ]
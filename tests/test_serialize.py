@@ -0,0 +1,112 @@
+import json
+import os
+import stat
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+import yaml
+
+from seqspec.serialize import atomic_open, dump_yaml, fast_dump_safe, write_yaml
+from seqspec.utils import load_spec, write_pydantic_to_file_or_stdout
+
+ROOT = Path(__file__).parent.parent
+SPECS = [ROOT / "tests/fixtures/spec.yaml", *sorted(ROOT.glob("docs/assays/*.yaml"))]
+
+
+@pytest.mark.parametrize("spec_fn", SPECS, ids=lambda p: p.name)
+def test_dump_yaml_matches_yaml_dump(spec_fn):
+    """Test that the output is the same as the pure-Python yaml.dump"""
+    dump = load_spec(spec_fn).model_dump()
+    assert dump_yaml(dump) == yaml.dump(dump, sort_keys=False)
+
+
+def test_fast_dump_safe():
+    """Test that strings libyaml would wrap differently use the Python emitter"""
+    assert fast_dump_safe({"a": ["x\ny", 1, 1.5, None, True, {"b": ""}]})
+    long = "TotalSeq™ antibody " * 10
+    assert not fast_dump_safe({"a": [long]})
+    assert not fast_dump_safe({"a": "tab\there"})
+    assert not fast_dump_safe({"a": (1, 2)})
+    assert dump_yaml({"a": [long]}) == yaml.dump({"a": [long]}, sort_keys=False)
+
+    # double-quoted because of the space before the newline, and wrapped
+    quoted = {"description": "text " * 16 + "before \nsee protocol"}
+    assert not fast_dump_safe(quoted)
+    assert dump_yaml(quoted) == yaml.dump(quoted, sort_keys=False)
+    assert not fast_dump_safe({"a": "x \ny"})
+    assert not fast_dump_safe({"a\nb": 1})
+
+
+def test_write_yaml_atomic(tmp_path):
+    """Test that writes replace the file, keep its mode and leave no temp files"""
+    path = tmp_path / "spec.yaml"
+    write_yaml({"a": 1}, path)
+    assert path.read_text() == "a: 1\n"
+    os.chmod(path, 0o640)
+    write_yaml({"b": 2}, path)
+    assert path.read_text() == "b: 2\n"
+    assert os.stat(path).st_mode & 0o777 == 0o640
+
+    # a failed write leaves the previous file in place
+    with pytest.raises(RuntimeError), atomic_open(path) as f:
+        f.write("c: 3\n")
+        raise RuntimeError()
+    assert path.read_text() == "b: 2\n"
+    assert os.listdir(tmp_path) == ["spec.yaml"]
+
+
+def test_atomic_open_symlink(tmp_path):
+    """Test that writing through a symlink replaces its target, not the link"""
+    target = tmp_path / "spec.yaml"
+    target.write_text("a: 1\n")
+    link = tmp_path / "link.yaml"
+    link.symlink_to(target)
+    write_yaml({"b": 2}, link)
+    assert link.is_symlink()
+    assert target.read_text() == "b: 2\n"
+    assert sorted(os.listdir(tmp_path)) == ["link.yaml", "spec.yaml"]
+
+
+@pytest.mark.skipif(not hasattr(os, "mkfifo"), reason="needs named pipes")
+def test_atomic_open_fifo(tmp_path):
+    """Test that named pipes are written to, not replaced"""
+    fifo = tmp_path / "spec.yaml"
+    os.mkfifo(fifo)
+    read = []
+    reader = threading.Thread(target=lambda: read.append(fifo.read_text()))
+    reader.start()
+    write_yaml({"a": 1}, fifo)
+    reader.join()
+    assert read == ["a: 1\n"]
+    assert stat.S_ISFIFO(os.stat(fifo).st_mode)
+
+
+@pytest.mark.skipif(not os.path.exists("/dev/stdout"), reason="needs /dev/stdout")
+def test_atomic_open_dev_stdout(tmp_path):
+    """Test that /dev/stdout redirected to a file writes to that file"""
+    out = tmp_path / "out.yaml"
+    out.write_text("# header\n")
+    code = (
+        "from seqspec.serialize import write_yaml; write_yaml({'a': 1}, '/dev/stdout')"
+    )
+    inode = os.stat(out).st_ino
+    with open(out, "a") as f:
+        subprocess.run([sys.executable, "-c", code], stdout=f, check=True)
+    assert out.read_text() == "# header\na: 1\n"
+    assert os.stat(out).st_ino == inode
+
+
+def test_write_json(temp_spec, tmp_path, capsys):
+    """Test writing specs and lists of regions as JSON"""
+    path = tmp_path / "spec.json"
+    write_pydantic_to_file_or_stdout(temp_spec, path, fmt="json")
+    assert json.loads(path.read_text()) == json.loads(temp_spec.model_dump_json())
+    assert temp_spec.to_JSON() == path.read_text()
+
+    regions = temp_spec.get_libspec("rna").get_leaves()
+    write_pydantic_to_file_or_stdout(regions, None, fmt="json")
+    out = json.loads(capsys.readouterr().out)
+    assert [r["region_id"] for r in out] == [r.region_id for r in regions]
@@ -0,0 +1,118 @@
+import shutil
+
+from seqspec.seqspec_file import seqspec_file
+from seqspec.seqspec_index import filter_index_no_overlap, seqspec_index
+from seqspec.seqspec_info import seqspec_info
+from seqspec.session import SeqSpecSession, estimate_bytes
+
+SPEC = "tests/fixtures/spec.yaml"
+
+
+def test_session_matches_core_functions(dogmaseq_dig_spec):
+    """Test that session results equal those of the core functions"""
+    session = SeqSpecSession.load(SPEC)
+    for selector in ("read", "file", "region"):
+        assert session.index("rna", selector=selector) == seqspec_index(
+            dogmaseq_dig_spec, "rna", [], selector
+        )
+    assert session.index("rna", ["rna_R1"]) == seqspec_index(
+        dogmaseq_dig_spec, "rna", ["rna_R1"], "read"
+    )
+    assert session.files("rna") == seqspec_file(dogmaseq_dig_spec, "rna")
+    assert session.info("modalities") == seqspec_info(dogmaseq_dig_spec, "modalities")
+    assert [o.file_id for o in session.onlists("rna", "region", "rna_cell_bc")] == [
+        "RNA-737K-arc-v1.txt"
+    ]
+
+
+def test_session_memoizes():
+    """Test that repeated calls return the cached result"""
+    session = SeqSpecSession.load(SPEC)
+    indices = session.index("rna", selector="file")
+    files = session.files("rna", ["rna_R1"])
+    assert session.cache_info()["misses"] == 2
+
+    assert session.index("rna", selector="file") is indices
+    assert session.files("rna", ("rna_R1",)) is files
+    assert session.files("rna", ["rna_R2"]) is not files
+    info = session.cache_info()
+    assert info["hits"] == 2 and info["misses"] == 3 and info["entries"] == 3
+    assert info["bytes"] > 0
+
+    # filtering overlaps does not modify the cached coordinates
+    rcv = [list(idx.rcv) for idx in indices]
+    filter_index_no_overlap(indices)
+    assert [idx.rcv for idx in indices] == rcv
+
+
+def test_session_mutate_invalidates():
+    """Test that modifying the spec in mutate() clears the caches"""
+    session = SeqSpecSession.load(SPEC)
+    assert session.info("meta")["meta"]["name"] != "renamed"
+    with session.mutate() as spec:
+        spec.name = "renamed"
+    assert session.cache_info()["entries"] == 0
+    assert session.info("meta")["meta"]["name"] == "renamed"
+
+
+def test_session_memory_budget():
+    """Test that the least recently used results are evicted over budget"""
+    probe = SeqSpecSession.load(SPEC)
+    size = estimate_bytes(probe.index("rna", ["rna_R1"]))
+    assert estimate_bytes(probe.index("rna", ["rna_R2"])) <= size * 2
+
+    session = SeqSpecSession(probe.spec, max_bytes=size * 2)
+    first = session.index("rna", ["rna_R1"])
+    session.index("rna", ["rna_R2"])
+    session.index("rna", selector="region")
+    assert session.cache_info()["bytes"] <= size * 2
+    assert session.index("rna", ["rna_R1"]) is not first
+
+    # results larger than the budget are not kept
+    session = SeqSpecSession(probe.spec, max_bytes=1)
+    session.index("rna", ["rna_R1"])
+    assert session.cache_info()["entries"] == 0
+
+
+def test_session_onlist_array(tmp_path):
+    """Test that local onlists are loaded once and reloaded when they change"""
+    shutil.copy(SPEC, tmp_path / "spec.yaml")
+    (tmp_path / "bc.txt").write_text("AAAA\nCCCC\nGGGG\n")
+    session = SeqSpecSession.load(tmp_path / "spec.yaml")
+    assert session.base_path == tmp_path
+
+    (onlist,) = session.onlists("rna", "region", "rna_cell_bc")
+    with session.mutate():
+        # the file is at the url, as for get_onlists
+        onlist.filename = "other.txt"
+        onlist.url = "bc.txt"
+        onlist.urltype = "local"
+    assert session.onlist_location(onlist) == str(tmp_path / "bc.txt")
+    packed = session.onlist_array(onlist)
+    assert session.onlist_array(onlist) is packed
+    assert packed.to_list() == ["AAAA", "CCCC", "GGGG"]
+
+    (tmp_path / "bc.txt").write_text("ACGT\nTTTT\n")
+    assert session.onlist_array(onlist).to_list() == ["ACGT", "TTTT"]
+
+
+def test_session_onlist_array_remote(monkeypatch):
+    """Test that remote onlists are downloaded from their url once"""
+    import seqspec.remote
+
+    urls = []
+
+    def read_remote_list(onlist, base_path=""):
+        urls.append(onlist.url)
+        return ["ACGT", "TTTT"]
+
+    monkeypatch.setattr(seqspec.remote, "read_remote_list", read_remote_list)
+    session = SeqSpecSession.load(SPEC)
+    (onlist,) = session.onlists("rna", "region", "rna_cell_bc")
+    with session.mutate():
+        onlist.url = "https://example.org/bc.txt"
+        onlist.urltype = "https"
+    assert session.onlist_location(onlist) == "https://example.org/bc.txt"
+    assert session.onlist_array(onlist).to_list() == ["ACGT", "TTTT"]
+    assert session.onlist_array(onlist).to_list() == ["ACGT", "TTTT"]
+    assert urls == ["https://example.org/bc.txt"]
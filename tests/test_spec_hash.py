@@ -0,0 +1,76 @@
+import pickle
+
+from seqspec.File import File
+from seqspec.Region import Onlist, Region, RegionType
+from seqspec.spec_hash import files_digest, model_digest, region_digests
+
+
+def test_digest_stable(temp_spec, dogmaseq_dig_spec):
+    """Test that equal specs have equal digests, and copies keep them"""
+    assert temp_spec is not dogmaseq_dig_spec
+    assert temp_spec.digest() == dogmaseq_dig_spec.digest()
+    assert model_digest(temp_spec) == temp_spec.digest()
+    loaded = pickle.loads(pickle.dumps(temp_spec))
+    assert loaded.digest() == temp_spec.digest()
+    assert loaded == temp_spec
+
+
+def test_digest_normalization(temp_spec):
+    """Test that defaults, enum values and key order do not change digests"""
+    fields = {
+        "region_id": "bc",
+        "region_type": "barcode",
+        "name": "Barcode",
+        "sequence_type": "random",
+    }
+    implicit = Region(**fields)
+    explicit = Region(
+        regions=[],
+        onlist=None,
+        max_len=1024,
+        min_len=0,
+        **dict(reversed(list(fields.items()))) | {"region_type": RegionType.BARCODE},
+    )
+    assert implicit.digest() == explicit.digest()
+    assert Region(**{**fields, "max_len": 16}).digest() != implicit.digest()
+
+    f = temp_spec.sequence_spec[0].files[0]
+    assert Onlist(**f.model_dump()).digest() != f.digest()
+
+
+def test_digest_invalidation(temp_spec, dogmaseq_dig_spec):
+    """Test that cached digests follow assignments and in-place edits"""
+    original = dogmaseq_dig_spec.digest()
+    assert temp_spec.digest() == original
+    rna = temp_spec.get_libspec("rna")
+    sibling = temp_spec.get_libspec("atac").digest()
+    leaf = rna.get_leaves()[0]
+
+    leaf.max_len += 1
+    assert temp_spec.digest() != original
+    assert temp_spec.get_libspec("atac").digest() == sibling
+    leaf.max_len -= 1
+    assert temp_spec.digest() == original
+
+    rna.regions.append(rna.regions[0])
+    assert temp_spec.digest() != original
+    rna.regions.pop()
+    assert temp_spec.digest() == original
+
+    read = temp_spec.sequence_spec[0]
+    before = files_digest(read.files)
+    read.files.append(File(**read.files[0].model_dump()))
+    assert files_digest(read.files) != before
+    assert temp_spec.digest() != original
+    read.files.pop()
+    assert temp_spec.digest() == original
+
+
+def test_region_digests(temp_spec):
+    """Test that every region of a tree gets its own digest"""
+    rna = temp_spec.get_libspec("rna")
+    digests = region_digests(rna)
+    assert digests[id(rna)] == rna.digest()
+    assert len(digests) == 1 + len(rna.regions)
+    for r in rna.regions:
+        assert digests[id(r)] == r.digest()
@@ -0,0 +1,147 @@
+import json
+from argparse import Namespace
+from pathlib import Path
+
+import pytest
+
+from seqspec.seqspec_modify import run_modify
+from seqspec.spec_patch import apply_patch, load_patch
+from seqspec.utils import load_spec
+
+PATCH = [
+    {
+        "op": "modify",
+        "selector": "read",
+        "modality": "rna",
+        "objects": [{"read_id": "rna_R1", "name": "Read 1"}],
+    },
+    {
+        "op": "modify",
+        "selector": "file",
+        "modality": "rna",
+        "objects": [{"file_id": "rna_R1_SRR18677638.fastq.gz", "url": "./R1.fq.gz"}],
+    },
+    {
+        "op": "insert",
+        "selector": "region",
+        "modality": "rna",
+        "after": "rna_umi",
+        "objects": [
+            {
+                "region_id": "rna_spacer",
+                "region_type": "linker",
+                "name": "Spacer",
+                "sequence_type": "fixed",
+                "sequence": "ACGT",
+                "min_len": 4,
+                "max_len": 4,
+            }
+        ],
+    },
+    {
+        "op": "modify",
+        "selector": "region",
+        "modality": "rna",
+        "objects": [
+            {
+                "region_id": "rna_spacer",
+                "sequence": "TTTTTT",
+                "min_len": 6,
+                "max_len": 6,
+            }
+        ],
+    },
+]
+
+
+def test_apply_patch(temp_spec):
+    """Test that all operations apply and derived attributes are updated once"""
+    rna = temp_spec.get_libspec("rna")
+    before = (rna.min_len, len(rna.sequence))
+    patched = apply_patch(temp_spec, load_patch(PATCH))
+
+    assert patched.get_read("rna_R1").name == "Read 1"
+    assert patched.get_read("rna_R1").files[0].url == "./R1.fq.gz"
+    lib = patched.get_libspec("rna")
+    ids = [r.region_id for r in lib.regions]
+    assert ids[ids.index("rna_umi") + 1] == "rna_spacer"
+    assert lib.min_len == before[0] + 6
+    assert len(lib.sequence) == before[1] + 6 and "TTTTTT" in lib.sequence
+
+    # the input spec is untouched
+    assert temp_spec.get_read("rna_R1").name != "Read 1"
+    assert "rna_spacer" not in [r.region_id for r in rna.regions]
+
+
+UNKNOWN_READ = {
+    "op": "modify",
+    "selector": "read",
+    "modality": "rna",
+    "objects": [{"read_id": "nope"}],
+}
+
+
+@pytest.mark.parametrize(
+    "bad",
+    [
+        # unknown ids are errors, not skipped
+        UNKNOWN_READ,
+        {
+            "op": "insert",
+            "selector": "region",
+            "modality": "rna",
+            "after": "nope",
+            "objects": [],
+        },
+        {"op": "insert", "selector": "file", "modality": "rna", "objects": []},
+        {
+            "op": "modify",
+            "selector": "read",
+            "modality": "dna",
+            "objects": [{"read_id": "rna_R1"}],
+        },
+        # invalid value, caught by the final validation
+        {
+            "op": "modify",
+            "selector": "file",
+            "modality": "rna",
+            "objects": [{"file_id": "rna_R1_SRR18677638.fastq.gz", "filesize": "big"}],
+        },
+    ],
+)
+def test_apply_patch_rolls_back(temp_spec, bad):
+    """Test that a failing operation leaves the spec unchanged"""
+    dump = temp_spec.model_dump()
+    with pytest.raises(ValueError):
+        apply_patch(temp_spec, load_patch(PATCH + [bad]))
+    assert temp_spec.model_dump() == dump
+
+
+def test_load_patch(tmp_path):
+    """Test loading patches from lists, files and inline JSON"""
+    path = tmp_path / "patch.json"
+    path.write_text(json.dumps(PATCH))
+    assert load_patch(path) == load_patch(PATCH) == load_patch(json.dumps(PATCH))
+    with pytest.raises(ValueError):
+        load_patch('{"op": "modify"}')
+
+
+def test_run_modify_patch(temp_spec_file, tmp_path):
+    """Test seqspec modify --patch writes the patched spec once, or nothing on error"""
+    out = tmp_path / "out.yaml"
+    args = Namespace(
+        yaml=temp_spec_file,
+        output=out,
+        patch=json.dumps(PATCH),
+        keys=None,
+        modality=None,
+        selector="read",
+    )
+    run_modify(None, args)
+    assert load_spec(out).get_read("rna_R1").name == "Read 1"
+
+    out.unlink()
+    args.patch = json.dumps(PATCH[:1] + [UNKNOWN_READ])
+    with pytest.raises(ValueError):
+        run_modify(None, args)
+    assert not Path(out).exists()
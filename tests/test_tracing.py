@@ -0,0 +1,39 @@
+import json
+
+from seqspec import tracing
+from seqspec.seqspec_check import seqspec_check
+from seqspec.seqspec_index import seqspec_index
+from seqspec.tracing import disable_tracing, enable_tracing, span
+from seqspec.utils import load_spec
+
+
+def test_spans_for_core_functions(tmp_path):
+    """Test that core functions emit nested spans with size attributes"""
+    trace_fn = tmp_path / "trace.jsonl"
+    enable_tracing(trace_fn)
+    try:
+        with span("pipeline step"):
+            spec = load_spec("tests/fixtures/spec.yaml")
+            seqspec_index(spec, "rna", [], "read")
+            seqspec_check(spec)
+    finally:
+        disable_tracing()
+
+    spans = {s["name"]: s for s in map(json.loads, trace_fn.read_text().splitlines())}
+    parent = spans["pipeline step"]["span_id"]
+    for name in ["load_spec", "seqspec_index", "seqspec_check", "remote_files_meta"]:
+        assert spans[name]["parent_span_id"] is not None
+    assert spans["load_spec"]["parent_span_id"] == parent
+    assert spans["load_spec"]["attributes"]["seqspec.spec.regions"] == 24
+    assert spans["load_spec"]["attributes"]["seqspec.spec.bytes"] > 0
+    assert spans["seqspec_index"]["attributes"]["seqspec.index.coordinates"] == 2
+    assert "seqspec.check.errors" in spans["seqspec_check"]["attributes"]
+    assert "seqspec.remote.cache_hits" in spans["remote_files_meta"]["attributes"]
+
+
+def test_span_is_noop_when_disabled():
+    """Test that spans cost a shared no-op context when tracing is off"""
+    assert not tracing.tracing_enabled()
+    assert span("a") is span("b", x=1)
+    with span("a") as s:
+        assert s is None
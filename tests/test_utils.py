@@ -8,11 +8,14 @@ import io
 import pytest
 
 from seqspec.utils import (
+    load_spec,
+    load_spec_dict,
     load_spec_stream,
     read_local_list,
     read_remote_list,
     get_remote_auth_token,
     map_read_id_to_regions,
+    write_pydantic_to_file_or_stdout,
     write_read,
     yield_onlist_contents,
 )
@@ -268,4 +271,67 @@ def test_map_read_id_to_regions_invalid_read_id():
         library_spec=[],
     )
     with pytest.raises(IndexError):
-        map_read_id_to_regions(spec, "RNA", "read2") 
\ No newline at end of file
+        map_read_id_to_regions(spec, "RNA", "read2") 
+
+# budgets in multiples of importing pydantic and yaml (see `baseline_import_ms`),
+# with headroom; the core loader is dominated by pydantic building the models.
+# test_core_loader_imports is the exact check of what the loader imports.
+PACKAGE_IMPORT_BUDGET = 1
+LOADER_IMPORT_BUDGET = 5
+# dependencies only needed for remote files, GenBank and tracing
+OPTIONAL_MODULES = ["requests", "Bio", "opentelemetry"]
+
+
+def test_moved_functions_reexported():
+    """Test that functions moved out of utils can still be imported from it"""
+    from seqspec import genbank, remote, span_exporters
+    from seqspec.utils import JsonlSpanExporter, load_genbank
+
+    assert read_remote_list is remote.read_remote_list
+    assert load_genbank is genbank.load_genbank
+    assert JsonlSpanExporter is span_exporters.JsonlSpanExporter
+    with pytest.raises(ImportError):
+        from seqspec.utils import no_such_function  # noqa: F401
+
+
+def test_core_loader_imports(run_python):
+    """Test that loading specs does not import remote, GenBank or tracing deps"""
+    code = (
+        "import json, sys; from seqspec.utils import load_spec; "
+        "print(json.dumps(sorted(sys.modules)))"
+    )
+    imported = {m.split(".")[0] for m in run_python(code).stdout.split('"')}
+    assert not imported & set(OPTIONAL_MODULES)
+
+
+def test_import_time(import_time_ms, import_time_ratio, baseline_import_ms):
+    """Test that importing seqspec and its core loader stays within budget"""
+    budget = PACKAGE_IMPORT_BUDGET * baseline_import_ms
+    ms = import_time_ms("import seqspec")
+    assert ms < budget, f"import seqspec took {ms:.0f} ms, budget {budget:.0f} ms"
+    ratio = import_time_ratio("from seqspec.utils import load_spec")
+    assert ratio < LOADER_IMPORT_BUDGET, (
+        f"import seqspec.utils took {ratio:.1f} times as long as pydantic and yaml"
+    )
+
+
+@pytest.mark.parametrize("name", ["spec.json", "spec.json.gz", "spec.yaml.gz"])
+def test_load_spec_formats(temp_spec, temp_spec_file, tmp_path, name):
+    """Test that specs written as JSON or gzipped load back to the same spec"""
+    path = tmp_path / name
+    write_pydantic_to_file_or_stdout(temp_spec, path)
+    if name.endswith(".gz"):
+        with gzip.open(path, "rt") as f:
+            assert f.read(1) in "{s"
+    assert load_spec(path).model_dump() == temp_spec.model_dump()
+    assert load_spec(path, strict=False).model_dump() == temp_spec.model_dump()
+    assert load_spec_dict(path) == load_spec_dict(temp_spec_file)
+
+
+def test_load_spec_json_invalid(tmp_path, capsys):
+    """Test that invalid JSON specs report their errors like YAML specs"""
+    path = tmp_path / "bad.spec.json"
+    path.write_text('{"assay_id": "x"}')
+    with pytest.raises(ValueError, match="Invalid spec"):
+        load_spec(path)
+    assert "[error 1]" in capsys.readouterr().out